@@ -0,0 +1,109 @@
+"""Measure actor latency while a large playlist is translated.
+
+A thread standing in for the backend actor repeatedly sleeps for 1ms and
+records how late it wakes up, while another thread translates a synthetic
+playlist either inline or in a worker process.
+
+Run with: python benchmarks/playlist_offload.py [--tracks 10000]
+"""
+
+import argparse
+import multiprocessing
+import statistics
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any
+
+from mopidy_spotify import translator
+
+
+def make_playlist(num_tracks: int) -> dict[str, Any]:
+    def track(i: int) -> dict[str, Any]:
+        artist = {"type": "artist", "uri": f"spotify:artist:{i % 97}", "name": "A"}
+        return {
+            "type": "track",
+            "uri": f"spotify:track:{i}",
+            "name": f"Track {i}",
+            "duration_ms": 180000,
+            "disc_number": 1,
+            "track_number": i % 12 + 1,
+            "is_playable": True,
+            "artists": [artist],
+            "album": {
+                "type": "album",
+                "uri": f"spotify:album:{i % 331}",
+                "name": "Album",
+                "artists": [artist],
+            },
+        }
+
+    return {
+        "type": "playlist",
+        "uri": "spotify:playlist:bench",
+        "name": "Bench",
+        "owner": {"id": "alice"},
+        "tracks": {"items": [{"track": track(i)} for i in range(num_tracks)]},
+    }
+
+
+def measure(translate: Callable[[], Any]) -> tuple[float, list[float]]:
+    delays: list[float] = []
+    done = threading.Event()
+
+    def actor() -> None:
+        while not done.is_set():
+            start = time.perf_counter()
+            time.sleep(0.001)
+            delays.append((time.perf_counter() - start - 0.001) * 1000)
+
+    actor_thread = threading.Thread(target=actor)
+    actor_thread.start()
+    start = time.perf_counter()
+    translate()
+    elapsed = time.perf_counter() - start
+    done.set()
+    actor_thread.join()
+    return elapsed, delays
+
+
+def report(name: str, elapsed: float, delays: list[float]) -> None:
+    p99 = (
+        statistics.quantiles(delays, n=100, method="inclusive")[98]
+        if len(delays) > 1
+        else 0.0
+    )
+    print(
+        f"{name:>8}: translation {elapsed * 1000:7.0f}ms, actor wake-up delay "
+        f"mean {statistics.fmean(delays):6.2f}ms p99 {p99:6.2f}ms "
+        f"max {max(delays):7.2f}ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tracks", type=int, default=10000)
+    args = parser.parse_args()
+
+    web_playlist = make_playlist(args.tracks)
+
+    def inline() -> None:
+        translator.to_playlist(web_playlist, bitrate=160)
+
+    report("inline", *measure(inline))
+
+    pool: Executor = ProcessPoolExecutor(
+        max_workers=1, mp_context=multiprocessing.get_context("spawn")
+    )
+    with pool:
+        pool.submit(int).result()  # Start the worker before measuring.
+
+        def offloaded() -> None:
+            pool.submit(translator.to_playlist, web_playlist, bitrate=160).result()
+
+        report("process", *measure(offloaded))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Measure parsing and grouping of Spotify URIs.
+
+Parses a synthetic workload of URIs, a mix of tracks, albums, artists and
+playlists with many repeats, both without and with the parsed link cache,
+and groups the parsed links by type.
+
+Run with: python benchmarks/weblink.py [--uris 100000] [--unique 20000]
+"""
+
+import argparse
+import itertools
+import operator
+import random
+import timeit
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from mopidy.types import Uri
+
+from mopidy_spotify import utils, web
+
+TYPES = ("track", "track", "track", "album", "artist", "playlist")
+
+
+def make_uris(num_uris: int, num_unique: int) -> list[Uri]:
+    rng = random.Random(42)  # noqa: S311
+    unique = [
+        Uri(f"spotify:{TYPES[i % len(TYPES)]}:{i:022d}") for i in range(num_unique)
+    ]
+    return [rng.choice(unique) for _ in range(num_uris)]
+
+
+def group_by_sorting(links: Iterable[web.WebLink | None]) -> Any:
+    # How utils.group_by_type() used to work.
+    link_type_getter = operator.attrgetter("type")
+    filtered = [u for u in links if u is not None]
+    return itertools.groupby(sorted(filtered, key=link_type_getter), link_type_getter)
+
+
+def report(name: str, func: Callable[[], Any], number: int) -> None:
+    best = min(timeit.repeat(func, number=1, repeat=number))
+    print(f"{name:>24}: {best * 1000:8.1f}ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--uris", type=int, default=100_000)
+    parser.add_argument("--unique", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    uris = make_uris(args.uris, args.unique)
+
+    def parse_uncached() -> None:
+        for uri in uris:
+            web._parse_link.__wrapped__(uri)
+
+    def parse_cached() -> None:
+        for uri in uris:
+            web.WebLink.from_uri(uri)
+
+    report("parse uncached", parse_uncached, args.repeat)
+    parse_cached()  # Warm the cache, as in a long running Mopidy.
+    report("parse cached", parse_cached, args.repeat)
+
+    links = [web.WebLink.from_uri(uri) for uri in uris]
+    report(
+        "group by sorting",
+        lambda: [list(group) for _, group in group_by_sorting(links)],
+        args.repeat,
+    )
+    report(
+        "group_by_type",
+        lambda: [list(group) for _, group in utils.group_by_type(links)],
+        args.repeat,
+    )
+
+
+if __name__ == "__main__":
+    main()
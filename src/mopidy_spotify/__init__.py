@@ -51,12 +51,19 @@ class Extension(ext.Extension):
 
         schema["toplist_countries"] = config.Deprecated()  # since 5.0
 
+        schema["playlist_workers"] = config.Integer(minimum=0)
+        schema["lookup_timeout"] = config.Float(minimum=0)
+        schema["image_cache_size"] = config.Integer(minimum=0)
+        schema["prefetch_images"] = config.Boolean()
+
         return schema
 
     @override
     def setup(self, registry: ext.Registry) -> None:
         from mopidy_spotify.backend import SpotifyBackend  # noqa: PLC0415
+        from mopidy_spotify.image_files import http_factory  # noqa: PLC0415
 
+        registry.add("http:app", {"name": self.ext_name, "factory": http_factory})
         registry.add("backend", SpotifyBackend)
 
     @override
@@ -1,12 +1,27 @@
 from __future__ import annotations
 
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from typing import TYPE_CHECKING, Any, ClassVar, cast, override
 
 import pykka
 from mopidy import backend
 from mopidy.types import UriScheme
 
-from mopidy_spotify import Extension, library, playlists, web
+from mopidy_spotify import (
+    Extension,
+    browse,
+    image_files,
+    images,
+    library,
+    lookup,
+    playlists,
+    search,
+    search_index,
+    store,
+    utils,
+    web,
+)
 
 if TYPE_CHECKING:
     from mopidy.audio import AudioProxy
@@ -15,6 +30,13 @@ if TYPE_CHECKING:
     from mopidy_spotify.types import SpotifyConfig
 
 
+# Stored tracks are refetched after a while, to pick up changes on Spotify.
+TRACK_STORE_MAX_AGE = 30 * 24 * 60 * 60
+
+# Enough for the images of a large library, while keeping the file small.
+IMAGE_STORE_MAX_ENTRIES = 100_000
+
+
 class SpotifyBackend(pykka.ThreadingActor, backend.Backend):
     uri_schemes: ClassVar[list[UriScheme]] = [UriScheme("spotify")]
 
@@ -25,6 +47,14 @@ class SpotifyBackend(pykka.ThreadingActor, backend.Backend):
         self._audio = audio
         self._bitrate = config["spotify"]["bitrate"]
         self._web_client = None
+        self._process_pool = None
+        self._track_cache = lookup.new_cache()
+        self._image_cache = images.new_cache()
+        self._playlist_cache = playlists.new_cache()
+        self._search_cache = search.new_cache()
+        self._your_music = browse.YourMusic()
+        self._image_files: image_files.ImageFiles | None = None
+        self._search_index: search_index.SearchIndex | None = None
 
         self.library = library.SpotifyLibraryProvider(backend=self)
         self.playback = SpotifyPlaybackProvider(audio=audio, backend=self)
@@ -40,10 +70,48 @@ class SpotifyBackend(pykka.ThreadingActor, backend.Backend):
             proxy_config=self._config["proxy"],
         )
         self._web_client.login()
+        self._track_cache.aliases = self._web_client.track_aliases
+
+        if self._config["spotify"]["allow_cache"]:
+            self._track_cache.store = store.TrackStore(
+                Extension().get_data_dir(self._config) / "tracks.sqlite3",
+                max_age=TRACK_STORE_MAX_AGE,
+            )
+            self._image_cache.store = store.ImageStore(
+                Extension().get_cache_dir(self._config) / "images.sqlite3",
+                max_age=images.CACHE_TTL,
+                max_entries=IMAGE_STORE_MAX_ENTRIES,
+            )
+            self._search_index = search_index.SearchIndex(
+                Extension().get_cache_dir(self._config) / "library.sqlite3"
+            )
+
+        if image_cache_size := self._config["spotify"]["image_cache_size"]:
+            self._image_files = image_files.ImageFiles(
+                image_files.get_images_dir(self._config),
+                max_size=image_cache_size * 1024 * 1024,
+                session=utils.get_requests_session(self._config["proxy"]),
+                base_url=image_files.get_base_url(self._config),
+            )
+
+        if workers := self._config["spotify"]["playlist_workers"]:
+            # Don't fork, the audio and actor threads make that unsafe.
+            self._process_pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
 
         if self.playlists is not None:
             self.playlists.refresh()
 
+    def on_stop(self) -> None:
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=False, cancel_futures=True)
+            self._process_pool = None
+        if self._image_files is not None:
+            self._image_files.close()
+            self._image_files = None
+
 
 class SpotifyPlaybackProvider(backend.PlaybackProvider):
     backend: SpotifyBackend
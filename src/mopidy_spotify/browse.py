@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import logging
+import threading
 from typing import TYPE_CHECKING, Any
 
 from mopidy.models import Ref
@@ -13,6 +14,8 @@ from mopidy_spotify.web import WebLink
 if TYPE_CHECKING:
     from collections.abc import Iterator
 
+    from mopidy.models import Track
+
     from mopidy_spotify.types import SpotifyConfig
     from mopidy_spotify.web import SpotifyOAuthClient
 
@@ -57,11 +60,24 @@ BROWSE_DIR_URIS = {
 }
 
 
+class YourMusic:
+    """Mirror of the user's saved tracks and albums.
+
+    The items are kept newest first, and kept up to date by only fetching
+    what has been saved since the last time.
+    """
+
+    def __init__(self) -> None:
+        self.items: dict[tuple[str | None, str], list[Any]] = {}
+        self.lock = threading.Lock()
+
+
 def browse(  # noqa: C901, PLR0911, PLR0912
     *,
     config: SpotifyConfig,  # noqa: ARG001
     web_client: SpotifyOAuthClient,
     uri: Uri,
+    your_music: YourMusic | None = None,
 ) -> list[Ref]:
     if uri == ROOT_DIR.uri:
         return _ROOT_DIR_CONTENTS
@@ -91,7 +107,7 @@ def browse(  # noqa: C901, PLR0911, PLR0912
     if uri.startswith("spotify:your:"):
         parts = uri.replace("spotify:your:", "").split(":")
         if len(parts) == 1:
-            return _browse_your_music(web_client, variant=parts[0])
+            return _browse_your_music(web_client, your_music, variant=parts[0])
     if uri.startswith("spotify:playlists:"):
         parts = uri.replace("spotify:playlists:", "").split(":")
         if len(parts) == 1:
@@ -167,26 +183,109 @@ def _browse_toplist_user(web_client: SpotifyOAuthClient, variant: str) -> list[R
         return []
 
 
-def _load_your_music(web_client: SpotifyOAuthClient, variant: str) -> Iterator[Any]:
+def _load_your_music(
+    web_client: SpotifyOAuthClient, your_music: YourMusic | None, variant: str
+) -> Iterator[Any]:
     if not web_client.logged_in:
         return
 
     if variant not in ("tracks", "albums"):
         return
 
-    results = web_client.get_all(
+    # Without a mirror, everything is fetched every time.
+    your_music = your_music if your_music is not None else YourMusic()
+    with your_music.lock:
+        items = _sync_your_music(web_client, your_music, variant)
+    yield from items
+
+
+def get_known_your_music(
+    web_client: SpotifyOAuthClient, your_music: YourMusic | None, variant: str
+) -> list[Any] | None:
+    # As last synced, if ever. The lists are replaced rather than changed, so
+    # there's no need to wait for a sync in progress.
+    if your_music is None:
+        return None
+    return your_music.items.get((web_client.user_id, variant))
+
+
+def get_known_your_tracks(
+    web_client: SpotifyOAuthClient,
+    your_music: YourMusic | None,
+    variant: str,
+    *,
+    bitrate: int | None = None,
+) -> list[Track] | None:
+    items = get_known_your_music(web_client, your_music, variant)
+    if items is None:
+        return None
+    tracks: list[Track] = []
+    for item in items:
+        # The extra level here is to also support "saved track/album objects".
+        web_item = item.get(variant[:-1], item)
+        if variant == "tracks":
+            track = translator.web_to_track(web_item, bitrate=bitrate)
+            tracks += [track] if track is not None else []
+        else:
+            tracks += translator.web_to_album_tracks(web_item, bitrate=bitrate)
+    return tracks
+
+
+def _sync_your_music(
+    web_client: SpotifyOAuthClient, your_music: YourMusic, variant: str
+) -> list[Any]:
+    key = (web_client.user_id, variant)
+    known = your_music.items.get(key, [])
+    known_index: dict[tuple[str | None, str | None], int] = {}
+    for i, item in enumerate(known):
+        known_index.setdefault(_saved_item_key(item, variant), i)
+
+    # Saved items come newest first, so stop at the first one already known.
+    pages = web_client.get_all(
         f"me/{variant}",
         params={"market": "from_token", "limit": 50},
     )
-    for page in results:
-        if not page:
-            continue
-        items = page.get("items", [])
-        yield from items
-
-
-def _browse_your_music(web_client: SpotifyOAuthClient, variant: str) -> list[Ref]:
-    items = _load_your_music(web_client, variant)
+    total = None
+    new_items: list[Any] = []
+    items: list[Any] | None = None
+    for page in pages:
+        if not page or "items" not in page:
+            logger.warning(f"Failed to sync Spotify saved {variant}")
+            return known
+        if total is None:
+            total = page.get("total")
+        for item in page["items"]:
+            if (index := known_index.get(_saved_item_key(item, variant))) is not None:
+                # Anything newer that we knew about has been removed.
+                items = new_items + known[index:]
+                break
+            new_items.append(item)
+        if items is not None:
+            break
+    if items is None:
+        items = new_items
+
+    if known and total is not None and len(items) != total:
+        # Older items have been removed too, start over.
+        logger.debug(f"Resyncing Spotify saved {variant}")
+        your_music.items.pop(key, None)
+        return _sync_your_music(web_client, your_music, variant)
+
+    logger.debug(f"Synced {len(new_items)} new Spotify saved {variant}")
+    your_music.items[key] = items
+    return items
+
+
+def _saved_item_key(item: Any, variant: str) -> tuple[str | None, str | None]:
+    # The extra level here is to also support "saved track/album objects".
+    web_item = item.get(variant[:-1], item)
+    return item.get("added_at"), web_item.get("uri")
+
+
+def _browse_your_music(
+    web_client: SpotifyOAuthClient, your_music: YourMusic | None, variant: str
+) -> list[Ref]:
+    items = _load_your_music(web_client, your_music, variant)
     match variant:
         case "tracks":
             return list(translator.web_to_track_refs(items))
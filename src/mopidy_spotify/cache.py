@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, NamedTuple
+
+from mopidy_spotify import utils
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Hashable
+
+
+class _Entry[V](NamedTuple):
+    value: V
+    size: int
+    expires: float | None
+
+
+class LRUCache[K: Hashable, V]:
+    """Thread-safe cache that evicts the least recently used entries.
+
+    The cache is bounded both by the number of entries and, if ``max_size`` is
+    set, by the approximate total size of the values as given by ``size_of``.
+    Entries can optionally expire ``ttl`` seconds after they were stored.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int,
+        max_size: int = 0,
+        ttl: float | None = None,
+        size_of: Callable[[V], int] | None = None,
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self.ttl = ttl
+        self.stats = utils.CacheStats()
+        self._size_of = size_of or (lambda _: 1)
+        self._size = 0
+        self._entries: OrderedDict[K, _Entry[V]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: K) -> V | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._expired(entry):
+                self._remove(key)
+                entry = None
+            self.stats.record(hit=entry is not None)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry.value
+
+    def set(self, key: K, value: V, *, ttl: float | None = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        expires = time.monotonic() + ttl if ttl is not None else None
+        entry = _Entry(value, self._size_of(value), expires)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if self.max_size and entry.size > self.max_size:
+                return  # Don't flush everything else for a single huge value.
+            self._entries[key] = entry
+            self._size += entry.size
+            self._evict()
+
+    def pop(self, key: K) -> V | None:
+        with self._lock:
+            if key not in self._entries:
+                return None
+            return self._remove(key).value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def __contains__(self, key: object) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)  # pyright: ignore[reportArgumentType]
+            return entry is not None and not self._expired(entry)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __str__(self) -> str:
+        return (
+            f"{len(self)}/{self.max_entries} entries, "
+            f"size {self._size}/{self.max_size or 'unbounded'}, {self.stats}"
+        )
+
+    def _expired(self, entry: _Entry[V]) -> bool:
+        return entry.expires is not None and entry.expires < time.monotonic()
+
+    def _remove(self, key: K) -> _Entry[V]:
+        entry = self._entries.pop(key)
+        self._size -= entry.size
+        return entry
+
+    def _evict(self) -> None:
+        while self._entries and (
+            len(self._entries) > self.max_entries
+            or (self.max_size and self._size > self.max_size)
+        ):
+            key = next(iter(self._entries))
+            self._remove(key)
@@ -3,7 +3,7 @@ from __future__ import annotations
 import logging
 from typing import TYPE_CHECKING
 
-from mopidy_spotify import search
+from mopidy_spotify import distinct_index, search
 
 if TYPE_CHECKING:
     from collections.abc import Generator
@@ -12,18 +12,21 @@ if TYPE_CHECKING:
     from mopidy.types import DistinctField, Query, SearchField
 
     from mopidy_spotify.playlists import SpotifyPlaylistsProvider
+    from mopidy_spotify.search import SearchCache
     from mopidy_spotify.types import SpotifyConfig
     from mopidy_spotify.web import SpotifyOAuthClient
 
 logger = logging.getLogger(__name__)
 
 
-def get_distinct(
+def get_distinct(  # noqa: PLR0913
     config: SpotifyConfig,
     playlists: SpotifyPlaylistsProvider,
     web_client: SpotifyOAuthClient,
     field: DistinctField,
     query: Query[SearchField] | None = None,
+    *,
+    search_cache: SearchCache | None = None,
 ) -> set[str]:
     # To make the returned data as interesting as possible, we limit
     # ourselves to data extracted from the user's playlists when no search
@@ -32,15 +35,19 @@ def get_distinct(
     if not web_client.logged_in:
         return set()
 
+    if not query:
+        logger.debug(f"Getting distinct {field}s from playlists")
+        return _get_playlist_values(config, playlists, field)
+
     match field:
         case "artist":
-            result = _get_distinct_artists(config, playlists, web_client, query)
+            result = _get_distinct_artists(config, web_client, query, search_cache)
         case "albumartist":
-            result = _get_distinct_albumartists(config, playlists, web_client, query)
+            result = _get_distinct_albumartists(config, web_client, query, search_cache)
         case "album":
-            result = _get_distinct_albums(config, playlists, web_client, query)
+            result = _get_distinct_albums(config, web_client, query, search_cache)
         case "date":
-            result = _get_distinct_dates(config, playlists, web_client, query)
+            result = _get_distinct_dates(config, web_client, query, search_cache)
         case _:
             result = set()
 
@@ -49,91 +56,52 @@ def get_distinct(
 
 def _get_distinct_artists(
     config: SpotifyConfig,
-    playlists: SpotifyPlaylistsProvider,
     web_client: SpotifyOAuthClient,
-    query: Query[SearchField] | None,
+    query: Query[SearchField],
+    search_cache: SearchCache | None,
 ) -> set[str]:
     logger.debug(f"Getting distinct artists: {query}")
-
-    if query:
-        search_result = _get_search(config, web_client, query, artist=True)
-        return {
-            artist.name for artist in search_result.artists if artist.name is not None
-        }
-
-    return {
-        artist.name
-        for track in _get_playlist_tracks(config, playlists, web_client)
-        for artist in track.artists
-        if artist.name is not None
-    }
+    search_result = _get_search(config, web_client, query, search_cache, artist=True)
+    return {artist.name for artist in search_result.artists if artist.name is not None}
 
 
 def _get_distinct_albumartists(
     config: SpotifyConfig,
-    playlists: SpotifyPlaylistsProvider,
     web_client: SpotifyOAuthClient,
-    query: Query[SearchField] | None,
+    query: Query[SearchField],
+    search_cache: SearchCache | None,
 ) -> set[str]:
     logger.debug(f"Getting distinct albumartists: {query}")
-
-    if query:
-        search_result = _get_search(config, web_client, query, album=True)
-        return {
-            artist.name
-            for album in search_result.albums
-            for artist in album.artists
-            if artist.name is not None
-        }
-
+    search_result = _get_search(config, web_client, query, search_cache, album=True)
     return {
         artist.name
-        for track in _get_playlist_tracks(config, playlists, web_client)
-        if track.album and track.album.artists
-        for artist in track.album.artists
+        for album in search_result.albums
+        for artist in album.artists
         if artist.name is not None
     }
 
 
 def _get_distinct_albums(
     config: SpotifyConfig,
-    playlists: SpotifyPlaylistsProvider,
     web_client: SpotifyOAuthClient,
-    query: Query[SearchField] | None,
+    query: Query[SearchField],
+    search_cache: SearchCache | None,
 ) -> set[str]:
     logger.debug(f"Getting distinct albums: {query}")
-
-    if query:
-        search_result = _get_search(config, web_client, query, album=True)
-        return {album.name for album in search_result.albums if album.name is not None}
-
-    return {
-        track.album.name
-        for track in _get_playlist_tracks(config, playlists, web_client)
-        if track.album and track.album.name is not None
-    }
+    search_result = _get_search(config, web_client, query, search_cache, album=True)
+    return {album.name for album in search_result.albums if album.name is not None}
 
 
 def _get_distinct_dates(
     config: SpotifyConfig,
-    playlists: SpotifyPlaylistsProvider,
     web_client: SpotifyOAuthClient,
-    query: Query[SearchField] | None,
+    query: Query[SearchField],
+    search_cache: SearchCache | None,
 ) -> set[str]:
     logger.debug(f"Getting distinct album years: {query}")
-
-    if query:
-        search_result = _get_search(config, web_client, query, album=True)
-        return {
-            album.date
-            for album in search_result.albums
-            if album.date not in (None, "0")
-        }
-
+    search_result = _get_search(config, web_client, query, search_cache, album=True)
     return {
-        f"{track.album.date}"
-        for track in _get_playlist_tracks(config, playlists, web_client)
-        if track.album and track.album.date not in (None, 0)
+        album.date for album in search_result.albums if album.date not in (None, "0")
     }
 
 
@@ -141,6 +109,7 @@ def _get_search(  # noqa: PLR0913
     config: SpotifyConfig,
     web_client: SpotifyOAuthClient,
     query: Query[SearchField],
+    search_cache: SearchCache | None,
     *,
     album: bool = False,
     artist: bool = False,
@@ -159,17 +128,27 @@ def _get_search(  # noqa: PLR0913
         web_client,
         query=query,
         types=types,
+        cache=search_cache,
     )
 
 
-def _get_playlist_tracks(
+def _get_playlist_values(
     config: SpotifyConfig,
     playlists: SpotifyPlaylistsProvider,
-    web_client: SpotifyOAuthClient,  # noqa: ARG001
-) -> Generator[Track]:
-    if not config["allow_playlists"]:
-        return
+    field: DistinctField,
+) -> set[str]:
+    if not config["allow_playlists"] or field not in distinct_index.FIELDS:
+        return set()
+
+    # Kept up to date as the playlists are loaded.
+    if (values := playlists.get_distinct(field)) is not None:
+        return values
+
+    # Until the playlists have been loaded for the first time.
+    return distinct_index.get_values(field, _get_playlist_tracks(playlists))
+
 
+def _get_playlist_tracks(playlists: SpotifyPlaylistsProvider) -> Generator[Track]:
     for playlist_ref in playlists.as_list():
         playlist = playlists.lookup(playlist_ref.uri)
         if playlist:
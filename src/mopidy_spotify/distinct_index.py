@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import threading
+from collections import Counter
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+
+    from mopidy.models import Playlist, Track
+    from mopidy.types import Uri
+
+# The fields get_distinct() can answer from the user's playlists.
+FIELDS = ("artist", "albumartist", "album", "date")
+
+type _Values = dict[str, set[str]]
+
+
+class DistinctIndex:
+    """Distinct values of the tracks in the user's playlists, by field.
+
+    Each playlist's values are kept, along with how many playlists have each
+    value, so that a changed playlist only needs its own tracks gone through
+    again. The values of a field only change when a value is first added or
+    last removed. The values are None until the playlists have been set.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._playlists: dict[Uri, tuple[Playlist, _Values]] | None = None
+        self._counts: dict[str, Counter[str]] = {f: Counter() for f in FIELDS}
+        self._values: _Values = {f: set() for f in FIELDS}
+        # Values first added or last removed since the values were updated.
+        self._added: _Values = {f: set() for f in FIELDS}
+        self._removed: _Values = {f: set() for f in FIELDS}
+
+    def set_playlists(self, playlists: Mapping[Uri, Playlist]) -> None:
+        with self._lock:
+            known = self._playlists or {}
+            for uri in known.keys() - playlists.keys():
+                self._count(known[uri][1], -1)
+            self._playlists = {
+                uri: self._replace(known.get(uri), playlist)
+                for uri, playlist in playlists.items()
+            }
+            self._update_values()
+
+    def update(self, uri: Uri, playlist: Playlist) -> None:
+        # Only playlists that were set, others aren't the user's.
+        with self._lock:
+            if self._playlists is None or (entry := self._playlists.get(uri)) is None:
+                return
+            if entry[0] is playlist:
+                return
+            self._playlists[uri] = self._replace(entry, playlist)
+            self._update_values()
+
+    def get(self, field: str) -> set[str] | None:
+        # The set is replaced rather than changed, but mustn't be changed either.
+        if self._playlists is None:
+            return None
+        return self._values.get(field, set())
+
+    def _replace(
+        self, entry: tuple[Playlist, _Values] | None, playlist: Playlist
+    ) -> tuple[Playlist, _Values]:
+        if entry is not None:
+            if entry[0] is playlist:  # Unchanged, e.g. the same snapshot.
+                return entry
+            self._count(entry[1], -1)
+        values = {field: get_values(field, playlist.tracks) for field in FIELDS}
+        self._count(values, 1)
+        return (playlist, values)
+
+    def _count(self, values: _Values, step: int) -> None:
+        for field, field_values in values.items():
+            counts = self._counts[field]
+            added, removed = self._added[field], self._removed[field]
+            for value in field_values:
+                counts[value] += step
+                if counts[value] <= 0:
+                    del counts[value]
+                    added.discard(value)
+                    removed.add(value)
+                elif step > 0 and counts[value] == 1:
+                    removed.discard(value)
+                    added.add(value)
+
+    def _update_values(self) -> None:
+        # Changed sets are copied first, as readers may be iterating them.
+        for field in FIELDS:
+            values = self._values[field]
+            added = self._added[field] - values
+            removed = self._removed[field] & values
+            self._added[field].clear()
+            self._removed[field].clear()
+            if added or removed:
+                self._values = {**self._values, field: (values | added) - removed}
+
+
+def get_values(field: str, tracks: Iterable[Track]) -> set[str]:
+    match field:
+        case "artist":
+            return {
+                artist.name
+                for track in tracks
+                for artist in track.artists
+                if artist.name is not None
+            }
+        case "albumartist":
+            return {
+                artist.name
+                for track in tracks
+                if track.album and track.album.artists
+                for artist in track.album.artists
+                if artist.name is not None
+            }
+        case "album":
+            return {
+                track.album.name
+                for track in tracks
+                if track.album and track.album.name is not None
+            }
+        case "date":
+            return {
+                f"{track.album.date}"
+                for track in tracks
+                if track.album and track.album.date not in (None, 0)
+            }
+        case _:
+            return set()
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from collections.abc import Mapping, Sequence
+from typing import TYPE_CHECKING, Any
+
+from mopidy_spotify.cache import LRUCache
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from mopidy_spotify.web import WebLink
+
+INDEX_MAX_ENTRIES = 100_000
+
+type _Key = tuple[str, str]
+
+
+class EntityIndex:
+    """Spotify tracks, albums and artists seen in any response, by ID.
+
+    The objects are kept as returned by the Web API, so whoever uses them must
+    check that they have the fields they need. Of two objects for the same ID,
+    the one with the most fields is kept, as some responses only include a
+    selection of fields.
+    """
+
+    def __init__(self, *, max_entries: int = INDEX_MAX_ENTRIES) -> None:
+        self._entries: LRUCache[_Key, Mapping[str, Any]] = LRUCache(
+            max_entries=max_entries
+        )
+
+    def add(self, web_object: Mapping[str, Any] | None) -> None:
+        if not isinstance(web_object, Mapping):
+            return
+        if (key := _make_key(web_object)) is None:
+            return
+        if key[0] == "track" and isinstance(album := web_object.get("album"), Mapping):
+            self.add(album)
+        elif key[0] == "album":
+            self._add_album_tracks(web_object)
+        existing = self._entries.pop(key)
+        if existing is not None and len(existing) > len(web_object):
+            web_object = existing
+        self._entries.set(key, web_object)
+
+    def add_many(self, web_objects: Iterable[Mapping[str, Any] | None]) -> None:
+        for web_object in web_objects:
+            self.add(web_object)
+
+    def _add_album_tracks(self, web_album: Mapping[str, Any]) -> None:
+        # An album's tracks leave out the album, which is what they're most
+        # often needed for, e.g. for their images.
+        web_tracks = (web_album.get("tracks") or {}).get("items")
+        # Multi-page albums have their tracks in a read-only sequence.
+        if not isinstance(web_tracks, Sequence) or isinstance(web_tracks, str):
+            return
+        album = {key: value for key, value in web_album.items() if key != "tracks"}
+        for web_track in web_tracks:
+            if isinstance(web_track, Mapping) and "album" not in web_track:
+                self.add({**web_track, "album": album})
+
+    def get(self, link: WebLink) -> Mapping[str, Any] | None:
+        if link.id is None:
+            return None
+        return self._entries.get((link.type, link.id))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __str__(self) -> str:
+        return str(self._entries)
+
+
+def _make_key(web_object: Mapping[str, Any]) -> _Key | None:
+    if (object_type := web_object.get("type")) not in ("track", "album", "artist"):
+        return None
+    # Relinked tracks are known by the ID they were relinked from.
+    uri = (web_object.get("linked_from") or {}).get("uri") or web_object.get("uri")
+    if not isinstance(uri, str) or not (object_id := uri.rpartition(":")[2]):
+        return None
+    return (object_type, object_id)
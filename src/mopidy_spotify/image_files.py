@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import mimetypes
+import os
+import socket
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any
+
+import requests
+
+from mopidy_spotify import Extension
+
+if TYPE_CHECKING:
+    import pathlib
+    from collections.abc import Iterable
+
+    from mopidy.config import Config
+    from mopidy.core import CoreProxy
+    from mopidy.models import Image
+
+logger = logging.getLogger(__name__)
+
+# Where the files are served by Mopidy's HTTP server, see http_factory().
+URL_PATH = f"/{Extension.ext_name}/images/"
+
+DOWNLOAD_WORKERS = 2
+DOWNLOAD_TIMEOUT = 10
+
+
+class ImageFiles:
+    """Images downloaded once into a local directory, to be served over HTTP.
+
+    Images that aren't downloaded yet are downloaded in the background, and
+    keep their remote URI until then. Downloaded images get a URI starting
+    with ``base_url``. The least recently used files are removed when their
+    total size exceeds ``max_size`` bytes.
+    """
+
+    def __init__(
+        self,
+        path: pathlib.Path,
+        *,
+        max_size: int,
+        session: requests.Session,
+        base_url: str = URL_PATH,
+    ) -> None:
+        self.path = path
+        self.max_size = max_size
+        self.base_url = base_url
+        self._session = session
+        # File names without extension, the URL's hash, to name and size.
+        self._files: OrderedDict[str, tuple[str, int]] = OrderedDict()
+        self._size = 0
+        self._pending: set[str] = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=DOWNLOAD_WORKERS,
+            thread_name_prefix="SpotifyImageFiles",
+        )
+        self._scan()
+
+    def localize(self, images: Iterable[Image]) -> list[Image]:
+        result = []
+        downloads = []
+        for image in images:
+            if not image.uri.startswith(("http://", "https://")):
+                result.append(image)
+                continue
+            stem = hashlib.sha1(image.uri.encode()).hexdigest()  # noqa: S324
+            with self._lock:
+                if (file := self._files.get(stem)) is not None:
+                    self._files.move_to_end(stem)
+                    result.append(image.replace(uri=self.base_url + file[0]))
+                    continue
+                if stem not in self._pending:
+                    self._pending.add(stem)
+                    downloads.append((stem, image.uri))
+            result.append(image)
+        for stem, url in downloads:
+            self._executor.submit(self._download, stem, url)
+        return result
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def _scan(self) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+        entries = []
+        for entry in os.scandir(self.path):
+            if entry.name.startswith("."):  # Left over from a failed download.
+                self._remove_file(entry.name)
+            elif entry.is_file():
+                stat = entry.stat()
+                entries.append((stat.st_mtime, entry.name, stat.st_size))
+        # Oldest first, as the least recently used.
+        for _, name, size in sorted(entries):
+            self._files[name.partition(".")[0]] = (name, size)
+            self._size += size
+        with self._lock:
+            self._evict()
+
+    def _download(self, stem: str, url: str) -> None:
+        file = self._fetch(stem, url)
+        with self._lock:
+            self._pending.discard(stem)
+            if file is not None:
+                self._files[stem] = file
+                self._size += file[1]
+                self._evict()
+
+    def _fetch(self, stem: str, url: str) -> tuple[str, int] | None:
+        try:
+            response = self._session.get(url, timeout=DOWNLOAD_TIMEOUT)
+            response.raise_for_status()
+            content_type = response.headers.get("content-type", "").partition(";")[0]
+            if not content_type.startswith("image/"):
+                logger.debug(f"Not caching {url!r} of type {content_type!r}")
+                return None
+            name = stem + (mimetypes.guess_extension(content_type) or "")
+            # Written under a temporary name, so no half-written file is served.
+            temp_path = self.path / f".{name}"
+            temp_path.write_bytes(response.content)
+            temp_path.replace(self.path / name)
+        except (requests.RequestException, OSError) as exc:
+            logger.debug(f"Failed to download image {url!r}: {exc}")
+            return None
+        return (name, len(response.content))
+
+    def _evict(self) -> None:
+        while self._files and self._size > self.max_size:
+            _, (name, size) = self._files.popitem(last=False)
+            self._size -= size
+            self._remove_file(name)
+
+    def _remove_file(self, name: str) -> None:
+        try:
+            (self.path / name).unlink(missing_ok=True)
+        except OSError as exc:
+            logger.debug(f"Failed to remove image file {name!r}: {exc}")
+
+
+def get_images_dir(config: Config) -> pathlib.Path:
+    return Extension().get_cache_dir(config) / "images"
+
+
+def get_base_url(config: Config) -> str:
+    # Clients may not run on the same host, so they get the full URL.
+    http_config = config.get("http") or {}
+    hostname = http_config.get("hostname") or "127.0.0.1"
+    # Listening on all addresses, so the host's name is used instead.
+    if hostname in ("0.0.0.0", "::"):  # noqa: S104
+        hostname = socket.gethostname()
+    elif ":" in hostname:
+        hostname = f"[{hostname}]"
+    return f"http://{hostname}:{http_config.get('port', 6680)}{URL_PATH}"
+
+
+def http_factory(config: Config, _core: CoreProxy) -> list[tuple[Any, ...]]:
+    from tornado.web import StaticFileHandler  # noqa: PLC0415
+
+    if not config["spotify"]["image_cache_size"]:
+        return []
+    return [(r"/images/(.*)", StaticFileHandler, {"path": str(get_images_dir(config))})]
@@ -1,19 +1,26 @@
 from __future__ import annotations
 
+import functools
 import logging
-from typing import TYPE_CHECKING
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any
 
+from mopidy.models import Image
+
+from mopidy_spotify import utils
 from mopidy_spotify.browse import BROWSE_DIR_URIS
+from mopidy_spotify.cache import LRUCache
 from mopidy_spotify.translator import web_to_image
 from mopidy_spotify.utils import group_by_type
-from mopidy_spotify.web import LinkType, WebLink
+from mopidy_spotify.web import API_MAX_CONCURRENT_REQUESTS, LinkType, WebLink
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable
+    from collections.abc import Iterable, Mapping
 
-    from mopidy.models import Image
     from mopidy.types import Uri
 
+    from mopidy_spotify.image_files import ImageFiles
+    from mopidy_spotify.store import ImageStore
     from mopidy_spotify.web import SpotifyOAuthClient
 
 SUPPORTED_TYPES = (
@@ -23,35 +30,94 @@ SUPPORTED_TYPES = (
     LinkType.PLAYLIST,
 )
 
-_cache = {}  # (type, id) -> [Image(), ...]
+CACHE_MAX_ENTRIES = 100_000
+
+# Images are asked for again after a while, mostly for playlist covers that
+# change with their tracks.
+CACHE_TTL = 7 * 24 * 60 * 60
 
 logger = logging.getLogger(__name__)
 
 
+class ImageCache(LRUCache[tuple[LinkType, str | None], list[Image]]):
+    def __init__(
+        self,
+        *,
+        max_entries: int,
+        ttl: float | None = None,
+        store: ImageStore | None = None,
+    ) -> None:
+        super().__init__(max_entries=max_entries, ttl=ttl)
+        # Requested images are also persisted here, to survive restarts.
+        self.store = store
+
+
+def new_cache() -> ImageCache:
+    return ImageCache(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL)
+
+
 def get_images(
     web_client: SpotifyOAuthClient,
     uris: Iterable[Uri],
+    *,
+    cache: ImageCache | None = None,
+    files: ImageFiles | None = None,
 ) -> dict[Uri, list[Image]]:
+    # Without a cache, nothing is remembered between calls.
+    cache = cache if cache is not None else new_cache()
+    links = [link for uri in uris if (link := _parse_uri(uri)) is not None]
+    _load_stored(cache, links)
+
     result: dict[Uri, list[Image]] = {}
-    links = (_parse_uri(u) for u in uris)
+    fetched: list[WebLink] = []
     for link_type, link_group in group_by_type(links):
         batch = []
         for link in link_group:
-            key = _make_cache_key(link)
-            if key in _cache:
-                result[link.uri] = _cache[key]
-            elif link_type == LinkType.PLAYLIST:
-                result.update(_process_one(web_client, link))
+            images = cache.get(_make_cache_key(link))
+            if images is not None:
+                result[link.uri] = images
             else:
                 batch.append(link)
-        result.update(_process_many(web_client, link_type, batch))
+        if link_type == LinkType.PLAYLIST:
+            result.update(_process_playlists(web_client, cache, batch))
+        else:
+            result.update(_process_many(web_client, cache, link_type, batch))
+        fetched += batch
+
+    if cache.store is not None:
+        cache.store.put_many(
+            (_make_store_key(link), result[link.uri])
+            for link in fetched
+            if link.uri in result and _make_cache_key(link) in cache
+        )
+    logger.log(utils.TRACE, f"Image cache: {cache}")
+
+    # Only the returned URIs are local, the cached ones stay remote.
+    if files is not None:
+        result = {uri: files.localize(images) for uri, images in result.items()}
     return result
 
 
+def _load_stored(cache: ImageCache, links: list[WebLink]) -> None:
+    if cache.store is None:
+        return
+    missing = {
+        _make_store_key(link): link
+        for link in links
+        if _make_cache_key(link) not in cache
+    }
+    for store_key, images in cache.store.get_many(missing).items():
+        cache.set(_make_cache_key(missing[store_key]), images)
+
+
 def _make_cache_key(link: WebLink) -> tuple[LinkType, str | None]:
     return (link.type, link.id)
 
 
+def _make_store_key(link: WebLink) -> str:
+    return f"{link.type}:{link.id}"
+
+
 def _parse_uri(uri: Uri) -> WebLink | None:
     if uri in BROWSE_DIR_URIS:
         return None  # These are internal to the extension.
@@ -70,18 +136,42 @@ def _parse_uri(uri: Uri) -> WebLink | None:
     return link
 
 
+def _process_playlists(
+    web_client: SpotifyOAuthClient,
+    cache: ImageCache,
+    links: list[WebLink],
+) -> dict[Uri, list[Image]]:
+    # Playlists can't be batched, but can at least be fetched concurrently.
+    if len(links) <= 1:
+        results = [_process_one(web_client, cache, link) for link in links]
+    else:
+        with ThreadPoolExecutor(
+            max_workers=min(len(links), API_MAX_CONCURRENT_REQUESTS),
+            thread_name_prefix="SpotifyImages",
+        ) as executor:
+            results = list(
+                executor.map(functools.partial(_process_one, web_client, cache), links)
+            )
+    return {uri: images for result in results for uri, images in result.items()}
+
+
 def _process_one(
     web_client: SpotifyOAuthClient,
+    cache: ImageCache,
     link: WebLink,
 ) -> dict[Uri, list[Image]]:
-    data = web_client.get(f"{link.type}s/{link.id}")
-    key = _make_cache_key(link)
-    _cache[key] = [web_to_image(i) for i in data.get("images") or []]
-    return {link.uri: _cache[key]}
+    # Only ask for the images, not the whole playlist with its first tracks.
+    data = web_client.get_one(f"{link.type}s/{link.id}", params={"fields": "images"})
+    images = [web_to_image(i) for i in data.get("images") or []]
+    # Failures aren't remembered, the images are asked for again next time.
+    if data.status_ok and "images" in data:
+        cache.set(_make_cache_key(link), images)
+    return {link.uri: images}
 
 
 def _process_many(
     web_client: SpotifyOAuthClient,
+    cache: ImageCache,
     link_type: LinkType,
     links: list[WebLink],
 ) -> dict[Uri, list[Image]]:
@@ -89,21 +179,64 @@ def _process_many(
     if not links:
         return result
 
-    for link, item in web_client.get_batch(link_type, links):
-        key = _make_cache_key(link)
-        if link_type == LinkType.TRACK:
-            if not (album_item := item.get("album")):
-                continue
-            if not (album_link := _parse_uri(album_item.get("uri"))):
-                continue
-            album_key = _make_cache_key(album_link)
-            if album_key not in _cache:
-                _cache[album_key] = [
-                    web_to_image(i) for i in album_item.get("images") or []
-                ]
-            _cache[key] = _cache[album_key]
+    # Objects seen in earlier responses may already include the images.
+    remaining = []
+    for link in links:
+        if (item := _find_known(web_client, link_type, link)) is not None:
+            _add_images(result, cache, link_type, link, item)
         else:
-            _cache[key] = [web_to_image(i) for i in item.get("images") or []]
-        result[link.uri] = _cache[key]
+            remaining.append(link)
+    if not remaining:
+        return result
+
+    for link, item in web_client.get_batch(link_type, remaining):
+        _add_images(result, cache, link_type, link, item)
 
     return result
+
+
+def _find_known(
+    web_client: SpotifyOAuthClient,
+    link_type: LinkType,
+    link: WebLink,
+) -> Mapping[str, Any] | None:
+    item = web_client.entities.get(link)
+    if item is None:
+        return None
+    if link_type != LinkType.TRACK:
+        return item if "images" in item else None
+
+    album_item = item.get("album") or {}
+    if "images" in album_item:
+        return item
+    # The track's album may have been seen by itself, with its images.
+    album_uri = album_item.get("uri")
+    if not album_uri or not (album_link := _parse_uri(album_uri)):
+        return None
+    album_item = web_client.entities.get(album_link) or {}
+    if "images" not in album_item:
+        return None
+    return {**item, "album": album_item}
+
+
+def _add_images(
+    result: dict[Uri, list[Image]],
+    cache: ImageCache,
+    link_type: LinkType,
+    link: WebLink,
+    item: Mapping[str, Any],
+) -> None:
+    if link_type == LinkType.TRACK:
+        if not (album_item := item.get("album")):
+            return
+        if not (album_link := _parse_uri(album_item.get("uri"))):
+            return
+        album_key = _make_cache_key(album_link)
+        images = cache.get(album_key)
+        if images is None:
+            images = [web_to_image(i) for i in album_item.get("images") or []]
+            cache.set(album_key, images)
+    else:
+        images = [web_to_image(i) for i in item.get("images") or []]
+    cache.set(_make_cache_key(link), images)
+    result[link.uri] = images
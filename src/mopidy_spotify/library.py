@@ -35,6 +35,7 @@ class SpotifyLibraryProvider(backend.LibraryProvider):
             config=self._config,
             web_client=self._backend._web_client,
             uri=uri,
+            your_music=self._backend._your_music,
         )
 
     @override
@@ -51,19 +52,33 @@ class SpotifyLibraryProvider(backend.LibraryProvider):
             self._backend._web_client,
             field,
             query,
+            search_cache=self._backend._search_cache,
         )
 
     @override
     def get_images(self, uris: Iterable[Uri]) -> dict[Uri, list[Image]]:
         if self._backend._web_client is None:
             return {}
-        return images.get_images(self._backend._web_client, uris)
+        return images.get_images(
+            self._backend._web_client,
+            uris,
+            cache=self._backend._image_cache,
+            files=self._backend._image_files,
+        )
 
     @override
     def lookup_many(self, uris: Iterable[Uri]) -> dict[Uri, list[Track]]:
         if self._backend._web_client is None:
             return {}
-        return lookup.lookup(self._config, self._backend._web_client, uris)
+        return lookup.lookup(
+            self._config,
+            self._backend._web_client,
+            uris,
+            cache=self._backend._track_cache,
+            playlist_cache=self._backend._playlist_cache,
+            your_music=self._backend._your_music,
+            timeout=self._config["lookup_timeout"] or None,
+        )
 
     @override
     def search(
@@ -80,4 +95,9 @@ class SpotifyLibraryProvider(backend.LibraryProvider):
             query=query,
             uris=uris,
             exact=exact,
+            cache=self._backend._search_cache,
+            track_cache=self._backend._track_cache,
+            playlist_cache=self._backend._playlist_cache,
+            your_music=self._backend._your_music,
+            index=self._backend._search_index,
         )
@@ -1,19 +1,26 @@
 from __future__ import annotations
 
+import concurrent.futures
+import functools
 import logging
-from typing import TYPE_CHECKING
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any
 
 from mopidy import models
 from mopidy.models import Track
 from mopidy.types import Uri
 
-from mopidy_spotify import browse, playlists, translator
+from mopidy_spotify import browse, playlists, translator, utils
+from mopidy_spotify.cache import LRUCache
 from mopidy_spotify.utils import group_by_type
 from mopidy_spotify.web import LinkType, WebLink
 
 if TYPE_CHECKING:
-    from collections.abc import Generator, Iterable
+    from collections.abc import Callable, Iterable, Mapping
 
+    from mopidy_spotify.browse import YourMusic
+    from mopidy_spotify.playlists import PlaylistCache
+    from mopidy_spotify.store import TrackStore
     from mopidy_spotify.types import SpotifyConfig
     from mopidy_spotify.web import SpotifyOAuthClient
 
@@ -21,64 +28,241 @@ logger = logging.getLogger(__name__)
 
 _VARIOUS_ARTISTS_URI = "spotify:artist:0LyfQWJT6nXafLPZqxe9Of"
 
-# Only for tracks and albums where the result doesn't change.
-_cache: dict[tuple[LinkType, str | None], list[Track]] = {}
+CACHE_MAX_ENTRIES = 100_000
+CACHE_MAX_SIZE = 256 * 1024 * 1024
 
+# Maximum number of playlist, artist, etc. lookups sent concurrently.
+LOOKUP_WORKERS = 4
 
-def lookup(
+# Results that were still being looked up when the caller gave up are kept
+# for this many seconds, so that asking again soon gets them from the cache.
+LATE_RESULT_TTL = 600
+
+# Rough size in bytes of a translated Track, including its album and artists.
+_APPROX_TRACK_SIZE = 2048
+
+
+type _CacheKey = tuple[LinkType, str | None]
+type _LookupResult = dict[Uri, list[Track]]
+type _LookupJob = Callable[[], _LookupResult]
+
+
+# Mostly for tracks and albums where the result doesn't change.
+class TrackCache(LRUCache[_CacheKey, list[Track]]):
+    def __init__(
+        self,
+        *,
+        max_entries: int,
+        max_size: int = 0,
+        ttl: float | None = None,
+        store: TrackStore | None = None,
+    ) -> None:
+        super().__init__(
+            max_entries=max_entries,
+            max_size=max_size,
+            ttl=ttl,
+            size_of=lambda tracks: len(tracks) * _APPROX_TRACK_SIZE,
+        )
+        # Single tracks are also persisted here, to survive restarts.
+        self.store = store
+        # Relinked track IDs, which are cached under their original ID.
+        self.aliases: Mapping[str, str] = {}
+        # Lookups still running in the background, to be shared by callers
+        # asking for the same again.
+        self.running: dict[_CacheKey, Future[_LookupResult]] = {}
+
+    def make_key(self, link: WebLink) -> _CacheKey:
+        if link.type not in (LinkType.TRACK, LinkType.ALBUM):
+            # Not all of these have an ID, e.g. your music or starred tracks.
+            return (link.type, link.canonical_uri)
+        if (
+            link.type == LinkType.TRACK
+            and link.id is not None
+            and link.id in self.aliases
+        ):
+            return (link.type, self.aliases[link.id])
+        return (link.type, link.id)
+
+
+def new_cache(*, ttl: float | None = None) -> TrackCache:
+    return TrackCache(
+        max_entries=CACHE_MAX_ENTRIES,
+        max_size=CACHE_MAX_SIZE,
+        ttl=ttl,
+    )
+
+
+def lookup(  # noqa: PLR0913
     config: SpotifyConfig,
     web_client: SpotifyOAuthClient,
     uris: Iterable[Uri],
+    *,
+    cache: TrackCache | None = None,
+    playlist_cache: PlaylistCache | None = None,
+    your_music: YourMusic | None = None,
+    timeout: float | None = None,
 ) -> dict[Uri, list[Track]]:
     if not web_client.logged_in:
         logger.error("Not logged in")
         return {}
 
-    result: dict[Uri, list[Track]] = {}
-    links = (_parse_uri(u) for u in uris)
-    for link_type, link_group in group_by_type(links):
+    # Without a cache, nothing is remembered between calls.
+    cache = cache if cache is not None else TrackCache(max_entries=0)
+
+    links = [link for u in uris if (link := _parse_uri(u)) is not None]
+    cached: dict[Uri, list[Track]] = {}
+    jobs: list[tuple[_CacheKey | None, _LookupJob]] = []
+    batched: list[WebLink] = []
+    # Equivalent URIs are looked up once, keyed by their canonical URI.
+    for link_type, link_group in group_by_type(dict.fromkeys(links)):
         batch = []
         for link in link_group:
-            key = _make_cache_key(link)
-            if cached_tracks := _cache.get(key):
-                result[Uri(link.uri)] = cached_tracks
-            elif link_type == LinkType.PLAYLIST:
-                result.update(_lookup_playlist(config, web_client, link))
-            elif link_type == LinkType.YOUR:
-                result.update(_lookup_your(config, web_client, link))
-            elif link_type == LinkType.ARTIST:
-                result.update(_lookup_artist(config, web_client, link))
+            key = cache.make_key(link)
+            if cached_tracks := cache.get(key):
+                cached[Uri(link.canonical_uri)] = cached_tracks
+            elif lookup_func := _LOOKUP_FUNCS.get(link_type):
+                job = functools.partial(lookup_func, config, web_client, cache, link)
+                if link_type == LinkType.PLAYLIST:
+                    job = functools.partial(job, playlist_cache=playlist_cache)
+                elif link_type == LinkType.YOUR:
+                    job = functools.partial(job, your_music=your_music)
+                jobs.append((key, job))
             elif link_type in (LinkType.TRACK, LinkType.ALBUM):
                 batch.append(link)
             else:
                 logger.error(f"Cannot lookup {link_type!r} uri(s)")
                 break
         if batch:
-            result.update(_lookup_batch(config, web_client, link_type, batch))
+            job = functools.partial(
+                _lookup_batch, config, web_client, cache, link_type, batch
+            )
+            jobs.append((None, job))
+            batched += batch
+
+    found = cached | _run_jobs(jobs, cache, timeout=timeout)
+    _add_fetched(cache, batched, found)
+    logger.log(utils.TRACE, f"Lookup cache: {cache}")
+
+    # Return the results in the order they were asked for.
+    return {
+        Uri(link.uri): found[key]
+        for link in links
+        if (key := Uri(link.canonical_uri)) in found
+    }
+
+
+def _run_jobs(
+    jobs: list[tuple[_CacheKey | None, _LookupJob]],
+    cache: TrackCache,
+    *,
+    timeout: float | None,
+) -> dict[Uri, list[Track]]:
+    # Independent lookups block on separate requests, so send them at once.
+    if not jobs:
+        return {}
+    if len(jobs) == 1 and timeout is None and jobs[0][0] not in cache.running:
+        return jobs[0][1]()
+
+    executor = ThreadPoolExecutor(
+        max_workers=min(len(jobs), LOOKUP_WORKERS),
+        thread_name_prefix="SpotifyLookup",
+    )
+    # Lookups left in the background by earlier calls are waited for again.
+    shared = {f for key, _ in jobs if key and (f := cache.running.get(key))}
+    futures = [_submit(executor, cache, key, job) for key, job in jobs]
+    done, not_done = concurrent.futures.wait(futures, timeout=timeout)
+    # Don't wait for the remaining lookups, let them finish in the background.
+    executor.shutdown(wait=False)
+
+    if not_done:
+        logger.info(
+            f"Spotify lookup took more than {timeout}s, "
+            f"finishing {len(not_done)} lookup(s) in the background"
+        )
+        for future in not_done - shared:
+            future.add_done_callback(functools.partial(_cache_late_result, cache))
+
+    result: dict[Uri, list[Track]] = {}
+    for future in futures:
+        if future in done:
+            result.update(future.result())
     return result
 
 
-def _make_cache_key(link: WebLink) -> tuple[LinkType, str | None]:
-    return (link.type, link.id)
+def _add_fetched(
+    cache: TrackCache, links: list[WebLink], found: dict[Uri, list[Track]]
+) -> None:
+    # Tracks and albums are cached as they arrive, so those already fetched
+    # by an unfinished batch are returned too.
+    for link in links:
+        uri = Uri(link.canonical_uri)
+        if uri not in found and (tracks := cache.get(cache.make_key(link))):
+            found[uri] = tracks
+
+
+def _submit(
+    executor: ThreadPoolExecutor,
+    cache: TrackCache,
+    key: _CacheKey | None,
+    job: _LookupJob,
+) -> Future[_LookupResult]:
+    if key is None:
+        return executor.submit(job)
+    if (future := cache.running.get(key)) is not None:
+        return future
+    future = executor.submit(job)
+    cache.running[key] = future
+    future.add_done_callback(functools.partial(_forget_running, cache, key))
+    return future
+
+
+def _forget_running(
+    cache: TrackCache, key: _CacheKey, future: Future[_LookupResult]
+) -> None:
+    if cache.running.get(key) is future:
+        cache.running.pop(key, None)
+
+
+def _cache_late_result(
+    cache: TrackCache, future: Future[dict[Uri, list[Track]]]
+) -> None:
+    if (exc := future.exception()) is not None:
+        logger.error(f"Background Spotify lookup failed: {exc}")
+        return
+    for uri, tracks in future.result().items():
+        link = _parse_uri(uri)
+        # Tracks and albums are already cached for good.
+        if link and tracks and link.type not in (LinkType.TRACK, LinkType.ALBUM):
+            cache.set(cache.make_key(link), tracks, ttl=LATE_RESULT_TTL)
 
 
 def _cache_tracks(
+    cache: TrackCache,
     link: WebLink | None,
     tracks: list[Track],
-) -> tuple[LinkType, str | None] | None:
+    *,
+    stored: list[tuple[str, Track]] | None = None,
+) -> _CacheKey | None:
+    # The tracks to store are added to ``stored`` if given, to be stored
+    # along with others in a single transaction.
     if not tracks or not link:
         return None
 
+    stored_tracks = stored if stored is not None else []
     for t in tracks:
         if (parsed := _parse_uri(t.uri)) is None:
             continue
-        track_key = _make_cache_key(parsed)
-        _cache[track_key] = [t]
+        track_key = cache.make_key(parsed)
+        cache.set(track_key, [t])
+        if parsed.type == LinkType.TRACK and track_key[1] is not None:
+            stored_tracks.append((track_key[1], t))
+    if stored is None and cache.store is not None:
+        cache.store.put_many(stored_tracks)
 
     if link.type not in (LinkType.TRACK, LinkType.ALBUM):
         return None
-    key = _make_cache_key(link)
-    _cache[key] = tracks
+    key = cache.make_key(link)
+    cache.set(key, tracks)
     return key
 
 
@@ -93,11 +277,30 @@ def _parse_uri(uri: Uri) -> WebLink | None:
 def _lookup_batch(
     config: SpotifyConfig,
     web_client: SpotifyOAuthClient,
+    cache: TrackCache,
     link_type: LinkType,
     links: list[WebLink],
-) -> Generator[tuple[Uri, list[Track]]]:
+) -> dict[Uri, list[Track]]:
     bitrate = config["bitrate"]
-    for link, item in web_client.get_batch(link_type, links):
+    result: dict[Uri, list[Track]] = {}
+    stored: list[tuple[str, Track]] = []
+
+    # Objects seen in earlier responses may be complete enough already.
+    remaining = []
+    for link in links:
+        known = _translate_known(web_client, link_type, link, bitrate)
+        if known is not None:
+            _cache_tracks(cache, link, known, stored=stored)
+            result[Uri(link.canonical_uri)] = known
+        else:
+            remaining.append(link)
+    links = remaining
+
+    if link_type == LinkType.TRACK and cache.store is not None:
+        links = _lookup_stored(cache, cache.store, links, bitrate, result)
+
+    web_items = web_client.get_batch(link_type, links) if links else []
+    for link, item in web_items:
         results: list[Track] = []
         if link_type == LinkType.TRACK:
             if (track := translator.web_to_track(item, bitrate=bitrate)) is not None:
@@ -106,57 +309,115 @@ def _lookup_batch(
                 logger.info(f"Track '{link.uri}' not found")
         else:
             results = translator.web_to_album_tracks(item, bitrate=bitrate)
-        _cache_tracks(link, results)
-        yield Uri(link.uri), results
+        _cache_tracks(cache, link, results, stored=stored)
+        result[Uri(link.canonical_uri)] = results
+
+    # All at once, rather than a transaction per track.
+    if cache.store is not None:
+        cache.store.put_many(stored)
+    return result
+
+
+def _lookup_stored(
+    cache: TrackCache,
+    store: TrackStore,
+    links: list[WebLink],
+    bitrate: int,
+    result: dict[Uri, list[Track]],
+) -> list[WebLink]:
+    keys = {link: cache.make_key(link) for link in links}
+    stored = store.get_many(track_id for _, track_id in keys.values() if track_id)
+    remaining = []
+    for link in links:
+        _, track_id = keys[link]
+        track = stored.get(track_id) if track_id else None
+        if track is not None and track.bitrate == bitrate:
+            cache.set(keys[link], [track])
+            result[Uri(link.canonical_uri)] = [track]
+        else:
+            remaining.append(link)
+    return remaining
+
+
+def _translate_known(
+    web_client: SpotifyOAuthClient,
+    link_type: LinkType,
+    link: WebLink,
+    bitrate: int,
+) -> list[Track] | None:
+    item = web_client.entities.get(link)
+    if item is None or "is_playable" not in item:
+        return None
+    if link_type == LinkType.TRACK:
+        if not all(key in item for key in ("album", "artists", "duration_ms")):
+            return None
+        track = translator.web_to_track(item, bitrate=bitrate)
+        return [track] if track is not None else []
+    # Only albums with all their tracks, as fetched by lookups and browsing.
+    web_tracks = item.get("tracks") or {}
+    if len(web_tracks.get("items") or []) < web_tracks.get("total", 1):
+        return None
+    return translator.web_to_album_tracks(item, bitrate=bitrate)
 
 
 def _lookup_artist(
     config: SpotifyConfig,
     web_client: SpotifyOAuthClient,
+    cache: TrackCache,
     link: WebLink,
 ) -> dict[Uri, list[Track]]:
     results: list[Track] = []
-    for web_album in web_client.get_artist_albums(link):
-        is_various_artists = False
-        if web_album.get("album_type", "") == "compilation":
-            continue
-        for artist in web_album.get("artists", []):
-            if artist.get("uri") == _VARIOUS_ARTISTS_URI:
-                is_various_artists = True
-                break
-        if is_various_artists:
-            continue
+    web_albums = web_client.get_artist_albums(link, album_filter=_is_artist_album)
+    for web_album in web_albums:
+        if not _is_artist_album(web_album):
+            continue  # Already filtered by the web client, but cheap to recheck.
         album_tracks = translator.web_to_album_tracks(
             web_album, bitrate=config["bitrate"]
         )
         album_uri = web_album.get("uri")
         album_link = _parse_uri(album_uri) if album_uri else None
-        _cache_tracks(album_link, album_tracks)
+        _cache_tracks(cache, album_link, album_tracks)
         results += album_tracks
-    return {Uri(link.uri): results}
+    return {Uri(link.canonical_uri): results}
+
+
+def _is_artist_album(web_album: Mapping[str, Any]) -> bool:
+    if web_album.get("album_type", "") == "compilation":
+        return False
+    return all(
+        artist.get("uri") != _VARIOUS_ARTISTS_URI
+        for artist in web_album.get("artists", [])
+    )
 
 
 def _lookup_playlist(
     config: SpotifyConfig,
     web_client: SpotifyOAuthClient,
+    cache: TrackCache,
     link: WebLink,
+    *,
+    playlist_cache: PlaylistCache | None = None,
 ) -> dict[Uri, list[Track]]:
     playlist = playlists.playlist_lookup(
         web_client,
-        link.uri,
+        Uri(link.canonical_uri),
         bitrate=config["bitrate"],
+        cache=playlist_cache,
     )
     if not isinstance(playlist, models.Playlist):
         logger.error(f"Playlist '{link.uri}' not found")
         return {}
-    _cache_tracks(link, list(playlist.tracks))
-    return {Uri(link.uri): list(playlist.tracks)}
+    _cache_tracks(cache, link, list(playlist.tracks))
+    return {Uri(link.canonical_uri): list(playlist.tracks)}
 
 
 def _lookup_your(
     config: SpotifyConfig,
     web_client: SpotifyOAuthClient,
+    cache: TrackCache,
     link: WebLink,
+    *,
+    your_music: YourMusic | None = None,
 ) -> dict[Uri, list[Track]]:
     parts = link.uri.replace("spotify:your:", "").split(":")
     if len(parts) != 1:
@@ -168,15 +429,16 @@ def _lookup_your(
         return {}
 
     results = list[Track]()
-    items = browse._load_your_music(web_client, variant)
+    items = browse._load_your_music(web_client, your_music, variant)
     if variant == "tracks":
         for item in items:
             # The extra level here is to also support "saved track objects".
             web_track = item.get("track", item)
             track = translator.web_to_track(web_track, bitrate=config["bitrate"])
             if track is not None:
-                _cache_tracks(_parse_uri(track.uri), [track])
                 results.append(track)
+        # All at once, to store them in a single transaction.
+        _cache_tracks(cache, link, results)
     elif variant == "albums":
         album_uris = list[Uri]()
         for item in items:
@@ -185,7 +447,14 @@ def _lookup_your(
             if (album_ref := translator.web_to_album_ref(web_album)) is None:
                 continue
             album_uris.append(Uri(album_ref.uri))
-        album_results = lookup(config, web_client, album_uris)
+        album_results = lookup(config, web_client, album_uris, cache=cache)
         for u in album_uris:
             results += album_results.get(u, [])
-    return {link.uri: results}
+    return {Uri(link.canonical_uri): results}
+
+
+_LOOKUP_FUNCS = {
+    LinkType.PLAYLIST: _lookup_playlist,
+    LinkType.YOUR: _lookup_your,
+    LinkType.ARTIST: _lookup_artist,
+}
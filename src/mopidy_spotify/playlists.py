@@ -2,17 +2,19 @@ from __future__ import annotations
 
 import logging
 import threading
-from typing import TYPE_CHECKING, Literal, overload, override
+from typing import TYPE_CHECKING, Any, Literal, overload, override
 
 from mopidy import backend
 from mopidy.core import CoreListener
 
-from mopidy_spotify import translator, utils
+from mopidy_spotify import browse, distinct_index, search_index, translator, utils
+from mopidy_spotify.cache import LRUCache
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable
+    from collections.abc import Iterable, Mapping
+    from concurrent.futures import Executor
 
-    from mopidy.models import Playlist, Ref
+    from mopidy.models import Playlist, Ref, Track
     from mopidy.types import Uri
 
     from mopidy_spotify.backend import SpotifyBackend
@@ -20,29 +22,67 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Enough for the playlists of most users, and a bound on their total tracks.
+CACHE_MAX_ENTRIES = 1000
+CACHE_MAX_TRACKS = 100_000
+
+# Playlists with at least this many items are translated in a worker process,
+# if the backend has a process pool.
+OFFLOAD_MIN_ITEMS = 1000
+
+
+# Translated playlists by URI, with the bitrate and snapshot they came from.
+type PlaylistCache = LRUCache[Uri, tuple[int | None, str | None, Playlist]]
+
+
+def new_cache() -> PlaylistCache:
+    return LRUCache(
+        max_entries=CACHE_MAX_ENTRIES,
+        max_size=CACHE_MAX_TRACKS,
+        size_of=lambda entry: len(entry[2].tracks),
+    )
+
 
 class SpotifyPlaylistsProvider(backend.PlaylistsProvider):
     def __init__(self, backend: SpotifyBackend) -> None:
         self._backend = backend
         self._timeout = self._backend._config["spotify"]["timeout"]
         self._refresh_mutex = threading.Lock()
+        self._refs: tuple[Ref, ...] = ()
+        self._refs_key: tuple[Any, ...] | None = None
+        self._refs_stats = utils.CacheStats()
+        self._distinct = distinct_index.DistinctIndex()
 
     @override
     def as_list(self) -> list[Ref]:
         with utils.time_logger("playlists.as_list()", logging.DEBUG):
-            return self._get_flattened_playlist_refs()
+            return list(self._get_flattened_playlist_refs())
 
     def _get_flattened_playlist_refs(
         self,
         *,
         refresh: bool = False,
-    ) -> list[Ref]:
+    ) -> tuple[Ref, ...]:
         web_client = self._backend._web_client
         if web_client is None or not web_client.logged_in:
-            return []
+            return ()
 
-        user_playlists = web_client.get_user_playlists(refresh=refresh)
-        return list(translator.to_playlist_refs(user_playlists, web_client.user_id))
+        # The pages themselves are cached and revalidated by the web client,
+        # so only rebuild the refs if the playlist metadata actually changed.
+        user_playlists = list(web_client.get_user_playlists(refresh=refresh))
+        key = (web_client.user_id, *map(_playlist_refs_key, user_playlists))
+        hit = key == self._refs_key
+        self._refs_stats.record(hit=hit)
+        logger.log(
+            utils.TRACE,
+            f"Playlist refs cache {'hit' if hit else 'miss'} ({self._refs_stats})",
+        )
+        if not hit:
+            self._refs = tuple(
+                translator.to_playlist_refs(user_playlists, web_client.user_id)
+            )
+            self._refs_key = key
+        return self._refs
 
     @override
     def get_items(self, uri: Uri) -> list[Ref] | None:
@@ -61,12 +101,21 @@ class SpotifyPlaylistsProvider(backend.PlaylistsProvider):
         if self._backend._web_client is None:
             return None
         with utils.time_logger(f"playlists.lookup({uri!r})", logging.DEBUG):
-            return playlist_lookup(
+            playlist = playlist_lookup(
                 self._backend._web_client,
                 uri,
                 bitrate=self._backend._bitrate,
                 as_items=False,
+                executor=self._backend._process_pool,
+                cache=self._backend._playlist_cache,
             )
+        if playlist is not None:
+            self._distinct.update(uri, playlist)
+        return playlist
+
+    def get_distinct(self, field: str) -> set[str] | None:
+        # None until the playlists have been refreshed once.
+        return self._distinct.get(field)
 
     @override
     def refresh(self) -> None:
@@ -93,10 +142,18 @@ class SpotifyPlaylistsProvider(backend.PlaylistsProvider):
             return []
         try:
             with utils.time_logger("playlists._refresh_tracks()", logging.DEBUG):
-                refreshed = [uri for uri in playlist_uris if self.lookup(uri)]
+                loaded = {
+                    uri: playlist
+                    for uri in playlist_uris
+                    if (playlist := self.lookup(uri))
+                }
+                refreshed = list(loaded)
                 logger.info(f"Refreshed {len(refreshed)} Spotify playlists")
 
+            self._distinct.set_playlists(loaded)
             CoreListener.send("playlists_loaded")
+            self._index_library(loaded)
+            self._prefetch_images(loaded.values())
         except Exception:
             logger.exception("Error occurred while refreshing Spotify playlists tracks")
             return []
@@ -105,6 +162,56 @@ class SpotifyPlaylistsProvider(backend.PlaylistsProvider):
         finally:
             self._refresh_mutex.release()
 
+    def _index_library(self, loaded: Mapping[Uri, Playlist]) -> None:
+        index = self._backend._search_index
+        web_client = self._backend._web_client
+        if index is None or web_client is None:
+            return
+        bitrate = self._backend._config["spotify"]["bitrate"]
+        try:
+            with utils.time_logger("playlists._index_library()", logging.DEBUG):
+                sources: dict[Uri, Iterable[Track]] = {
+                    uri: playlist.tracks for uri, playlist in loaded.items()
+                }
+                # Saved music only as last synced, e.g. when browsed or looked
+                # up, rather than syncing it on every refresh.
+                for uri in search_index.LIBRARY_URIS:
+                    variant = uri.removeprefix("spotify:your:")
+                    tracks = browse.get_known_your_tracks(
+                        web_client,
+                        self._backend._your_music,
+                        variant,
+                        bitrate=bitrate,
+                    )
+                    if tracks is not None:
+                        sources[uri] = tracks
+                # Keep what was indexed before if the saved music isn't known.
+                keep = [uri for uri in search_index.LIBRARY_URIS if uri not in sources]
+                index.update(sources, keep=keep)
+        except Exception:
+            logger.exception("Error occurred while indexing Spotify library")
+
+    def _prefetch_images(self, playlists: Iterable[Playlist]) -> None:
+        # Getting the images is enough to have them downloaded in the background.
+        library = self._backend.library
+        if (
+            library is None
+            or self._backend._image_files is None
+            or not self._backend._config["spotify"]["prefetch_images"]
+        ):
+            return
+        uris: dict[Uri, None] = {}
+        for playlist in playlists:
+            uris[playlist.uri] = None
+            for track in playlist.tracks:
+                if track.album is not None and track.album.uri is not None:
+                    uris[track.album.uri] = None
+        try:
+            with utils.time_logger("playlists._prefetch_images()", logging.DEBUG):
+                library.get_images(list(uris))
+        except Exception:
+            logger.exception("Error occurred while prefetching Spotify images")
+
     @override
     def create(self, name: str) -> Playlist | None:
         pass  # TODO: Implement
@@ -118,6 +225,16 @@ class SpotifyPlaylistsProvider(backend.PlaylistsProvider):
         pass  # TODO: Implement
 
 
+def _playlist_refs_key(web_playlist: Mapping[str, Any]) -> tuple[Any, ...]:
+    return (
+        web_playlist.get("uri"),
+        web_playlist.get("type"),
+        web_playlist.get("name"),
+        web_playlist.get("snapshot_id"),
+        (web_playlist.get("owner") or {}).get("id"),
+    )
+
+
 @overload
 def playlist_lookup(
     web_client: SpotifyOAuthClient,
@@ -125,6 +242,8 @@ def playlist_lookup(
     *,
     bitrate: int | None,
     as_items: Literal[True],
+    executor: Executor | None = None,
+    cache: PlaylistCache | None = None,
 ) -> list[Ref] | None: ...
 
 
@@ -135,34 +254,98 @@ def playlist_lookup(
     *,
     bitrate: int | None,
     as_items: Literal[False] = False,
+    executor: Executor | None = None,
+    cache: PlaylistCache | None = None,
 ) -> Playlist | None: ...
 
 
-def playlist_lookup(
+def playlist_lookup(  # noqa: PLR0913
     web_client: SpotifyOAuthClient,
     uri: Uri,
     *,
     bitrate: int | None,
     as_items: bool = False,
+    executor: Executor | None = None,
+    cache: PlaylistCache | None = None,
 ) -> Playlist | list[Ref] | None:
     if not web_client.logged_in:
         return None
 
     logger.debug(f"Fetching Spotify playlist {uri!r}")
-    web_playlist = web_client.get_playlist(uri)
+    web_playlist = web_client.get_playlist(uri, as_items=as_items)
 
     if not web_playlist:
         logger.error(f"Failed to lookup Spotify playlist URI {uri!r}")
         return None
 
-    playlist = translator.to_playlist(
-        web_playlist,
-        username=web_client.user_id,
-        bitrate=bitrate,
-        as_items=as_items,
-    )
-    # TODO: cache the Mopidy tracks? And handle as_items here instead of translator
-    if playlist is None:
-        return None
+    if as_items:
+        return translator.to_playlist(
+            web_playlist,
+            username=web_client.user_id,
+            bitrate=bitrate,
+            as_items=True,
+        )
+
+    snapshot_id = web_playlist.get("snapshot_id")
+    known_tracks: dict[Uri, Track] = {}
+    if cache is not None and (cached := cache.get(uri)):
+        cached_bitrate, cached_snapshot_id, cached_playlist = cached
+        if cached_bitrate == bitrate:
+            if snapshot_id is not None and snapshot_id == cached_snapshot_id:
+                return cached_playlist
+            known_tracks = {t.uri: t for t in cached_playlist.tracks}
 
+    web_tracks = web_playlist.get("tracks", {}).get("items") or []
+    web_client.add_track_aliases(item.get("track") for item in web_tracks)
+    web_client.entities.add_many(item.get("track") for item in web_tracks)
+    if (
+        executor is not None
+        and not known_tracks
+        and len(web_tracks) >= OFFLOAD_MIN_ITEMS
+    ):
+        playlist = _to_playlist_offloaded(
+            executor, web_playlist, username=web_client.user_id, bitrate=bitrate
+        )
+    else:
+        playlist = translator.to_playlist(
+            web_playlist,
+            username=web_client.user_id,
+            bitrate=bitrate,
+            known_tracks=known_tracks,
+        )
+    if cache is not None:
+        if playlist is None:
+            cache.pop(uri)
+        else:
+            cache.set(uri, (bitrate, snapshot_id, playlist))
     return playlist
+
+
+def get_cached(cache: PlaylistCache | None, uri: Uri) -> Playlist | None:
+    # As last looked up, without checking if it has changed since.
+    if cache is None or (cached := cache.get(uri)) is None:
+        return None
+    return cached[2]
+
+
+def _to_playlist_offloaded(
+    executor: Executor,
+    web_playlist: Mapping[str, Any],
+    *,
+    username: str | None,
+    bitrate: int | None,
+) -> Playlist | None:
+    # Only send plain data to the worker, the cached pages are read-only views.
+    web_tracks = web_playlist.get("tracks", {}).get("items") or []
+    data = {
+        **{key: value for key, value in web_playlist.items() if key != "tracks"},
+        "tracks": {"items": list(web_tracks)},
+    }
+    try:
+        future = executor.submit(
+            translator.to_playlist, data, username=username, bitrate=bitrate
+        )
+        return future.result()
+    except Exception:
+        logger.exception("Translating Spotify playlist in worker process failed")
+        return translator.to_playlist(web_playlist, username=username, bitrate=bitrate)
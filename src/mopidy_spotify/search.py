@@ -2,43 +2,89 @@ from __future__ import annotations
 
 import logging
 import urllib.parse
-from typing import TYPE_CHECKING
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any
 
 from mopidy.models import SearchResult
 from mopidy.types import Uri
 
-from mopidy_spotify import lookup, translator
+from mopidy_spotify import browse, lookup, playlists, search_index, translator
+from mopidy_spotify.cache import LRUCache
+from mopidy_spotify.web import API_MAX_CONCURRENT_REQUESTS, LinkType, WebLink
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable
+    from collections.abc import Callable, Iterable, Iterator, Mapping
 
+    from mopidy.models import Track
     from mopidy.types import Query, SearchField
 
+    from mopidy_spotify.browse import YourMusic
+    from mopidy_spotify.lookup import TrackCache
+    from mopidy_spotify.playlists import PlaylistCache
+    from mopidy_spotify.search_index import SearchIndex
     from mopidy_spotify.types import SpotifyConfig
     from mopidy_spotify.web import SpotifyOAuthClient
 
 _SEARCH_TYPES = ["album", "artist", "track"]
 
+# Spotify returns at most this many results of a type per request.
+_SEARCH_PAGE_SIZE = 50
+
+CACHE_MAX_ENTRIES = 1000
+CACHE_TTL = 10 * 60
+
+# Searches within these are sent to Spotify, all others are done locally.
+_ROOT_URIS = {Uri("spotify:"), browse.ROOT_DIR.uri}
+
+# Searches within this are searches within all of the user's saved music.
+_YOUR_MUSIC_URI = Uri("spotify:your")
+
+# Values of a track that fields of a search query are compared with.
+_TRACK_FIELDS: dict[str, Callable[[Track], Iterable[Any]]] = {
+    "track_name": lambda t: [t.name],
+    "album": lambda t: [t.album.name] if t.album else [],
+    "artist": lambda t: [a.name for a in t.artists],
+    "albumartist": lambda t: [a.name for a in t.album.artists] if t.album else [],
+    "composer": lambda t: [a.name for a in t.composers],
+    "performer": lambda t: [a.name for a in t.performers],
+    "genre": lambda t: [t.genre],
+    "date": lambda t: [t.date or (t.album.date if t.album else None)],
+    "track_no": lambda t: [t.track_no],
+    "disc_no": lambda t: [t.disc_no],
+    "comment": lambda t: [t.comment],
+}
+
 logger = logging.getLogger(__name__)
 
+# Translated results of recent searches, as clients that search as you type
+# and get_distinct() tend to repeat them.
+type SearchCache = LRUCache[tuple[Any, ...], SearchResult]
+
+
+def new_cache() -> SearchCache:
+    return LRUCache(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL)
+
 
 def search(  # noqa: PLR0913
     config: SpotifyConfig,
     web_client: SpotifyOAuthClient,
     *,
     query: Query[SearchField] | None = None,
-    uris: Iterable[Uri] | None = None,  # noqa: ARG001
+    uris: Iterable[Uri] | None = None,
     exact: bool = False,
     types: list[str] = _SEARCH_TYPES,
+    cache: SearchCache | None = None,
+    track_cache: TrackCache | None = None,
+    playlist_cache: PlaylistCache | None = None,
+    your_music: YourMusic | None = None,
+    index: SearchIndex | None = None,
 ) -> SearchResult:
-    # TODO: Respect `uris` argument
-
     if not query:
         logger.debug("Ignored search without query")
         return SearchResult(uri=Uri("spotify:search"))
 
     if "uri" in query:
-        return _search_by_uri(config, web_client, query)
+        return _search_by_uri(config, web_client, query, track_cache)
 
     sp_query = translator.sp_search_query(query, exact=exact)
     if not sp_query:
@@ -46,36 +92,118 @@ def search(  # noqa: PLR0913
         return SearchResult(uri=Uri("spotify:search"))
 
     uri = Uri(f"spotify:search:{urllib.parse.quote(sp_query)}")
+
+    # Searches within playlists, albums, etc. are done without Spotify's help.
+    uris = list(uris or [])
+    if uris and all(map(_can_search_within, uris)):
+        logger.info(f"Searching {len(uris)} Spotify URIs for: {sp_query}")
+        return _search_within(
+            config,
+            web_client,
+            uri,
+            query,
+            uris,
+            exact=exact,
+            types=types,
+            track_cache=track_cache,
+            playlist_cache=playlist_cache,
+            your_music=your_music,
+            index=index,
+        )
+
     logger.info(f"Searching Spotify for: {sp_query}")
+    result = _search_web(config, web_client, sp_query, uri, types, cache)
+    # Also a fallback for when Spotify can't be reached.
+    return _add_library_tracks(config, index, result, query, exact, types)
+
+
+def _search_web(  # noqa: PLR0913
+    config: SpotifyConfig,
+    web_client: SpotifyOAuthClient,
+    sp_query: str,
+    uri: Uri,
+    types: list[str],
+    cache: SearchCache | None,
+) -> SearchResult:
+    cache_key = _make_cache_key(config, sp_query, types)
+    if cache is not None and (cached := cache.get(cache_key)) is not None:
+        return cached.replace(uri=uri)
 
     if not web_client.logged_in:
         logger.info("Spotify search aborted: Spotify is offline")
         return SearchResult(uri=uri)
 
-    search_count = max(
-        config["search_album_count"],
-        config["search_artist_count"],
-        config["search_track_count"],
-    )
+    result = _get_results(config, web_client, sp_query, types)
+    search_result = _to_search_result(config, web_client, uri, result, types)
+    # Don't remember failed searches.
+    if cache is not None and any(f"{search_type}s" in result for search_type in types):
+        cache.set(cache_key, search_result)
+    return search_result
 
-    if search_count > 50:  # noqa: PLR2004
-        logger.warning(
-            "Spotify currently allows maximum 50 search results of each type. "
-            "Please set the config values spotify/search_album_count, "
-            "spotify/search_artist_count and spotify/search_track_count "
-            "to at most 50."
+
+def _get_results(
+    config: SpotifyConfig,
+    web_client: SpotifyOAuthClient,
+    sp_query: str,
+    types: list[str],
+) -> dict[str, Any]:
+    # Each type is searched for separately, as many results as configured.
+    counts = {t: config[f"search_{t}_count"] for t in types}
+    counts = {t: count for t, count in counts.items() if count}
+
+    def get_page(page: tuple[str, int]) -> Mapping[str, Any]:
+        search_type, offset = page
+        response = web_client.get(
+            "search",
+            params={
+                "q": sp_query,
+                "limit": min(counts[search_type] - offset, _SEARCH_PAGE_SIZE),
+                "offset": offset,
+                "market": "from_token",
+                "type": search_type,
+            },
         )
-        search_count = 50
-
-    result = web_client.get(
-        "search",
-        params={
-            "q": sp_query,
-            "limit": search_count,
-            "market": "from_token",
-            "type": ",".join(types),
-        },
-    )
+        return response.get(f"{search_type}s") or {}
+
+    with ThreadPoolExecutor(
+        max_workers=API_MAX_CONCURRENT_REQUESTS,
+        thread_name_prefix="SpotifySearch",
+    ) as executor:
+        first_pages = dict(
+            zip(counts, executor.map(get_page, [(t, 0) for t in counts]), strict=True)
+        )
+        # Only ask for more pages if there are that many results.
+        more = [
+            (search_type, offset)
+            for search_type, page in first_pages.items()
+            for offset in range(
+                _SEARCH_PAGE_SIZE,
+                min(counts[search_type], page.get("total") or 0),
+                _SEARCH_PAGE_SIZE,
+            )
+        ]
+        more_pages = list(executor.map(get_page, more))
+
+    result = {
+        f"{search_type}s": {"items": list(page.get("items") or [])}
+        for search_type, page in first_pages.items()
+        if page
+    }
+    for (search_type, _), page in zip(more, more_pages, strict=True):
+        result[f"{search_type}s"]["items"] += page.get("items") or []
+    return result
+
+
+def _to_search_result(
+    config: SpotifyConfig,
+    web_client: SpotifyOAuthClient,
+    uri: Uri,
+    result: Mapping[str, Any],
+    types: list[str],
+) -> SearchResult:
+    for search_type in types:
+        if f"{search_type}s" in result:
+            web_client.entities.add_many(result[f"{search_type}s"]["items"])
 
     albums = (
         [
@@ -99,6 +227,8 @@ def search(  # noqa: PLR0913
     )
     artists = [x for x in artists if x]
 
+    if "tracks" in result:
+        web_client.add_track_aliases(result["tracks"]["items"])
     tracks = (
         [
             translator.web_to_track(web_track)
@@ -117,13 +247,185 @@ def search(  # noqa: PLR0913
     )
 
 
+def _add_library_tracks(  # noqa: PLR0913
+    config: SpotifyConfig,
+    index: SearchIndex | None,
+    result: SearchResult,
+    query: Query[SearchField],
+    exact: bool,  # noqa: FBT001
+    types: list[str],
+) -> SearchResult:
+    if index is None or "track" not in types:
+        return result
+    known = {track.uri for track in result.tracks}
+    found = index.search(query, exact=exact, limit=config["search_track_count"])
+    # Tracks found by Spotify come first, as they are ranked best.
+    added = [track for track in found if track.uri not in known]
+    if not added:
+        return result
+    logger.debug(f"Added {len(added)} tracks from the Spotify library to the result")
+    return result.replace(tracks=(*result.tracks, *added))
+
+
+def _search_within(  # noqa: PLR0913
+    config: SpotifyConfig,
+    web_client: SpotifyOAuthClient,
+    uri: Uri,
+    query: Query[SearchField],
+    uris: list[Uri],
+    *,
+    exact: bool,
+    types: list[str],
+    track_cache: TrackCache | None,
+    playlist_cache: PlaylistCache | None,
+    your_music: YourMusic | None,
+    index: SearchIndex | None,
+) -> SearchResult:
+    limit = config["search_track_count"]
+    if "track" not in types or not limit:
+        return SearchResult(uri=uri)
+
+    # The user's library is already indexed, everything else is filtered here.
+    sources: set[str] = set()
+    other_uris = []
+    for scope_uri in uris:
+        if index is not None and (found := index.get_sources([scope_uri])):
+            sources |= found
+        elif scope_uri == _YOUR_MUSIC_URI:
+            other_uris += search_index.LIBRARY_URIS
+        else:
+            other_uris.append(scope_uri)
+    tracks: dict[Uri | None, Track] = {}
+    if index is not None and sources:
+        tracks = {
+            track.uri: track
+            for track in index.search(query, exact=exact, sources=sources, limit=limit)
+        }
+    for track in _get_tracks_within(
+        config, web_client, other_uris, track_cache, playlist_cache, your_music
+    ):
+        if len(tracks) >= limit:
+            break
+        if track.uri not in tracks and _matches(track, query, exact=exact):
+            tracks[track.uri] = track
+
+    return SearchResult(uri=uri, tracks=tuple(tracks.values()))
+
+
+def _can_search_within(uri: Uri) -> bool:
+    # Other browse directories, e.g. the featured playlists, are searched
+    # with Spotify's help as if no URIs were given.
+    if uri in _ROOT_URIS:
+        return False
+    if uri == _YOUR_MUSIC_URI or uri in search_index.LIBRARY_URIS:
+        return True
+    try:
+        link = WebLink.from_uri(uri)
+    except ValueError:
+        return False
+    return link.type != LinkType.YOUR
+
+
+def _get_tracks_within(  # noqa: PLR0913
+    config: SpotifyConfig,
+    web_client: SpotifyOAuthClient,
+    uris: list[Uri],
+    track_cache: TrackCache | None,
+    playlist_cache: PlaylistCache | None,
+    your_music: YourMusic | None,
+) -> Iterator[Track]:
+    missing = []
+    for scope_uri in uris:
+        if (
+            tracks := _get_known_tracks(
+                config, web_client, scope_uri, track_cache, playlist_cache, your_music
+            )
+        ) is None:
+            missing.append(scope_uri)
+        else:
+            yield from tracks
+    if missing and web_client.logged_in:
+        # Only what hasn't been seen yet is looked up, and cached for next time.
+        logger.debug(f"Looking up {len(missing)} Spotify URIs to search within")
+        results = lookup.lookup(
+            config,
+            web_client,
+            missing,
+            cache=track_cache,
+            playlist_cache=playlist_cache,
+            your_music=your_music,
+        )
+        for tracks in results.values():
+            yield from tracks
+
+
+def _get_known_tracks(  # noqa: PLR0913
+    config: SpotifyConfig,
+    web_client: SpotifyOAuthClient,
+    uri: Uri,
+    track_cache: TrackCache | None,
+    playlist_cache: PlaylistCache | None,
+    your_music: YourMusic | None,
+) -> list[Track] | None:
+    try:
+        link = WebLink.from_uri(uri)
+    except ValueError as exc:
+        logger.info(exc)
+        return []
+
+    match link.type:
+        case LinkType.PLAYLIST:
+            cached = playlists.get_cached(playlist_cache, uri)
+            if cached is None:
+                cached = playlists.get_cached(playlist_cache, Uri(link.canonical_uri))
+            return list(cached.tracks) if cached is not None else None
+        case LinkType.TRACK | LinkType.ALBUM if track_cache is not None:
+            return track_cache.get(track_cache.make_key(link))
+        case LinkType.YOUR:
+            variant = link.uri.removeprefix("spotify:your:")
+            return browse.get_known_your_tracks(
+                web_client, your_music, variant, bitrate=config["bitrate"]
+            )
+        case _:
+            return None
+
+
+def _matches(track: Track, query: Query[SearchField], *, exact: bool) -> bool:
+    for field, values in query.items():
+        if field == "any":
+            track_values = [v for get in _TRACK_FIELDS.values() for v in get(track)]
+        elif (get := _TRACK_FIELDS.get(field)) is not None:
+            track_values = list(get(track))
+        else:
+            return False
+        texts = [str(v).casefold() for v in track_values if v is not None]
+        for value in (str(v).casefold() for v in values):
+            if not any(text == value if exact else value in text for text in texts):
+                return False
+    return True
+
+
+def _make_cache_key(
+    config: SpotifyConfig, sp_query: str, types: list[str]
+) -> tuple[Any, ...]:
+    # Spotify's search ignores case and extra whitespace.
+    return (
+        " ".join(sp_query.casefold().split()),
+        tuple(sorted(types)),
+        config["search_album_count"],
+        config["search_artist_count"],
+        config["search_track_count"],
+    )
+
+
 def _search_by_uri(
     config: SpotifyConfig,
     web_client: SpotifyOAuthClient,
     query: Query[SearchField],
+    track_cache: TrackCache | None,
 ) -> SearchResult:
     uris = [Uri(uri) for uri in query["uri"] if isinstance(uri, str)]
-    results = lookup.lookup(config, web_client, uris)
+    results = lookup.lookup(config, web_client, uris, cache=track_cache)
     tracks = []
     for uri in uris:
         tracks += results.get(uri, [])
@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import contextlib
+import logging
+import re
+import sqlite3
+import threading
+from typing import TYPE_CHECKING
+
+from mopidy.models import Track
+from mopidy.types import Uri
+
+if TYPE_CHECKING:
+    import pathlib
+    from collections.abc import Generator, Iterable, Mapping
+
+    from mopidy.models import Artist
+    from mopidy.types import Query, SearchField
+
+logger = logging.getLogger(__name__)
+
+# The user's saved music, indexed along with their playlists.
+LIBRARY_URIS = (Uri("spotify:your:tracks"), Uri("spotify:your:albums"))
+
+# Indexed columns by the search field they answer, all of them for "any".
+_FIELD_COLUMNS = {
+    "track_name": "name",
+    "album": "album",
+    "artist": "artist",
+    "albumartist": "albumartist",
+}
+_COLUMNS = tuple(_FIELD_COLUMNS.values())
+
+# Roughly what FTS5's unicode61 tokenizer considers a word.
+_WORD_RE = re.compile(r"\w+")
+
+# Separates the names of several artists within a column.
+_SEPARATOR = "\n"
+
+
+class SearchIndex:
+    """Full-text index of the tracks in the user's playlists and saved music.
+
+    Tracks are indexed by the URI of the playlist or saved music they were
+    found in, so that searches can be limited to some of those. The index is
+    kept on disk, to still be searchable when Spotify can't be reached.
+    """
+
+    def __init__(self, path: pathlib.Path) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._sources: frozenset[str] = frozenset()
+        try:
+            with self._connect() as connection:
+                connection.execute(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS tracks USING fts5("
+                    "source UNINDEXED, uri UNINDEXED, date UNINDEXED, "
+                    f"track UNINDEXED, {', '.join(_COLUMNS)}, "
+                    "tokenize = 'unicode61 remove_diacritics 2')"
+                )
+                rows = connection.execute("SELECT DISTINCT source FROM tracks")
+                self._sources = frozenset(source for (source,) in rows)
+        except sqlite3.Error as exc:
+            self._log_error(exc)
+
+    def update(
+        self,
+        sources: Mapping[Uri, Iterable[Track]],
+        *,
+        keep: Iterable[Uri] = (),
+    ) -> None:
+        """Replace the indexed tracks by the tracks of ``sources``.
+
+        The tracks of any other source are removed, except of those in
+        ``keep``, e.g. because they couldn't be loaded this time.
+        """
+        keep = set(keep) - sources.keys()
+        rows = [
+            (source, track.uri, _get_date(track), _dumps(track), *_get_columns(track))
+            for source, tracks in sources.items()
+            for track in tracks
+        ]
+        try:
+            with self._connect() as connection:
+                placeholders = ",".join("?" * len(keep))
+                connection.execute(
+                    f"DELETE FROM tracks WHERE source NOT IN ({placeholders})",  # noqa: S608
+                    tuple(keep),
+                )
+                connection.executemany(
+                    f"INSERT INTO tracks (source, uri, date, track, "  # noqa: S608
+                    f"{', '.join(_COLUMNS)}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+        except sqlite3.Error as exc:
+            self._log_error(exc)
+            return
+        self._sources = frozenset(keep | sources.keys())
+        logger.debug(f"Indexed {len(rows)} tracks from {len(sources)} Spotify sources")
+
+    def get_sources(self, uris: Iterable[Uri]) -> set[str] | None:
+        """The indexed sources within ``uris``, or None if any isn't indexed.
+
+        A URI also includes the sources below it, e.g. ``spotify:your``
+        includes the saved tracks and albums.
+        """
+        result = set()
+        for uri in uris:
+            found = {s for s in self._sources if s == uri or s.startswith(f"{uri}:")}
+            if not found:
+                return None
+            result |= found
+        return result
+
+    def search(
+        self,
+        query: Query[SearchField],
+        *,
+        exact: bool = False,
+        sources: Iterable[str] | None = None,
+        limit: int,
+    ) -> list[Track]:
+        """Tracks matching ``query``, best matches first.
+
+        Queries on fields that aren't indexed, e.g. genre, match nothing.
+        """
+        if limit <= 0 or (sql := _to_sql(query, exact=exact, sources=sources)) is None:
+            return []
+        result: dict[str, Track] = {}
+        try:
+            with self._connect() as connection:
+                for uri, data, *columns in connection.execute(*sql):
+                    if uri in result:
+                        continue
+                    if exact and not _matches_exactly(query, columns):
+                        continue
+                    result[uri] = Track.model_validate_json(data)
+                    if len(result) >= limit:
+                        break
+        except (sqlite3.Error, ValueError) as exc:
+            self._log_error(exc)
+        return list(result.values())
+
+    @contextlib.contextmanager
+    def _connect(self) -> Generator[sqlite3.Connection]:
+        with (
+            self._lock,
+            contextlib.closing(sqlite3.connect(self.path)) as connection,
+            connection,
+        ):
+            yield connection
+
+    def _log_error(self, exc: Exception) -> None:
+        logger.warning(f"Spotify search index {self.path} failed: {exc}")
+
+
+def _to_sql(
+    query: Query[SearchField],
+    *,
+    exact: bool,
+    sources: Iterable[str] | None,
+) -> tuple[str, list[str]] | None:
+    if any(field not in (*_FIELD_COLUMNS, "any", "date") for field in query):
+        return None
+    matches: list[str] = []
+    conditions: list[str] = []
+    params: list[str] = []
+    for field, values in query.items():
+        for value in map(str, values):
+            if field == "date":
+                conditions.append("date = ?" if exact else "date LIKE ?")
+                params.append(value if exact else f"{value}%")
+            elif words := _WORD_RE.findall(value):
+                matches.append(_to_match(_FIELD_COLUMNS.get(field), words, exact=exact))
+    if matches:
+        conditions.insert(0, "tracks MATCH ?")
+        params.insert(0, " AND ".join(matches))
+    if not conditions:
+        return None
+    if sources is not None:
+        sources = list(sources)
+        conditions.append(f"source IN ({','.join('?' * len(sources))})")
+        params += sources
+    sql = (
+        f"SELECT uri, track, {', '.join(_COLUMNS)} FROM tracks "  # noqa: S608
+        f"WHERE {' AND '.join(conditions)} "
+        f"ORDER BY {'rank' if matches else 'rowid'}"
+    )
+    return sql, params
+
+
+def _dumps(track: Track) -> str:
+    return track.model_dump_json(exclude_none=True)
+
+
+def _get_date(track: Track) -> str | None:
+    date = track.date or (track.album.date if track.album else None)
+    return str(date) if date is not None else None
+
+
+def _get_columns(track: Track) -> tuple[str, ...]:
+    album = track.album
+    values = {
+        "name": track.name or "",
+        "artist": _join_names(track.artists),
+        "album": (album.name if album else None) or "",
+        "albumartist": _join_names(album.artists if album else ()),
+    }
+    return tuple(values[column] for column in _COLUMNS)
+
+
+def _join_names(artists: Iterable[Artist]) -> str:
+    return _SEPARATOR.join(artist.name for artist in artists if artist.name)
+
+
+def _to_match(column: str | None, words: list[str], *, exact: bool) -> str:
+    # Words are only letters and digits, so they can be quoted as they are.
+    if exact:
+        expression = f'"{" ".join(words)}"'
+    else:
+        expression = " ".join(f'"{word}"*' for word in words)
+    return f"{column} : ({expression})" if column else f"({expression})"
+
+
+def _matches_exactly(query: Query[SearchField], columns: list[str]) -> bool:
+    # The phrase query also matches longer names, so check for equality.
+    names = {
+        column: {name.casefold() for name in value.split(_SEPARATOR)}
+        for column, value in zip(_COLUMNS, columns, strict=True)
+    }
+    for field, values in query.items():
+        if field == "date":
+            continue
+        column = _FIELD_COLUMNS.get(field)
+        candidates = names[column] if column else set().union(*names.values())
+        if any(str(value).casefold() not in candidates for value in values):
+            return False
+    return True
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import abc
+import contextlib
+import itertools
+import json
+import logging
+import sqlite3
+import threading
+import time
+from typing import TYPE_CHECKING, ClassVar
+
+from mopidy.models import Image, Track
+
+if TYPE_CHECKING:
+    import pathlib
+    from collections.abc import Generator, Iterable
+
+logger = logging.getLogger(__name__)
+
+# Stay well below SQLite's limit on the number of query parameters.
+_MAX_IDS_PER_QUERY = 500
+
+
+class _Store[V](abc.ABC):
+    """Values persisted on disk in a SQLite table, keyed by ID.
+
+    Stored values older than ``max_age`` seconds are ignored and eventually
+    removed, so that changes on Spotify's side are picked up again. If
+    ``max_entries`` is set, only that many of the most recently stored values
+    are kept between restarts.
+    """
+
+    # Names the table, its value column and the log messages.
+    name: ClassVar[str]
+
+    def __init__(
+        self,
+        path: pathlib.Path,
+        *,
+        max_age: float,
+        max_entries: int = 0,
+    ) -> None:
+        self.path = path
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        table = f"{self.name}s"
+        try:
+            with self._connect() as connection:
+                connection.execute(
+                    f"CREATE TABLE IF NOT EXISTS {table} "
+                    f"(id TEXT PRIMARY KEY, {self.name} TEXT NOT NULL, "
+                    "updated REAL NOT NULL)"
+                )
+                connection.execute(
+                    f"DELETE FROM {table} WHERE updated < ?",  # noqa: S608
+                    (time.time() - max_age,),
+                )
+                if max_entries:
+                    connection.execute(
+                        f"DELETE FROM {table} WHERE id NOT IN "  # noqa: S608
+                        f"(SELECT id FROM {table} ORDER BY updated DESC LIMIT ?)",
+                        (max_entries,),
+                    )
+        except sqlite3.Error as exc:
+            self._log_error(exc)
+
+    def get_many(self, ids: Iterable[str]) -> dict[str, V]:
+        oldest = time.time() - self.max_age
+        rows = []
+        try:
+            with self._connect() as connection:
+                for batch in itertools.batched(ids, _MAX_IDS_PER_QUERY, strict=False):
+                    placeholders = ",".join("?" * len(batch))
+                    query = (
+                        f"SELECT id, {self.name} FROM {self.name}s "  # noqa: S608
+                        f"WHERE updated >= ? AND id IN ({placeholders})"
+                    )
+                    rows += connection.execute(query, (oldest, *batch))
+        except sqlite3.Error as exc:
+            self._log_error(exc)
+            return {}
+
+        result: dict[str, V] = {}
+        for value_id, data in rows:
+            try:
+                result[value_id] = self._loads(data)
+            except ValueError as exc:
+                logger.debug(f"Ignoring invalid stored {self.name} {value_id!r}: {exc}")
+        return result
+
+    def put_many(self, values: Iterable[tuple[str, V]]) -> None:
+        now = time.time()
+        rows = [(value_id, self._dumps(value), now) for value_id, value in values]
+        if not rows:
+            return
+        try:
+            with self._connect() as connection:
+                connection.executemany(
+                    f"INSERT OR REPLACE INTO {self.name}s "  # noqa: S608
+                    f"(id, {self.name}, updated) VALUES (?, ?, ?)",
+                    rows,
+                )
+        except sqlite3.Error as exc:
+            self._log_error(exc)
+
+    @abc.abstractmethod
+    def _dumps(self, value: V) -> str: ...
+
+    @abc.abstractmethod
+    def _loads(self, data: str) -> V: ...
+
+    @contextlib.contextmanager
+    def _connect(self) -> Generator[sqlite3.Connection]:
+        # A short-lived connection per operation keeps this usable from any
+        # thread without having to remember to close anything.
+        with (
+            self._lock,
+            contextlib.closing(sqlite3.connect(self.path)) as connection,
+            connection,
+        ):
+            yield connection
+
+    def _log_error(self, exc: sqlite3.Error) -> None:
+        logger.warning(f"Spotify {self.name} store {self.path} failed: {exc}")
+
+
+class TrackStore(_Store[Track]):
+    """Translated tracks persisted on disk, keyed by Spotify track ID."""
+
+    name = "track"
+
+    def _dumps(self, value: Track) -> str:
+        return value.model_dump_json(exclude_none=True)
+
+    def _loads(self, data: str) -> Track:
+        return Track.model_validate_json(data)
+
+
+class ImageStore(_Store[list[Image]]):
+    """Images persisted on disk, keyed by Spotify type and ID."""
+
+    name = "image"
+
+    def _dumps(self, value: list[Image]) -> str:
+        images = ",".join(image.model_dump_json(exclude_none=True) for image in value)
+        return f"[{images}]"
+
+    def _loads(self, data: str) -> list[Image]:
+        images = json.loads(data)
+        if not isinstance(images, list):
+            msg = "Expected a list of images"
+            raise ValueError(msg)  # noqa: TRY004
+        # Each image as JSON again, as only that accepts the "model" field.
+        return [Image.model_validate_json(json.dumps(image)) for image in images]
@@ -1,13 +1,14 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Mapping, Sequence
 from typing import TYPE_CHECKING, Any, Literal, overload
 
 from mopidy.models import Album, Artist, Image, Playlist, Ref, Track
 from mopidy.types import DurationMs, Uri
 
 if TYPE_CHECKING:
-    from collections.abc import Generator, Iterable, Mapping
+    from collections.abc import Generator, Iterable
 
     from mopidy.types import Query, SearchField
 
@@ -65,9 +66,14 @@ def web_to_album_refs(
             yield ref
 
 
+def _is_item_list(data: Any) -> bool:
+    # Paged responses are presented as read-only sequences, not only lists.
+    return isinstance(data, Sequence) and not isinstance(data, str)
+
+
 def valid_web_data(data: Any, object_type: str) -> bool:
     return (
-        isinstance(data, dict)
+        isinstance(data, Mapping)
         and data.get("type") == object_type
         and data.get("uri") is not None
     )
@@ -118,6 +124,7 @@ def to_playlist(
     bitrate: int | None = None,
     as_ref: Literal[True],
     as_items: bool = False,
+    known_tracks: Mapping[Uri, Track] | None = None,
 ) -> Ref | None: ...
 
 
@@ -129,6 +136,7 @@ def to_playlist(
     bitrate: int | None = None,
     as_ref: Literal[False] = False,
     as_items: Literal[True],
+    known_tracks: Mapping[Uri, Track] | None = None,
 ) -> list[Ref] | None: ...
 
 
@@ -140,30 +148,36 @@ def to_playlist(
     bitrate: int | None = None,
     as_ref: Literal[False] = False,
     as_items: Literal[False] = False,
+    known_tracks: Mapping[Uri, Track] | None = None,
 ) -> Playlist | None: ...
 
 
-def to_playlist(
+def to_playlist(  # noqa: PLR0913
     web_playlist: Mapping[str, Any],
     *,
     username: str | None = None,
     bitrate: int | None = None,
     as_ref: bool = False,
     as_items: bool = False,
+    known_tracks: Mapping[Uri, Track] | None = None,
 ) -> Ref | list[Ref] | Playlist | None:
     ref = to_playlist_ref(web_playlist, username)
     if ref is None or as_ref:
         return ref
 
     web_tracks = web_playlist.get("tracks", {}).get("items") or []
-    if as_items and not isinstance(web_tracks, list):
+    if as_items and not _is_item_list(web_tracks):
         return None
 
     if as_items:
         return list(web_to_track_refs(web_tracks))
 
+    # Only translate the items that aren't already known from a previous
+    # translation of this playlist.
+    known_tracks = known_tracks or {}
     tracks = [
-        web_to_track(web_track.get("track", {}), bitrate=bitrate)
+        _known_track(web_track.get("track", {}), bitrate, known_tracks)
+        or web_to_track(web_track.get("track", {}), bitrate=bitrate)
         for web_track in web_tracks
     ]
     tracks = [t for t in tracks if t]
@@ -175,6 +189,22 @@ def to_playlist(
     )
 
 
+def _known_track(
+    web_track: Mapping[str, Any],
+    bitrate: int | None,
+    known_tracks: Mapping[Uri, Track],
+) -> Track | None:
+    if not known_tracks or not valid_web_data(web_track, "track"):
+        return None
+    if not web_track.get("is_playable", False):
+        return None
+    uri = web_track.get("linked_from", {}).get("uri") or web_track["uri"]
+    track = known_tracks.get(uri)
+    if track is None or track.bitrate != bitrate:
+        return None
+    return track
+
+
 def to_playlist_ref(
     web_playlist: Mapping[str, Any],
     username: str | None = None,
@@ -277,7 +307,7 @@ def web_to_album_tracks(
         return []
 
     web_tracks = web_album.get("tracks", {}).get("items", [])
-    if not isinstance(web_tracks, list):
+    if not _is_item_list(web_tracks):
         return []
 
     tracks = [web_to_track(web_track, bitrate, album) for web_track in web_tracks]
@@ -14,3 +14,7 @@ class SpotifyConfig(TypedDict):
     search_album_count: int
     search_artist_count: int
     search_track_count: int
+    playlist_workers: int
+    lookup_timeout: float
+    image_cache_size: int
+    prefetch_images: bool
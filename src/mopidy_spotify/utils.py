@@ -1,10 +1,9 @@
 from __future__ import annotations
 
 import contextlib
-import itertools
 import logging
-import operator
 import time
+from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
 import requests
@@ -52,8 +51,26 @@ def flatten[T](list_of_lists: Iterable[Iterable[T]]) -> list[T]:
 def group_by_type(
     links: Iterable[WebLink | None],
 ) -> Generator[tuple[LinkType, Iterable[WebLink]]]:
-    link_type_getter = operator.attrgetter("type")
-    filtered: list[WebLink] = [u for u in links if u is not None]
-    yield from itertools.groupby(
-        sorted(filtered, key=link_type_getter), link_type_getter
-    )
+    # A single pass into buckets, rather than sorting all the links, while
+    # still keeping the types sorted and the links in their original order.
+    groups: dict[LinkType, list[WebLink]] = {}
+    for link in links:
+        if link is not None:
+            groups.setdefault(link.type, []).append(link)
+    for link_type in sorted(groups):
+        yield link_type, groups[link_type]
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+
+    def record(self, *, hit: bool) -> None:
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    def __str__(self) -> str:
+        return f"hits={self.hits} misses={self.misses}"
@@ -1,26 +1,30 @@
 from __future__ import annotations
 
-import copy
+import functools
 import itertools
 import logging
 import os
 import re
+import sys
 import threading
 import time
 import urllib.parse
-from dataclasses import dataclass
+from collections.abc import Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from email.utils import parsedate_to_datetime
 from enum import StrEnum, auto, unique
 from http import HTTPStatus
+from types import MappingProxyType
 from typing import TYPE_CHECKING, Any, ClassVar
 
 import requests
 
-from mopidy_spotify import utils
+from mopidy_spotify import entities, utils
 
 if TYPE_CHECKING:
-    from collections.abc import Iterator, Mapping
+    from collections.abc import Callable, Iterable, Iterator
 
     from mopidy.config import ProxyConfig
     from mopidy.types import Uri
@@ -466,6 +470,81 @@ class WebResponse(dict):
             self._expires += delta_seconds
 
 
+class PagedItems(Sequence[Any]):
+    """Read-only sequence of items spread over several response pages."""
+
+    def __init__(self, pages: Iterable[Sequence[Any]]) -> None:
+        self._pages = [page for page in pages if page]
+        self._length = sum(len(page) for page in self._pages)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator[Any]:
+        return itertools.chain.from_iterable(self._pages)
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            msg = "PagedItems index out of range"
+            raise IndexError(msg)
+        for page in self._pages:
+            if index < len(page):
+                return page[index]
+            index -= len(page)
+        raise IndexError(index)  # pragma: no cover
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Sequence) or isinstance(other, str):
+            return NotImplemented
+        return len(self) == len(other) and all(
+            a == b for a, b in zip(self, other, strict=True)
+        )
+
+    __hash__ = None  # pyright: ignore[reportAssignmentType]
+
+    def __repr__(self) -> str:
+        return f"PagedItems({len(self._pages)} pages, {self._length} items)"
+
+
+class ResponseView(Mapping[str, Any]):
+    """Read-only view of a response with its tracks continued in more pages.
+
+    The cached response and pages are shared, never copied, so must not be
+    changed through this view.
+    """
+
+    def __init__(
+        self,
+        obj: Mapping[str, Any],
+        more_pages: Iterable[Sequence[Any]],
+    ) -> None:
+        self._obj = obj
+        tracks = obj.get("tracks") or {}
+        self._tracks = MappingProxyType(
+            {
+                **tracks,
+                "items": PagedItems([tracks.get("items") or [], *more_pages]),
+            }
+        )
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "tracks":
+            return self._tracks
+        return self._obj[key]
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._obj
+        if "tracks" not in self._obj:
+            yield "tracks"
+
+    def __len__(self) -> int:
+        return len(self._obj) + ("tracks" not in self._obj)
+
+
 @unique
 class LinkType(StrEnum):
     TRACK = auto()
@@ -475,48 +554,82 @@ class LinkType(StrEnum):
     YOUR = auto()
 
 
-@dataclass
+# Number of parsed URIs to remember, as the same URIs are parsed over and over.
+LINK_CACHE_SIZE = 100_000
+
+
+@dataclass(frozen=True, slots=True)
 class WebLink:
     uri: Uri
     type: LinkType
     id: str | None = None
     owner: str | None = None
+    # Equivalent URIs, e.g. open.spotify.com links or URIs with a ?si= query,
+    # share the same canonical URI and compare equal.
+    canonical_uri: str = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        canonical_uri = sys.intern(self._make_canonical_uri())
+        object.__setattr__(self, "canonical_uri", canonical_uri)
 
     @classmethod
     def from_uri(cls, uri: Uri) -> WebLink:
-        parsed_uri = urllib.parse.urlparse(uri)
+        # Links are immutable, so the same instance can be handed out again.
+        return _parse_link(uri)
+
+    def _make_canonical_uri(self) -> str:
+        match self.type, self.id, self.owner:
+            case LinkType.PLAYLIST, None, str(owner):
+                return f"spotify:user:{owner}:starred"
+            case LinkType.PLAYLIST, str(id), str(owner):
+                return f"spotify:user:{owner}:playlist:{id}"
+            case _, str(id), _:
+                return f"spotify:{self.type}:{id}"
+        return self.uri
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, WebLink):
+            return NotImplemented
+        return self.canonical_uri == other.canonical_uri
 
-        schemes = ("http", "https")
-        netlocs = ("open.spotify.com", "play.spotify.com")
+    def __hash__(self) -> int:
+        return hash(self.canonical_uri)
 
-        if parsed_uri.scheme == "spotify":
-            parts = parsed_uri.path.split(":")
-        elif parsed_uri.scheme in schemes and parsed_uri.netloc in netlocs:
-            parts = parsed_uri.path[1:].split("/")
-        else:
-            parts = []
-
-        # Strip out empty parts to ensure we are strict about URI parsing.
-        parts = [p for p in parts if p.strip()]
-
-        match parts:
-            case [type, id] if type in ("track", "album", "artist", "playlist"):
-                return cls(uri, LinkType(type), id, None)
-            case ["your", _]:
-                return cls(uri, LinkType.YOUR)
-            case ["user", owner, "starred"]:
-                if parsed_uri.scheme == "spotify":
-                    return cls(uri, LinkType.PLAYLIST, None, owner)
-            case ["playlist", owner, id]:
-                return cls(uri, LinkType.PLAYLIST, id, owner)
-            case ["user", owner, "playlist", id]:
-                return cls(uri, LinkType.PLAYLIST, id, owner)
-
-        msg = f"Could not parse {uri!r} as a Spotify URI"
-        raise ValueError(msg)
 
-    def __hash__(self) -> int:
-        return hash(self.uri)
+@functools.lru_cache(maxsize=LINK_CACHE_SIZE)
+def _parse_link(uri: Uri) -> WebLink:
+    parsed_uri = urllib.parse.urlparse(uri)
+
+    schemes = ("http", "https")
+    netlocs = ("open.spotify.com", "play.spotify.com")
+
+    if parsed_uri.scheme == "spotify":
+        parts = parsed_uri.path.split(":")
+    elif parsed_uri.scheme in schemes and parsed_uri.netloc in netlocs:
+        parts = parsed_uri.path[1:].split("/")
+        if parts and parts[0].startswith("intl-"):
+            parts = parts[1:]  # Localised links, e.g. /intl-de/track/...
+    else:
+        parts = []
+
+    # Strip out empty parts to ensure we are strict about URI parsing.
+    parts = [p for p in parts if p.strip()]
+
+    match parts:
+        case [type, id] if type in ("track", "album", "artist", "playlist"):
+            return WebLink(uri, LinkType(type), id, None)
+        case ["your", _]:
+            return WebLink(uri, LinkType.YOUR)
+        case ["user", owner, "starred"]:
+            if parsed_uri.scheme == "spotify":
+                return WebLink(uri, LinkType.PLAYLIST, None, owner)
+        case ["playlist", owner, id]:
+            return WebLink(uri, LinkType.PLAYLIST, id, owner)
+        case ["user", owner, "playlist", id]:
+            return WebLink(uri, LinkType.PLAYLIST, id, owner)
+
+    msg = f"Could not parse {uri!r} as a Spotify URI"
+    raise ValueError(msg)
 
 
 class WebError(Exception):
@@ -530,6 +643,9 @@ API_MAX_IDS_PER_REQUEST: dict[LinkType, int] = {
     LinkType.ALBUM: 20,
 }
 
+# Maximum number of requests sent concurrently when fetching many albums.
+API_MAX_CONCURRENT_REQUESTS = 4
+
 
 class SpotifyOAuthClient(OAuthClient):
     TRACK_FIELDS: ClassVar[str] = (
@@ -539,6 +655,13 @@ class SpotifyOAuthClient(OAuthClient):
     PLAYLIST_FIELDS: ClassVar[str] = (
         f"name,owner(id),type,uri,snapshot_id,tracks({TRACK_FIELDS}),"
     )
+    # Lightweight projections for when only track Refs are needed.
+    TRACK_REF_FIELDS: ClassVar[str] = (
+        "next,items(track(type,uri,name,is_playable,linked_from.uri))"
+    )
+    PLAYLIST_REF_FIELDS: ClassVar[str] = (
+        f"name,owner(id),type,uri,snapshot_id,tracks({TRACK_REF_FIELDS}),"
+    )
     DEFAULT_EXTRA_EXPIRY: ClassVar[int] = 10
 
     def __init__(
@@ -556,6 +679,12 @@ class SpotifyOAuthClient(OAuthClient):
             proxy_config=proxy_config,
         )
         self.user_id: str | None = None
+        # Relinked track IDs mapped to the ID they were relinked from, so that
+        # both resolve to the same cached track.
+        self.track_aliases: dict[str, str] = {}
+        # Tracks, albums and artists seen in any response, to avoid asking
+        # for them again.
+        self.entities = entities.EntityIndex()
         self._cache: dict[str, WebResponse] = {}
         self._extra_expiry = self.DEFAULT_EXTRA_EXPIRY
 
@@ -585,6 +714,15 @@ class SpotifyOAuthClient(OAuthClient):
     def logged_in(self) -> bool:
         return self.user_id is not None
 
+    def add_track_aliases(self, web_tracks: Iterable[Mapping[str, Any] | None]) -> None:
+        for web_track in web_tracks:
+            if not web_track or not (linked_from := web_track.get("linked_from")):
+                continue
+            original_id = _get_id(linked_from)
+            relinked_id = _get_id(web_track)
+            if original_id and relinked_id and original_id != relinked_id:
+                self.track_aliases[relinked_id] = original_id
+
     def get_user_playlists(
         self, *, refresh: bool = False
     ) -> Iterator[Mapping[str, Any]]:
@@ -601,7 +739,7 @@ class SpotifyOAuthClient(OAuthClient):
         self,
         obj: WebResponse,
         params: Mapping[str, Any] | None = None,
-    ) -> WebResponse | dict[str, Any]:
+    ) -> Mapping[str, Any]:
         if params is None:
             params = {}
         tracks_path = obj.get("tracks", {}).get("next")
@@ -613,21 +751,20 @@ class SpotifyOAuthClient(OAuthClient):
             ),
         )
 
-        more_tracks = []
+        more_pages = []
         for page in track_pages:
             if "items" not in page:
                 return {}  # Return nothing on error, or what we have so far?
-            more_tracks += page["items"]
+            more_pages.append(page["items"])
 
-        if more_tracks:
-            # Take a copy to avoid changing the cached response.
-            obj = copy.deepcopy(obj)
-            obj.setdefault("tracks", {}).setdefault("items", [])
-            obj["tracks"]["items"] += more_tracks
+        if more_pages:
+            # Don't copy or merge the cached pages, instead present them as a
+            # read-only view that yields the items page by page.
+            return ResponseView(obj, more_pages)
 
         return obj
 
-    def get_playlist(self, uri: Uri) -> Mapping[str, Any]:
+    def get_playlist(self, uri: Uri, *, as_items: bool = False) -> Mapping[str, Any]:
         try:
             parsed = WebLink.from_uri(uri)
             if parsed.type != LinkType.PLAYLIST:
@@ -637,11 +774,19 @@ class SpotifyOAuthClient(OAuthClient):
             logger.error(exc)  # noqa: TRY400
             return {}
 
+        if as_items:
+            playlist_fields, track_fields = (
+                self.PLAYLIST_REF_FIELDS,
+                self.TRACK_REF_FIELDS,
+            )
+        else:
+            playlist_fields, track_fields = self.PLAYLIST_FIELDS, self.TRACK_FIELDS
+
         playlist = self.get_one(
             f"playlists/{parsed.id}",
-            params={"fields": self.PLAYLIST_FIELDS, "market": "from_token"},
+            params={"fields": playlist_fields, "market": "from_token"},
         )
-        return self._with_all_tracks(playlist, {"fields": self.TRACK_FIELDS})
+        return self._with_all_tracks(playlist, {"fields": track_fields})
 
     def get_batch(
         self,
@@ -654,43 +799,80 @@ class SpotifyOAuthClient(OAuthClient):
             logger.warning(f"Cannot handle batched {link_type}s")
             return
 
-        links = list(dict.fromkeys(links))  # Remove duplicates and maintain order
+        # Each ID is only fetched once, but is returned for every URI given.
+        ids_to_links = self._ids_to_links(links)
         for batch in itertools.batched(
-            links, API_MAX_IDS_PER_REQUEST[link_type], strict=False
+            ids_to_links, API_MAX_IDS_PER_REQUEST[link_type], strict=False
         ):
-            ids = [u.id for u in batch if u.id is not None]
-            ids_to_links = {u.id: u for u in batch}
             data = self.get_one(
-                f"{link_type}s", params={"ids": ",".join(ids), "market": "from_token"}
+                f"{link_type}s",
+                params={"ids": ",".join(batch), "market": "from_token"},
             )
             for item in data.get(f"{link_type}s") or []:
                 if not item:
                     continue
 
+                self.entities.add(item)
+
                 # For track re-linking.
                 if "linked_from" in item:
+                    self.add_track_aliases([item])
                     item_id = item["linked_from"].get("id")
                 else:
                     item_id = item.get("id")
-                if link := ids_to_links.get(item_id):
-                    yield link, WebResponse.from_batch(data, item)
+                if item_links := ids_to_links.get(item_id):
+                    for link in item_links.values():
+                        yield link, WebResponse.from_batch(data, item)
                 else:
                     logger.warning(f"Invalid batch item: {item}")
 
+    def _ids_to_links(self, links: Iterable[WebLink]) -> dict[str, dict[str, WebLink]]:
+        # Ask for relinked tracks by their original ID, so that both IDs share
+        # the cached responses.
+        result: dict[str, dict[str, WebLink]] = {}
+        for link in links:
+            if link.id is not None:
+                item_id = self.track_aliases.get(link.id, link.id)
+                result.setdefault(item_id, {}).setdefault(link.uri, link)
+        return result
+
     def get_albums(self, album_links: list[WebLink]) -> Iterator[Mapping[str, Any]]:
-        result = {}
+        links = []
         for link_type, link_group in utils.group_by_type(album_links):
             if link_type != LinkType.ALBUM:
                 logger.error("Expecting Spotify album URIs")
                 continue
-            result.update(self.get_batch(link_type, list(link_group)))
+            links += link_group
+        if not links:
+            return
+
+        batches = itertools.batched(
+            dict.fromkeys(links), API_MAX_IDS_PER_REQUEST[LinkType.ALBUM], strict=False
+        )
+        with ThreadPoolExecutor(
+            max_workers=API_MAX_CONCURRENT_REQUESTS,
+            thread_name_prefix="SpotifyWeb",
+        ) as executor:
+            batch_results = executor.map(
+                lambda batch: list(self.get_batch(LinkType.ALBUM, list(batch))),
+                batches,
+            )
+            albums = dict(utils.flatten(batch_results))
+            # Most albums fit in the first page, the rest need more requests.
+            full_albums = executor.map(self._with_all_tracks, albums.values())
+            result = dict(zip(albums, full_albums, strict=True))
+        self.entities.add_many(result.values())
 
         for link in album_links:
-            if album := result.get(link):
-                yield self._with_all_tracks(album)
+            if (album := result.get(link)) is not None:
+                yield album
 
     def get_artist_albums(
-        self, web_link: WebLink, *, all_tracks: bool = True
+        self,
+        web_link: WebLink,
+        *,
+        all_tracks: bool = True,
+        album_filter: Callable[[Mapping[str, Any]], bool] | None = None,
     ) -> Iterator[Mapping[str, Any]]:
         if web_link.type != LinkType.ARTIST:
             logger.error("Expecting Spotify artist URI")
@@ -698,11 +880,19 @@ class SpotifyOAuthClient(OAuthClient):
 
         pages = self.get_all(
             f"artists/{web_link.id}/albums",
-            params={"market": "from_token", "include_groups": "single,album"},
+            params={
+                "market": "from_token",
+                "include_groups": "single,album",
+                "limit": 50,
+            },
         )
         album_links = []
         for page in pages:
             for album in page.get("items") or []:
+                self.entities.add(album)
+                # Skip unwanted albums before fetching them in full.
+                if album_filter is not None and not album_filter(album):
+                    continue
                 if all_tracks:
                     try:
                         album_links.append(WebLink.from_uri(album.get("uri")))
@@ -719,17 +909,31 @@ class SpotifyOAuthClient(OAuthClient):
             logger.error("Expecting Spotify artist URI")
             return []
 
-        return (
+        tracks = (
             self.get_one(
                 f"artists/{web_link.id}/top-tracks",
                 params={"market": "from_token"},
             ).get("tracks")
             or []
         )
+        self.entities.add_many(tracks)
+        return tracks
 
     def get_track(self, web_link: WebLink) -> Mapping[str, Any]:
         if web_link.type != LinkType.TRACK:
             logger.error("Expecting Spotify track URI")
             return {}
 
-        return self.get_one(f"tracks/{web_link.id}", params={"market": "from_token"})
+        track_id = web_link.id
+        if track_id is not None:
+            track_id = self.track_aliases.get(track_id, track_id)
+        result = self.get_one(f"tracks/{track_id}", params={"market": "from_token"})
+        self.add_track_aliases([result])
+        return result
+
+
+def _get_id(web_object: Mapping[str, Any]) -> str | None:
+    # Field projections may only include the URI.
+    if item_id := web_object.get("id"):
+        return item_id
+    return (web_object.get("uri") or "").rpartition(":")[2] or None
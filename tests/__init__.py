@@ -15,9 +15,15 @@ class ThreadJoiner:
         exc_val: BaseException | None,
         exc_tb: TracebackType | None,
     ):
-        new_threads = set(threading.enumerate()) - self.before
-        for thread in new_threads:
-            thread.join(timeout=self.timeout)
-            if thread.is_alive():
-                msg = f"Timeout joining thread {thread}"
-                raise RuntimeError(msg)
+        # Again until no new threads are left, as they may start others.
+        joined: set[threading.Thread] = set()
+        while new_threads := set(threading.enumerate()) - self.before - joined:
+            for thread in new_threads:
+                try:
+                    thread.join(timeout=self.timeout)
+                except RuntimeError:
+                    continue  # Still starting, try again.
+                if thread.is_alive():
+                    msg = f"Timeout joining thread {thread}"
+                    raise RuntimeError(msg)
+                joined.add(thread)
@@ -7,7 +7,17 @@ from mopidy import backend as backend_api
 from mopidy.models import Album, Artist
 from mopidy.types import Uri
 
-from mopidy_spotify import backend, utils, web
+from mopidy_spotify import (
+    backend,
+    browse,
+    entities,
+    images,
+    lookup,
+    playlists,
+    search,
+    utils,
+    web,
+)
 from mopidy_spotify.library import SpotifyLibraryProvider
 
 
@@ -35,6 +45,10 @@ def config(tmp_path: Path) -> dict[str, Any]:
             "search_album_count": 20,
             "search_artist_count": 10,
             "search_track_count": 50,
+            "playlist_workers": 0,
+            "lookup_timeout": 0,
+            "image_cache_size": 0,
+            "prefetch_images": False,
             "client_id": "abcd1234",
             "client_secret": "YWJjZDEyMzQ=",
         },
@@ -220,6 +234,7 @@ def mopidy_album_mock(mopidy_artist_mock: Artist) -> Album:
 def web_client_mock() -> mock.MagicMock:
     web_client_mock = mock.MagicMock(spec=web.SpotifyOAuthClient)
     web_client_mock.user_id = "alice"
+    web_client_mock.entities = entities.EntityIndex()
     web_client_mock.get_user_playlists.return_value = []
     return web_client_mock
 
@@ -233,6 +248,14 @@ def backend_mock(
     backend_mock._config = config
     backend_mock._bitrate = 160
     backend_mock._web_client = web_client_mock
+    backend_mock._process_pool = None
+    backend_mock._track_cache = lookup.new_cache()
+    backend_mock._image_cache = images.new_cache()
+    backend_mock._playlist_cache = playlists.new_cache()
+    backend_mock._search_cache = search.new_cache()
+    backend_mock._your_music = browse.YourMusic()
+    backend_mock._image_files = None
+    backend_mock._search_index = None
     return backend_mock
 
 
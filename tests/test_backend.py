@@ -1,10 +1,12 @@
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
 from typing import Any
 from unittest import mock, skip
 
 import pytest
 from mopidy import backend as backend_api
 
-from mopidy_spotify import backend, playlists
+from mopidy_spotify import backend, lookup, playlists
 from mopidy_spotify.backend import SpotifyPlaybackProvider
 from mopidy_spotify.library import SpotifyLibraryProvider
 from tests import ThreadJoiner
@@ -35,6 +37,13 @@ def test_init_sets_up_the_providers(config: dict[str, Any]):
     assert isinstance(backend.playlists, backend_api.PlaylistsProvider)
 
 
+def test_init_creates_track_cache(config: dict[str, Any]):
+    backend = get_backend(config)
+
+    assert len(backend._track_cache) == 0
+    assert backend._track_cache.max_entries == lookup.CACHE_MAX_ENTRIES
+
+
 def test_init_disables_playlists_provider_if_not_allowed(config: dict[str, Any]):
     config["spotify"]["allow_playlists"] = False
 
@@ -99,6 +108,16 @@ def test_on_start_logs_in(web_mock: mock.MagicMock, config: dict[str, Any]):
     web_mock.SpotifyOAuthClient.return_value.login.assert_called_once()
 
 
+def test_on_start_shares_track_aliases(
+    web_mock: mock.MagicMock, config: dict[str, Any]
+):
+    backend = get_backend(config)
+    backend.on_start()
+
+    web_client = web_mock.SpotifyOAuthClient.return_value
+    assert backend._track_cache.aliases is web_client.track_aliases
+
+
 def test_on_start_refreshes_playlists(
     web_mock: mock.MagicMock,
     config: dict[str, Any],
@@ -127,3 +146,88 @@ def test_on_start_doesnt_refresh_playlists_if_not_allowed(
     client_mock = web_mock.SpotifyOAuthClient.return_value
     client_mock.get_user_playlists.assert_not_called()
     assert "Refreshed 0 playlists" not in caplog.text
+
+
+def test_on_start_doesnt_create_process_pool_by_default(
+    web_mock: mock.MagicMock, config: dict[str, Any]
+):
+    backend = get_backend(config)
+    with ThreadJoiner():
+        backend.on_start()
+
+    assert backend._process_pool is None
+
+
+def test_on_start_creates_process_pool(
+    web_mock: mock.MagicMock, config: dict[str, Any]
+):
+    config["spotify"]["playlist_workers"] = 2
+
+    backend = get_backend(config)
+    with ThreadJoiner():
+        backend.on_start()
+
+    assert isinstance(backend._process_pool, ProcessPoolExecutor)
+    assert backend._process_pool._max_workers == 2
+
+    backend.on_stop()
+
+    assert backend._process_pool is None
+
+
+def test_on_start_creates_track_store(web_mock: mock.MagicMock, config: dict[str, Any]):
+    backend = get_backend(config)
+    with ThreadJoiner():
+        backend.on_start()
+
+    assert backend._track_cache.store is not None
+    assert backend._track_cache.store.path.name == "tracks.sqlite3"
+
+
+def test_on_start_creates_image_store(web_mock: mock.MagicMock, config: dict[str, Any]):
+    backend = get_backend(config)
+    with ThreadJoiner():
+        backend.on_start()
+
+    assert backend._image_cache.store is not None
+    assert backend._image_cache.store.path.name == "images.sqlite3"
+
+
+def test_on_start_creates_search_index(
+    web_mock: mock.MagicMock, config: dict[str, Any]
+):
+    backend = get_backend(config)
+    with ThreadJoiner():
+        backend.on_start()
+
+    assert backend._search_index is not None
+    assert backend._search_index.path.name == "library.sqlite3"
+
+
+def test_on_start_creates_image_files(
+    web_mock: mock.MagicMock, config: dict[str, Any], tmp_path: Path
+):
+    config["core"]["cache_dir"] = tmp_path
+    config["spotify"]["image_cache_size"] = 10
+
+    backend = get_backend(config)
+    with ThreadJoiner():
+        backend.on_start()
+    backend.on_stop()
+
+    assert backend._image_files is None
+    assert (tmp_path / "spotify" / "images").is_dir()
+
+
+def test_on_start_no_track_store_if_cache_not_allowed(
+    web_mock: mock.MagicMock, config: dict[str, Any]
+):
+    config["spotify"]["allow_cache"] = False
+
+    backend = get_backend(config)
+    with ThreadJoiner():
+        backend.on_start()
+
+    assert backend._track_cache.store is None
+    assert backend._image_cache.store is None
+    assert backend._search_index is None
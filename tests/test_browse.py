@@ -82,7 +82,7 @@ def test_browse_playlist(
     results = provider.browse(Uri("spotify:user:alice:playlist:foo"))
 
     web_client_mock.get_playlist.assert_called_once_with(
-        "spotify:user:alice:playlist:foo"
+        "spotify:user:alice:playlist:foo", as_items=True
     )
     assert len(results) == 1
     assert results[0] == Ref.track(uri=Uri("spotify:track:abc"), name="ABC 123")
@@ -330,6 +330,92 @@ def test_browse_your_music_albums(
     assert results[0] == Ref.album(uri=Uri("spotify:album:def"), name="ABBA - DEF 456")
 
 
+def saved_tracks_page(
+    web_track_mock: dict[str, Any], names: list[str], total: int
+) -> dict[str, Any]:
+    items = [
+        {
+            "added_at": f"2024-01-01T00:00:{name}Z",
+            "track": {**web_track_mock, "uri": f"spotify:track:{name}", "name": name},
+        }
+        for name in names
+    ]
+    return {"items": items, "total": total}
+
+
+def test_browse_your_music_tracks_syncs_incrementally(
+    web_client_mock: mock.MagicMock,
+    web_track_mock: dict[str, Any],
+    provider: SpotifyLibraryProvider,
+):
+    web_client_mock.get_all.return_value = [
+        saved_tracks_page(web_track_mock, ["03", "02"], total=3),
+        saved_tracks_page(web_track_mock, ["01"], total=3),
+    ]
+    provider.browse(Uri("spotify:your:tracks"))
+
+    unused_page = mock.MagicMock()
+    web_client_mock.get_all.return_value = iter(
+        [saved_tracks_page(web_track_mock, ["04", "03"], total=4), unused_page]
+    )
+    results = provider.browse(Uri("spotify:your:tracks"))
+
+    assert [ref.name for ref in results] == ["04", "03", "02", "01"]
+    assert not unused_page.mock_calls
+
+
+def test_browse_your_music_tracks_mirror_is_kept_by_backend(
+    web_client_mock: mock.MagicMock,
+    web_track_mock: dict[str, Any],
+    backend_mock: mock.Mock,
+    provider: SpotifyLibraryProvider,
+):
+    web_client_mock.get_all.return_value = [
+        saved_tracks_page(web_track_mock, ["02", "01"], total=2),
+    ]
+    provider.browse(Uri("spotify:your:tracks"))
+
+    items = backend_mock._your_music.items[("alice", "tracks")]
+    assert [item["track"]["name"] for item in items] == ["02", "01"]
+
+
+def test_browse_your_music_tracks_resyncs_after_removal(
+    web_client_mock: mock.MagicMock,
+    web_track_mock: dict[str, Any],
+    provider: SpotifyLibraryProvider,
+):
+    web_client_mock.get_all.return_value = [
+        saved_tracks_page(web_track_mock, ["03", "02", "01"], total=3),
+    ]
+    provider.browse(Uri("spotify:your:tracks"))
+
+    web_client_mock.get_all.return_value = [
+        saved_tracks_page(web_track_mock, ["03", "01"], total=2),
+    ]
+    results = provider.browse(Uri("spotify:your:tracks"))
+
+    assert [ref.name for ref in results] == ["03", "01"]
+    assert web_client_mock.get_all.call_count == 3
+
+
+def test_browse_your_music_tracks_keeps_mirror_on_error(
+    web_client_mock: mock.MagicMock,
+    web_track_mock: dict[str, Any],
+    provider: SpotifyLibraryProvider,
+    caplog: pytest.LogCaptureFixture,
+):
+    web_client_mock.get_all.return_value = [
+        saved_tracks_page(web_track_mock, ["02", "01"], total=2),
+    ]
+    provider.browse(Uri("spotify:your:tracks"))
+
+    web_client_mock.get_all.return_value = [{}]
+    results = provider.browse(Uri("spotify:your:tracks"))
+
+    assert [ref.name for ref in results] == ["02", "01"]
+    assert "Failed to sync Spotify saved tracks" in caplog.text
+
+
 def test_browse_playlists_featured(
     web_client_mock: mock.MagicMock,
     web_playlist_mock: dict[str, Any],
@@ -0,0 +1,141 @@
+import threading
+from unittest import mock
+
+import pytest
+
+from mopidy_spotify import cache
+
+
+@pytest.fixture
+def mock_time():
+    patcher = mock.patch.object(cache.time, "monotonic", return_value=1000)
+    yield patcher.start()
+    patcher.stop()
+
+
+def test_get_and_set():
+    lru = cache.LRUCache(max_entries=10)
+
+    lru.set("foo", 1)
+
+    assert lru.get("foo") == 1
+    assert lru.get("bar") is None
+    assert "foo" in lru
+    assert "bar" not in lru
+    assert len(lru) == 1
+
+
+def test_records_stats():
+    lru = cache.LRUCache(max_entries=10)
+    lru.set("foo", 1)
+
+    lru.get("foo")
+    lru.get("foo")
+    lru.get("bar")
+
+    assert lru.stats.hits == 2
+    assert lru.stats.misses == 1
+
+
+def test_evicts_least_recently_used():
+    lru = cache.LRUCache(max_entries=2)
+    lru.set("foo", 1)
+    lru.set("bar", 2)
+
+    lru.get("foo")
+    lru.set("baz", 3)
+
+    assert "foo" in lru
+    assert "bar" not in lru
+    assert "baz" in lru
+    assert len(lru) == 2
+
+
+def test_evicts_by_size():
+    lru = cache.LRUCache(max_entries=10, max_size=5, size_of=len)
+    lru.set("foo", [1, 2])
+    lru.set("bar", [1, 2])
+
+    lru.set("baz", [1, 2, 3])
+
+    assert "foo" not in lru
+    assert "bar" in lru
+    assert "baz" in lru
+    assert lru.size == 5
+
+
+def test_doesnt_store_oversized_value():
+    lru = cache.LRUCache(max_entries=10, max_size=5, size_of=len)
+    lru.set("foo", [1, 2])
+
+    lru.set("bar", [1, 2, 3, 4, 5, 6])
+
+    assert "foo" in lru
+    assert "bar" not in lru
+    assert lru.size == 2
+
+
+def test_replacing_entry_updates_size():
+    lru = cache.LRUCache(max_entries=10, size_of=len)
+    lru.set("foo", [1, 2])
+
+    lru.set("foo", [1])
+
+    assert lru.size == 1
+    assert len(lru) == 1
+
+
+def test_no_entries():
+    lru = cache.LRUCache(max_entries=0)
+
+    lru.set("foo", 1)
+
+    assert lru.get("foo") is None
+    assert len(lru) == 0
+
+
+def test_ttl(mock_time: mock.Mock):
+    lru = cache.LRUCache(max_entries=10, ttl=10)
+    lru.set("foo", 1)
+    lru.set("bar", 2, ttl=100)
+
+    mock_time.return_value = 1011
+
+    assert lru.get("foo") is None
+    assert lru.get("bar") == 2
+    assert "foo" not in lru
+    assert len(lru) == 1
+
+
+def test_pop_and_clear():
+    lru = cache.LRUCache(max_entries=10, size_of=len)
+    lru.set("foo", [1])
+    lru.set("bar", [1, 2])
+
+    assert lru.pop("foo") == [1]
+    assert lru.pop("foo") is None
+    assert lru.size == 2
+
+    lru.clear()
+
+    assert len(lru) == 0
+    assert lru.size == 0
+
+
+def test_thread_safe():
+    lru = cache.LRUCache(max_entries=100, max_size=150, size_of=len)
+
+    def worker(n: int) -> None:
+        for i in range(1000):
+            lru.set((n, i % 200), [i] * (i % 3))
+            lru.get((n, (i * 7) % 200))
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(lru) <= 100
+    assert lru.size <= 150
+    assert lru.stats.hits + lru.stats.misses == 4000
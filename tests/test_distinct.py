@@ -3,6 +3,7 @@ from unittest import mock
 
 import pytest
 from mopidy.models import Album, Artist, SearchResult
+from mopidy.types import Uri
 
 from mopidy_spotify import distinct, playlists, search
 from mopidy_spotify.library import SpotifyLibraryProvider
@@ -143,4 +144,21 @@ def test_get_distinct_with_query(
         mock.ANY,
         query=query,
         types=types,
+        cache=provider._backend._search_cache,
     )
+
+
+def test_get_distinct_without_query_uses_loaded_playlists(
+    web_client_mock_with_playlists: mock.MagicMock,
+    provider: SpotifyLibraryProvider,
+):
+    playlists_provider = playlists.SpotifyPlaylistsProvider(backend=provider._backend)
+    provider._backend.playlists = playlists_provider
+    assert playlists_provider._refresh_mutex.acquire(blocking=False)
+    playlists_provider._refresh_tracks([Uri("spotify:user:alice:playlist:foo")])
+    web_client_mock_with_playlists.reset_mock()
+
+    assert provider.get_distinct("artist") == {"ABBA"}
+    assert provider.get_distinct("album") == {"DEF 456"}
+    web_client_mock_with_playlists.get_user_playlists.assert_not_called()
+    web_client_mock_with_playlists.get_playlist.assert_not_called()
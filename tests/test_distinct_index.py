@@ -0,0 +1,144 @@
+from unittest import mock
+
+import pytest
+from mopidy.models import Album, Artist, Playlist, Track
+from mopidy.types import Uri
+
+from mopidy_spotify import distinct_index
+
+
+def make_playlist(uri: str, *artists: str) -> Playlist:
+    return Playlist(
+        uri=Uri(uri),
+        tracks=[
+            Track(
+                uri=Uri(f"spotify:track:{name.lower()}"),
+                artists=[Artist(name=name)],
+                album=Album(
+                    name=f"{name} Gold", artists=[Artist(name=name)], date="1992"
+                ),
+            )
+            for name in artists
+        ],
+    )
+
+
+@pytest.fixture
+def index() -> distinct_index.DistinctIndex:
+    index = distinct_index.DistinctIndex()
+    index.set_playlists(
+        {
+            Uri("spotify:playlist:a"): make_playlist("spotify:playlist:a", "ABBA"),
+            Uri("spotify:playlist:b"): make_playlist(
+                "spotify:playlist:b", "ABBA", "Queen"
+            ),
+        }
+    )
+    return index
+
+
+def test_get_before_playlists_are_set():
+    assert distinct_index.DistinctIndex().get("artist") is None
+
+
+@pytest.mark.parametrize(
+    ("field", "expected"),
+    [
+        ("artist", {"ABBA", "Queen"}),
+        ("albumartist", {"ABBA", "Queen"}),
+        ("album", {"ABBA Gold", "Queen Gold"}),
+        ("date", {"1992"}),
+        ("genre", set()),
+    ],
+)
+def test_get(index: distinct_index.DistinctIndex, field: str, expected: set[str]):
+    assert index.get(field) == expected
+
+
+def test_set_playlists_removes_values_of_removed_playlists(
+    index: distinct_index.DistinctIndex,
+):
+    index.set_playlists(
+        {Uri("spotify:playlist:a"): make_playlist("spotify:playlist:a", "ABBA")}
+    )
+
+    assert index.get("artist") == {"ABBA"}
+
+
+def test_set_playlists_only_recounts_changed_playlists(
+    index: distinct_index.DistinctIndex,
+):
+    playlist = make_playlist("spotify:playlist:a", "Queen")
+    index.set_playlists({Uri("spotify:playlist:a"): playlist})
+
+    with mock.patch.object(
+        distinct_index, "get_values", wraps=distinct_index.get_values
+    ) as get_values_mock:
+        index.set_playlists(
+            {
+                Uri("spotify:playlist:a"): playlist,
+                Uri("spotify:playlist:c"): make_playlist("spotify:playlist:c", "Blur"),
+            }
+        )
+
+    assert get_values_mock.call_count == len(distinct_index.FIELDS)
+    assert index.get("artist") == {"Queen", "Blur"}
+
+
+def test_update_replaces_values_of_playlist(index: distinct_index.DistinctIndex):
+    index.update(
+        Uri("spotify:playlist:b"), make_playlist("spotify:playlist:b", "Queen")
+    )
+
+    assert index.get("artist") == {"ABBA", "Queen"}
+
+    index.update(Uri("spotify:playlist:a"), make_playlist("spotify:playlist:a"))
+
+    assert index.get("artist") == {"Queen"}
+
+
+def test_update_ignores_other_playlists(index: distinct_index.DistinctIndex):
+    index.update(Uri("spotify:playlist:c"), make_playlist("spotify:playlist:c", "Blur"))
+
+    assert index.get("artist") == {"ABBA", "Queen"}
+
+
+def test_update_before_playlists_are_set():
+    index = distinct_index.DistinctIndex()
+    index.update(Uri("spotify:playlist:c"), make_playlist("spotify:playlist:c", "Blur"))
+
+    assert index.get("artist") is None
+
+
+def test_get_returns_same_set_until_changed(index: distinct_index.DistinctIndex):
+    values = index.get("artist")
+
+    assert index.get("artist") is values
+
+    index.update(Uri("spotify:playlist:a"), make_playlist("spotify:playlist:a"))
+    index.update(
+        Uri("spotify:playlist:b"), make_playlist("spotify:playlist:b", "Queen", "ABBA")
+    )
+
+    assert index.get("artist") is values
+
+    index.update(
+        Uri("spotify:playlist:b"), make_playlist("spotify:playlist:b", "Queen", "Blur")
+    )
+
+    assert values == {"ABBA", "Queen"}
+    assert index.get("artist") == {"Queen", "Blur"}
+    assert index.get("artist") is not values
+
+
+def test_update_only_copies_changed_fields(index: distinct_index.DistinctIndex):
+    artists = index.get("artist")
+    dates = index.get("date")
+
+    index.update(
+        Uri("spotify:playlist:a"), make_playlist("spotify:playlist:a", "ABBA", "Blur")
+    )
+
+    assert index.get("artist") == {"ABBA", "Queen", "Blur"}
+    assert index.get("artist") is not artists
+    assert index.get("date") is dates
@@ -0,0 +1,107 @@
+from typing import Any
+
+from mopidy.types import Uri
+
+from mopidy_spotify import entities
+from mopidy_spotify.web import ResponseView, WebLink
+
+
+def link(uri: str) -> WebLink:
+    return WebLink.from_uri(Uri(uri))
+
+
+def test_add_and_get(web_artist_mock: dict[str, Any]):
+    index = entities.EntityIndex()
+
+    index.add(web_artist_mock)
+
+    assert index.get(link("spotify:artist:abba")) == web_artist_mock
+    assert index.get(link("spotify:track:abba")) is None
+    assert len(index) == 1
+
+
+def test_ignores_other_objects():
+    index = entities.EntityIndex()
+
+    index.add_many(
+        [
+            None,
+            {"type": "playlist", "uri": "spotify:playlist:abc"},
+            {"type": "track"},
+        ]
+    )
+
+    assert len(index) == 0
+
+
+def test_track_adds_its_album(
+    web_track_mock: dict[str, Any], web_album_mock_base: dict[str, Any]
+):
+    index = entities.EntityIndex()
+
+    index.add(web_track_mock)
+
+    assert index.get(link("spotify:track:abc")) == web_track_mock
+    assert index.get(link("spotify:album:def")) == web_album_mock_base
+
+
+def test_keeps_most_complete_object(
+    web_album_mock: dict[str, Any], web_track_mock: dict[str, Any]
+):
+    index = entities.EntityIndex()
+
+    index.add(web_album_mock)
+    index.add(web_track_mock)  # Includes a simplified album.
+
+    assert index.get(link("spotify:album:def")) == web_album_mock
+
+
+def test_relinked_track_is_known_by_original_id(web_track_mock: dict[str, Any]):
+    index = entities.EntityIndex()
+    relinked_track = {
+        **web_track_mock,
+        "uri": "spotify:track:xyz",
+        "linked_from": {"uri": "spotify:track:abc"},
+    }
+
+    index.add(relinked_track)
+
+    assert index.get(link("spotify:track:abc")) == relinked_track
+    assert index.get(link("spotify:track:xyz")) is None
+
+
+def test_is_bounded(web_artist_mock: dict[str, Any]):
+    index = entities.EntityIndex(max_entries=2)
+
+    for i in range(3):
+        index.add({**web_artist_mock, "uri": f"spotify:artist:{i}"})
+
+    assert len(index) == 2
+    assert index.get(link("spotify:artist:0")) is None
+
+
+def test_album_adds_its_tracks(web_album_mock: dict[str, Any]):
+    index = entities.EntityIndex()
+
+    index.add(web_album_mock)
+
+    web_track = index.get(link("spotify:track:abc"))
+    assert web_track is not None
+    assert web_track["name"] == "ABC 123"
+    assert web_track["album"]["uri"] == "spotify:album:def"
+    assert "tracks" not in web_track["album"]
+    assert index.get(link("spotify:album:def")) == web_album_mock
+
+
+def test_multi_page_album_adds_its_tracks(
+    web_album_mock: dict[str, Any], web_track_mock_base: dict[str, Any]
+):
+    index = entities.EntityIndex()
+    more_tracks = [{**web_track_mock_base, "uri": "spotify:track:xyz", "id": "xyz"}]
+
+    index.add(ResponseView(web_album_mock, [more_tracks]))
+
+    for track_id in ("abc", "xyz"):
+        web_track = index.get(link(f"spotify:track:{track_id}"))
+        assert web_track is not None
+        assert web_track["album"]["uri"] == "spotify:album:def"
@@ -1,7 +1,7 @@
 from pathlib import Path
 from unittest import mock
 
-from mopidy_spotify import Extension
+from mopidy_spotify import Extension, image_files
 from mopidy_spotify import backend as backend_lib
 
 
@@ -32,6 +32,10 @@ def test_get_config_schema() -> None:
     assert "search_album_count" in schema
     assert "search_artist_count" in schema
     assert "search_track_count" in schema
+    assert "playlist_workers" in schema
+    assert "lookup_timeout" in schema
+    assert "image_cache_size" in schema
+    assert "prefetch_images" in schema
 
 
 def test_setup() -> None:
@@ -41,6 +45,9 @@ def test_setup() -> None:
     ext.setup(registry)
 
     registry.add.assert_called_with("backend", backend_lib.SpotifyBackend)
+    registry.add.assert_any_call(
+        "http:app", {"name": "spotify", "factory": image_files.http_factory}
+    )
 
 
 def test_get_credentials_dir(tmp_path: Path) -> None:
@@ -0,0 +1,160 @@
+import os
+from collections.abc import Callable, Generator
+from concurrent.futures import Executor, Future
+from pathlib import Path
+from typing import Any
+from unittest import mock
+
+import pytest
+import requests
+from mopidy.models import Image
+
+from mopidy_spotify import image_files
+
+
+class InlineExecutor(Executor):
+    def __init__(self, **_kwargs: Any) -> None:
+        pass
+
+    def submit(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Future:
+        future = Future()
+        future.set_result(fn(*args, **kwargs))
+        return future
+
+
+@pytest.fixture(autouse=True)
+def inline_executor() -> Generator[None]:
+    with mock.patch.object(image_files, "ThreadPoolExecutor", InlineExecutor):
+        yield
+
+
+@pytest.fixture
+def session_mock() -> mock.Mock:
+    session_mock = mock.Mock(spec=requests.Session)
+    session_mock.get.return_value.headers = {"content-type": "image/jpeg"}
+    session_mock.get.return_value.content = b"x" * 100
+    return session_mock
+
+
+@pytest.fixture
+def files(tmp_path: Path, session_mock: mock.Mock) -> image_files.ImageFiles:
+    return image_files.ImageFiles(
+        tmp_path / "images",
+        max_size=250,
+        session=session_mock,
+        base_url="http://mopidy:6680/spotify/images/",
+    )
+
+
+def localize(files: image_files.ImageFiles, uri: str) -> Image:
+    (image,) = files.localize([Image(uri=uri, width=64, height=64)])
+    return image
+
+
+def test_downloads_in_background(
+    files: image_files.ImageFiles, session_mock: mock.Mock
+):
+    image1 = localize(files, "https://i.scdn.co/image/a")
+    image2 = localize(files, "https://i.scdn.co/image/a")
+
+    session_mock.get.assert_called_once_with(
+        "https://i.scdn.co/image/a", timeout=image_files.DOWNLOAD_TIMEOUT
+    )
+    assert image1.uri == "https://i.scdn.co/image/a"
+    assert image2.uri.startswith("http://mopidy:6680/spotify/images/")
+    assert image2.uri.endswith(".jpg")
+    assert image2.width == 64
+    name = image2.uri.removeprefix("http://mopidy:6680/spotify/images/")
+    assert (files.path / name).read_bytes() == b"x" * 100
+
+
+def test_only_downloads_remote_images(
+    files: image_files.ImageFiles, session_mock: mock.Mock
+):
+    image = localize(files, "/local/foo.jpg")
+
+    assert image.uri == "/local/foo.jpg"
+    session_mock.get.assert_not_called()
+
+
+def test_failed_download_is_retried(
+    files: image_files.ImageFiles, session_mock: mock.Mock
+):
+    session_mock.get.side_effect = requests.ConnectionError("offline")
+    localize(files, "https://i.scdn.co/image/a")
+
+    session_mock.get.side_effect = None
+    localize(files, "https://i.scdn.co/image/a")
+
+    assert session_mock.get.call_count == 2
+    assert len(files) == 1
+
+
+def test_ignores_non_images(files: image_files.ImageFiles, session_mock: mock.Mock):
+    session_mock.get.return_value.headers = {"content-type": "text/html"}
+
+    localize(files, "https://i.scdn.co/image/a")
+
+    assert len(files) == 0
+    assert list(files.path.iterdir()) == []
+
+
+def test_least_recently_used_files_evicted(files: image_files.ImageFiles):
+    for uri in ["https://a", "https://b", "https://c"]:
+        localize(files, uri)
+        localize(files, "https://a")  # Now used more recently than b.
+    localize(files, "https://d")
+
+    assert len(files) == 2
+    assert files.size == 200
+    assert localize(files, "https://a").uri.startswith("http://mopidy:6680/")
+    assert localize(files, "https://b").uri == "https://b"
+    assert len(list(files.path.iterdir())) == 2
+
+
+def test_existing_files_are_used(tmp_path: Path, session_mock: mock.Mock):
+    path = tmp_path / "images"
+    path.mkdir()
+    (path / ".partial.jpg").write_bytes(b"x")
+    for i, name in enumerate(["old.jpg", "new.jpg"]):
+        (path / name).write_bytes(b"x" * 100)
+        os.utime(path / name, (i, i))
+
+    files = image_files.ImageFiles(path, max_size=150, session=session_mock)
+
+    assert sorted(p.name for p in path.iterdir()) == ["new.jpg"]
+    assert files.size == 100
+
+
+@pytest.mark.parametrize(
+    ("hostname", "expected"),
+    [
+        ("127.0.0.1", "http://127.0.0.1:6681/spotify/images/"),
+        ("::1", "http://[::1]:6681/spotify/images/"),
+        ("0.0.0.0", "http://mopidy:6681/spotify/images/"),  # noqa: S104
+        ("::", "http://mopidy:6681/spotify/images/"),
+    ],
+)
+def test_get_base_url(config: dict, hostname: str, expected: str):
+    config["http"] = {"hostname": hostname, "port": 6681}
+
+    with mock.patch.object(image_files.socket, "gethostname", return_value="mopidy"):
+        assert image_files.get_base_url(config) == expected
+
+
+def test_get_base_url_without_http_config(config: dict):
+    assert image_files.get_base_url(config) == "http://127.0.0.1:6680/spotify/images/"
+
+
+def test_http_factory(config: dict, tmp_path: Path):
+    config["core"] = {"cache_dir": tmp_path}
+    config["spotify"]["image_cache_size"] = 10
+
+    ((pattern, _, kwargs),) = image_files.http_factory(config, mock.Mock())
+
+    assert pattern == r"/images/(.*)"
+    assert kwargs["path"] == str(tmp_path / "spotify" / "images")
+
+
+def test_http_factory_disabled(config: dict):
+    assert image_files.http_factory(config, mock.Mock()) == []
@@ -1,19 +1,25 @@
+import threading
+from pathlib import Path
+from typing import Any
 from unittest import mock
 
 import pytest
 from mopidy.models import Image
 from mopidy.types import Uri
 
-from mopidy_spotify import images
+from mopidy_spotify import images, store
 from mopidy_spotify.library import SpotifyLibraryProvider
-from mopidy_spotify.web import LinkType, WebLink
+from mopidy_spotify.web import LinkType, WebLink, WebResponse
+
+
+def make_response(data: dict[str, Any], status_code: int = 200) -> WebResponse:
+    return WebResponse("https://api.spotify.com/v1/x", data, status_code=status_code)
 
 
 @pytest.fixture
 def img_provider(
     provider: SpotifyLibraryProvider,
 ) -> SpotifyLibraryProvider:
-    images._cache = {}
     return provider
 
 
@@ -147,6 +153,75 @@ def test_get_track_images(
     assert image.width == 640
 
 
+def test_get_known_track_images(
+    web_client_mock: mock.MagicMock, img_provider: SpotifyLibraryProvider
+):
+    web_client_mock.entities.add(
+        {
+            "type": "track",
+            "uri": "spotify:track:41shEpOKyyadtG6lDclooa",
+            "album": {
+                "type": "album",
+                "uri": "spotify:album:1utFPuvgBHXzLJdqhCDOkg",
+                "images": [{"height": 640, "url": "img://1/a", "width": 640}],
+            },
+        }
+    )
+    uri = Uri("spotify:track:41shEpOKyyadtG6lDclooa")
+
+    result = img_provider.get_images([uri])
+
+    web_client_mock.get_batch.assert_not_called()
+    assert [image.uri for image in result[uri]] == ["img://1/a"]
+
+
+def test_get_known_artist_without_images(
+    web_client_mock: mock.MagicMock,
+    web_artist_mock: dict[str, Any],
+    img_provider: SpotifyLibraryProvider,
+):
+    web_client_mock.entities.add(web_artist_mock)
+    web_client_mock.get_batch.return_value = []
+
+    img_provider.get_images([Uri("spotify:artist:abba")])
+
+    web_client_mock.get_batch.assert_called_once_with(
+        LinkType.ARTIST, [WebLink.from_uri(Uri("spotify:artist:abba"))]
+    )
+
+
+def test_get_track_images_from_known_album(
+    web_client_mock: mock.MagicMock,
+    web_album_mock: dict[str, Any],
+    img_provider: SpotifyLibraryProvider,
+):
+    web_client_mock.entities.add(
+        {**web_album_mock, "images": [{"url": "img://1/a"}]},
+    )
+
+    result = img_provider.get_images([Uri("spotify:track:abc")])
+
+    web_client_mock.get_batch.assert_not_called()
+    assert [image.uri for image in result[Uri("spotify:track:abc")]] == ["img://1/a"]
+
+
+def test_get_track_images_from_album_seen_separately(
+    web_client_mock: mock.MagicMock,
+    web_track_mock: dict[str, Any],
+    web_album_mock_base: dict[str, Any],
+    img_provider: SpotifyLibraryProvider,
+):
+    web_client_mock.entities.add(web_track_mock)  # Without album images.
+    web_client_mock.entities.add(
+        {**web_album_mock_base, "images": [{"url": "img://1/a"}]}
+    )
+
+    result = img_provider.get_images([Uri("spotify:track:abc")])
+
+    web_client_mock.get_batch.assert_not_called()
+    assert [image.uri for image in result[Uri("spotify:track:abc")]] == ["img://1/a"]
+
+
 def test_get_track_images_bad_album_uri(
     web_client_mock: mock.MagicMock, img_provider: SpotifyLibraryProvider
 ):
@@ -248,14 +323,18 @@ def test_get_playlist_image(
 ):
     uris = [Uri("spotify:playlist:41shEpOKyyadtG6lDclooa"), Uri("foo:bar")]
 
-    web_client_mock.get.return_value = {
-        "id": "41shEpOKyyadtG6lDclooa",
-        "images": [{"height": 640, "url": "img://1/a", "width": 640}],
-    }
+    web_client_mock.get_one.return_value = make_response(
+        {
+            "id": "41shEpOKyyadtG6lDclooa",
+            "images": [{"height": 640, "url": "img://1/a", "width": 640}],
+        }
+    )
 
     result = img_provider.get_images(uris)
 
-    web_client_mock.get.assert_called_once_with("playlists/41shEpOKyyadtG6lDclooa")
+    web_client_mock.get_one.assert_called_once_with(
+        "playlists/41shEpOKyyadtG6lDclooa", params={"fields": "images"}
+    )
 
     assert len(result) == 1
     assert sorted(result.keys()) == ["spotify:playlist:41shEpOKyyadtG6lDclooa"]
@@ -273,15 +352,17 @@ def test_get_playlist_image_cached(
 ):
     uris = [Uri("spotify:playlist:41shEpOKyyadtG6lDclooa")]
 
-    web_client_mock.get.return_value = {
-        "id": "41shEpOKyyadtG6lDclooa",
-        "images": [{"height": 640, "url": "img://1/a", "width": 640}],
-    }
+    web_client_mock.get_one.return_value = make_response(
+        {
+            "id": "41shEpOKyyadtG6lDclooa",
+            "images": [{"height": 640, "url": "img://1/a", "width": 640}],
+        }
+    )
 
     result1 = img_provider.get_images(uris)
     result2 = img_provider.get_images(uris)
 
-    assert web_client_mock.get.call_count == 1
+    assert web_client_mock.get_one.call_count == 1
     assert result1 == result2
 
 
@@ -398,8 +479,107 @@ def test_service_returns_none_result(
 def test_service_returns_none_result_playlist(
     web_client_mock: mock.MagicMock, img_provider: SpotifyLibraryProvider
 ):
-    web_client_mock.get.return_value = {"images": None}
+    web_client_mock.get_one.return_value = make_response({"images": None})
 
     result = img_provider.get_images([Uri("spotify:playlist:41shEpOKyyadtG6lDclooa")])
 
     assert result == {"spotify:playlist:41shEpOKyyadtG6lDclooa": []}
+
+
+@pytest.mark.parametrize(
+    "response",
+    [
+        make_response({}, status_code=400),
+        make_response({"id": "41shEpOKyyadtG6lDclooa"}),
+    ],
+)
+def test_failed_playlist_images_are_not_kept(
+    tmp_path: Path,
+    web_client_mock: mock.MagicMock,
+    backend_mock: mock.Mock,
+    img_provider: SpotifyLibraryProvider,
+    response: WebResponse,
+):
+    image_store = store.ImageStore(tmp_path / "images.sqlite3", max_age=100)
+    backend_mock._image_cache.store = image_store
+    uri = Uri("spotify:playlist:41shEpOKyyadtG6lDclooa")
+    web_client_mock.get_one.return_value = response
+
+    result1 = img_provider.get_images([uri])
+    result2 = img_provider.get_images([uri])
+
+    assert result1 == result2 == {uri: []}
+    assert web_client_mock.get_one.call_count == 2
+    assert image_store.get_many(["playlist:41shEpOKyyadtG6lDclooa"]) == {}
+
+
+def test_get_many_playlist_images_concurrently(
+    web_client_mock: mock.MagicMock, img_provider: SpotifyLibraryProvider
+):
+    uris = [Uri(f"spotify:playlist:{i}") for i in range(3)]
+    barrier = threading.Barrier(len(uris), timeout=5)
+
+    def get_one(path: str, **_kwargs: Any) -> WebResponse:
+        barrier.wait()  # Only passes if all requests are in flight.
+        return make_response({"images": [{"url": f"img://{path}"}]})
+
+    web_client_mock.get_one.side_effect = get_one
+
+    result = img_provider.get_images(uris)
+
+    assert web_client_mock.get_one.call_count == 3
+    assert result[uris[2]][0].uri == "img://playlists/2"
+
+
+def test_images_are_persisted(
+    tmp_path: Path,
+    web_client_mock: mock.MagicMock,
+    backend_mock: mock.Mock,
+    img_provider: SpotifyLibraryProvider,
+):
+    image_store = store.ImageStore(tmp_path / "images.sqlite3", max_age=100)
+    backend_mock._image_cache.store = image_store
+    link = WebLink.from_uri(Uri("spotify:album:def"))
+    web_client_mock.get_batch.return_value = [
+        (link, {"images": [{"height": 64, "url": "img://1/a", "width": 64}]})
+    ]
+
+    result1 = img_provider.get_images([link.uri])
+    backend_mock._image_cache.clear()  # As if restarted.
+    result2 = img_provider.get_images([link.uri])
+
+    web_client_mock.get_batch.assert_called_once()
+    assert result1 == result2
+    assert list(image_store.get_many(["album:def"])) == ["album:def"]
+
+
+def test_image_cache_is_bounded(
+    web_client_mock: mock.MagicMock,
+    backend_mock: mock.Mock,
+    img_provider: SpotifyLibraryProvider,
+):
+    backend_mock._image_cache = images.ImageCache(max_entries=1)
+    links = [WebLink.from_uri(Uri(f"spotify:artist:{i}")) for i in range(2)]
+    web_client_mock.get_batch.return_value = [(link, {"images": []}) for link in links]
+
+    img_provider.get_images([link.uri for link in links])
+
+    assert len(backend_mock._image_cache) == 1
+
+
+def test_images_are_localized(
+    web_client_mock: mock.MagicMock,
+    backend_mock: mock.Mock,
+    img_provider: SpotifyLibraryProvider,
+):
+    backend_mock._image_files = mock.Mock()
+    backend_mock._image_files.localize.return_value = [Image(uri="/spotify/images/a")]
+    link = WebLink.from_uri(Uri("spotify:album:def"))
+    web_client_mock.get_batch.return_value = [(link, {"images": [{"url": "img://a"}]})]
+
+    result1 = img_provider.get_images([link.uri])
+    result2 = img_provider.get_images([link.uri])
+
+    assert result1 == result2 == {link.uri: [Image(uri="/spotify/images/a")]}
+    # The remote URIs are cached, so that they can be localized again later.
+    backend_mock._image_files.localize.assert_called_with([Image(uri="img://a")])
@@ -1,19 +1,18 @@
 import copy
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
 from typing import Any
 from unittest import mock
 
 import pytest
 from mopidy.types import Uri
 
-from mopidy_spotify import lookup, web
+from mopidy_spotify import lookup, store, translator, web
 from mopidy_spotify.library import SpotifyLibraryProvider
 
 
-@pytest.fixture(autouse=True)
-def clear_cache():
-    return lookup._cache.clear()
-
-
 @pytest.mark.parametrize(
     "uri",
     [
@@ -206,6 +205,20 @@ def test_lookup_of_artist_uri_ignores_various_artists_albums(
     assert len(results[Uri("spotify:artist:abba")]) == 0
 
 
+def test_lookup_of_artist_uri_filters_albums_before_fetching(
+    web_client_mock: mock.MagicMock,
+    web_album_mock_base: dict[str, Any],
+    provider: SpotifyLibraryProvider,
+):
+    web_client_mock.get_artist_albums.return_value = []
+
+    provider.lookup_many([Uri("spotify:artist:abba")])
+
+    album_filter = web_client_mock.get_artist_albums.call_args.kwargs["album_filter"]
+    assert album_filter(web_album_mock_base)
+    assert not album_filter({**web_album_mock_base, "album_type": "compilation"})
+
+
 def test_lookup_of_playlist_uri(
     web_client_mock: mock.MagicMock,
     web_playlist_mock: dict[str, Any],
@@ -216,7 +229,7 @@ def test_lookup_of_playlist_uri(
     playlist_uri = Uri(web_playlist_mock["uri"])
     results = provider.lookup_many([playlist_uri])
 
-    web_client_mock.get_playlist.assert_called_once_with(playlist_uri)
+    web_client_mock.get_playlist.assert_called_once_with(playlist_uri, as_items=False)
 
     assert len(results) == 1
     track = results[playlist_uri][0]
@@ -240,6 +253,166 @@ def test_lookup_of_playlist_uri_empty_response(
     assert f"Playlist '{playlist_uri}' not found" in caplog.text
 
 
+def test_lookup_of_mixed_uris_keeps_input_order(
+    web_client_mock: mock.MagicMock,
+    web_track_mock: dict[str, Any],
+    web_album_mock: dict[str, Any],
+    web_playlist_mock: dict[str, Any],
+    web_track_mock_link: web.WebLink,
+    web_album_mock_link: web.WebLink,
+    provider: SpotifyLibraryProvider,
+):
+    web_client_mock.get_batch.side_effect = lambda link_type, _links: {
+        web.LinkType.TRACK: [(web_track_mock_link, web_track_mock)],
+        web.LinkType.ALBUM: [(web_album_mock_link, web_album_mock)],
+    }[link_type]
+    web_client_mock.get_playlist.return_value = web_playlist_mock
+    web_client_mock.get_artist_albums.return_value = [web_album_mock]
+    uris = [
+        Uri("spotify:album:def"),
+        Uri(web_playlist_mock["uri"]),
+        Uri("spotify:track:abc"),
+        Uri("spotify:artist:abba"),
+    ]
+
+    results = provider.lookup_many(uris)
+
+    assert list(results) == uris
+    assert len(results[Uri("spotify:album:def")]) == 10
+    assert len(results[Uri("spotify:artist:abba")]) == 10
+
+
+def test_lookup_of_playlists_is_concurrent(
+    web_client_mock: mock.MagicMock,
+    web_playlist_mock: dict[str, Any],
+    provider: SpotifyLibraryProvider,
+):
+    barrier = threading.Barrier(2, timeout=5)
+
+    def get_playlist(*_args: Any, **_kwargs: Any) -> dict[str, Any]:
+        barrier.wait()  # Only passes if both requests are in flight.
+        return web_playlist_mock
+
+    web_client_mock.get_playlist.side_effect = get_playlist
+    uris = [Uri("spotify:playlist:foo"), Uri("spotify:playlist:bar")]
+
+    results = provider.lookup_many(uris)
+
+    assert list(results) == uris
+    assert web_client_mock.get_playlist.call_count == 2
+
+
+def test_lookup_with_timeout_finishes_in_background(
+    config: dict[str, Any],
+    web_client_mock: mock.MagicMock,
+    web_playlist_mock: dict[str, Any],
+    backend_mock: mock.Mock,
+    provider: SpotifyLibraryProvider,
+    caplog: pytest.LogCaptureFixture,
+):
+    config["spotify"]["lookup_timeout"] = 0.1
+    slow_uri, fast_uri = Uri("spotify:playlist:slow"), Uri("spotify:playlist:fast")
+    release = threading.Event()
+
+    def get_playlist(uri: Uri, **_kwargs: Any) -> dict[str, Any]:
+        if uri == slow_uri:
+            release.wait(timeout=5)
+        return web_playlist_mock
+
+    web_client_mock.get_playlist.side_effect = get_playlist
+
+    results1 = provider.lookup_many([slow_uri, fast_uri])
+    release.set()
+    slow_key = (web.LinkType.PLAYLIST, slow_uri)
+    for _ in range(100):
+        if slow_key in backend_mock._track_cache:
+            break
+        time.sleep(0.05)
+    results2 = provider.lookup_many([slow_uri, fast_uri])
+
+    assert list(results1) == [fast_uri]
+    assert "finishing 1 lookup(s) in the background" in caplog.text
+    assert list(results2) == [slow_uri, fast_uri]
+    assert web_client_mock.get_playlist.call_count == 3
+
+
+def test_lookup_shares_lookups_in_background(
+    config: dict[str, Any],
+    web_client_mock: mock.MagicMock,
+    web_playlist_mock: dict[str, Any],
+    backend_mock: mock.Mock,
+    provider: SpotifyLibraryProvider,
+):
+    config["spotify"]["lookup_timeout"] = 0.1
+    uri = Uri("spotify:playlist:slow")
+    release = threading.Event()
+
+    def get_playlist(*_args: Any, **_kwargs: Any) -> dict[str, Any]:
+        release.wait(timeout=5)
+        return web_playlist_mock
+
+    web_client_mock.get_playlist.side_effect = get_playlist
+
+    results1 = provider.lookup_many([uri])
+    results2 = provider.lookup_many([uri])
+    release.set()
+    for _ in range(100):
+        if (web.LinkType.PLAYLIST, uri) in backend_mock._track_cache:
+            break
+        time.sleep(0.05)
+    results3 = provider.lookup_many([uri])
+
+    assert results1 == results2 == {}
+    assert list(results3) == [uri]
+    assert web_client_mock.get_playlist.call_count == 1
+    assert backend_mock._track_cache.running == {}
+
+
+def test_lookup_with_timeout_returns_tracks_fetched_so_far(
+    config: dict[str, Any],
+    web_client_mock: mock.MagicMock,
+    web_track_mock: dict[str, Any],
+    provider: SpotifyLibraryProvider,
+):
+    config["spotify"]["lookup_timeout"] = 0.1
+    fetched_uri, slow_uri = Uri("spotify:track:abc"), Uri("spotify:track:slow")
+    release = threading.Event()
+
+    def get_batch(_link_type: web.LinkType, links: list[web.WebLink]) -> Any:
+        yield links[0], web_track_mock
+        release.wait(timeout=5)
+
+    web_client_mock.get_batch.side_effect = get_batch
+
+    results = provider.lookup_many([fetched_uri, slow_uri])
+    release.set()
+
+    assert list(results) == [fetched_uri]
+    assert results[fetched_uri][0].name == "ABC 123"
+
+
+@pytest.mark.parametrize(
+    ("late_uri", "other_uri"),
+    [
+        ("spotify:your:tracks", "spotify:your:albums"),
+        ("spotify:user:alice:starred", "spotify:user:bob:starred"),
+    ],
+)
+def test_late_results_are_cached_by_uri(
+    web_track_mock: dict[str, Any], late_uri: str, other_uri: str
+):
+    cache = lookup.new_cache()
+    track = translator.web_to_track(web_track_mock)
+    assert track is not None
+    future: Future[dict[Uri, Any]] = Future()
+    future.set_result({Uri(late_uri): [track]})
+
+    lookup._cache_late_result(cache, future)
+
+    assert cache.get(cache.make_key(web.WebLink.from_uri(Uri(late_uri)))) == [track]
+    assert cache.get(cache.make_key(web.WebLink.from_uri(Uri(other_uri)))) is None
+
+
 def test_lookup_of_yourtracks_uri(
     web_client_mock: mock.MagicMock,
     web_track_mock: dict[str, Any],
@@ -349,7 +522,10 @@ def test_lookup_caches_no_cache_playlist(
     results3 = provider.lookup_many([Uri("spotify:track:abc")])
 
     web_client_mock.get_playlist.assert_has_calls(
-        [mock.call(playlist_uri), mock.call(playlist_uri)]
+        [
+            mock.call(playlist_uri, as_items=False),
+            mock.call(playlist_uri, as_items=False),
+        ]
     )
     web_client_mock.get_batch.assert_not_called()
 
@@ -385,3 +561,197 @@ def test_lookup_no_cache_artist(
     assert len(results3) == 2
     assert results3[Uri("spotify:album:def")][0].uri == "spotify:track:abc"
     assert results3[Uri("spotify:track:abc")][0].uri == "spotify:track:abc"
+
+
+def test_lookup_without_cache(
+    config: dict[str, Any],
+    web_client_mock: mock.MagicMock,
+    web_album_mock: dict[str, Any],
+    web_album_mock_link: web.WebLink,
+):
+    web_client_mock.get_batch.return_value = [(web_album_mock_link, web_album_mock)]
+
+    lookup.lookup(config["spotify"], web_client_mock, [Uri("spotify:album:def")])
+    lookup.lookup(config["spotify"], web_client_mock, [Uri("spotify:album:def")])
+
+    assert web_client_mock.get_batch.call_count == 2
+
+
+def test_lookup_cache_is_bounded(
+    web_client_mock: mock.MagicMock,
+    web_album_mock: dict[str, Any],
+    web_album_mock_link: web.WebLink,
+    backend_mock: mock.Mock,
+    provider: SpotifyLibraryProvider,
+):
+    # Too small to hold the album's 10 tracks, but room for single tracks.
+    backend_mock._track_cache.max_size = lookup._APPROX_TRACK_SIZE * 5
+    web_client_mock.get_batch.return_value = [(web_album_mock_link, web_album_mock)]
+
+    provider.lookup_many([Uri("spotify:album:def")])
+    provider.lookup_many([Uri("spotify:album:def")])
+    provider.lookup_many([Uri("spotify:track:abc")])
+
+    assert len(backend_mock._track_cache) == 1
+    assert web_client_mock.get_batch.call_count == 2
+    assert backend_mock._track_cache.stats.hits == 1
+    assert backend_mock._track_cache.stats.misses == 2
+
+
+def test_lookup_uses_track_store(
+    tmp_path: Path,
+    web_client_mock: mock.MagicMock,
+    web_track_mock: dict[str, Any],
+    web_track_mock_link: web.WebLink,
+    backend_mock: mock.Mock,
+    provider: SpotifyLibraryProvider,
+):
+    track_store = store.TrackStore(tmp_path / "tracks.sqlite3", max_age=100)
+    backend_mock._track_cache.store = track_store
+    web_client_mock.get_batch.return_value = [(web_track_mock_link, web_track_mock)]
+
+    results1 = provider.lookup_many([Uri("spotify:track:abc")])
+    backend_mock._track_cache.clear()  # As if restarted.
+    results2 = provider.lookup_many([Uri("spotify:track:abc")])
+
+    web_client_mock.get_batch.assert_called_once()
+    assert results1 == results2
+    assert list(track_store.get_many(["abc"])) == ["abc"]
+
+
+def test_lookup_of_yourtracks_stores_tracks_at_once(
+    tmp_path: Path,
+    web_client_mock: mock.MagicMock,
+    web_track_mock: dict[str, Any],
+    backend_mock: mock.Mock,
+    provider: SpotifyLibraryProvider,
+):
+    track_store = store.TrackStore(tmp_path / "tracks.sqlite3", max_age=100)
+    backend_mock._track_cache.store = track_store
+    web_tracks = [{**web_track_mock, "uri": f"spotify:track:{i}"} for i in range(3)]
+    web_client_mock.get_all.return_value = [{"items": web_tracks}]
+
+    with mock.patch.object(
+        track_store, "put_many", wraps=track_store.put_many
+    ) as put_many_mock:
+        provider.lookup_many([Uri("spotify:your:tracks")])
+
+    put_many_mock.assert_called_once()
+    assert list(track_store.get_many(["0", "1", "2"])) == ["0", "1", "2"]
+    assert (web.LinkType.TRACK, "2") in backend_mock._track_cache
+
+
+def test_lookup_stores_tracks_of_batch_at_once(
+    tmp_path: Path,
+    web_client_mock: mock.MagicMock,
+    web_track_mock: dict[str, Any],
+    backend_mock: mock.Mock,
+    provider: SpotifyLibraryProvider,
+):
+    track_store = store.TrackStore(tmp_path / "tracks.sqlite3", max_age=100)
+    backend_mock._track_cache.store = track_store
+    uris = [Uri(f"spotify:track:{i}") for i in range(3)]
+    web_client_mock.get_batch.return_value = [
+        (web.WebLink.from_uri(uri), {**web_track_mock, "uri": uri}) for uri in uris
+    ]
+
+    with mock.patch.object(
+        track_store, "put_many", wraps=track_store.put_many
+    ) as put_many_mock:
+        provider.lookup_many(uris)
+
+    put_many_mock.assert_called_once()
+    assert list(track_store.get_many(["0", "1", "2"])) == ["0", "1", "2"]
+
+
+def test_lookup_ignores_stored_track_with_other_bitrate(
+    tmp_path: Path,
+    config: dict[str, Any],
+    web_client_mock: mock.MagicMock,
+    web_track_mock: dict[str, Any],
+    web_track_mock_link: web.WebLink,
+    backend_mock: mock.Mock,
+    provider: SpotifyLibraryProvider,
+):
+    backend_mock._track_cache.store = store.TrackStore(
+        tmp_path / "tracks.sqlite3", max_age=100
+    )
+    web_client_mock.get_batch.return_value = [(web_track_mock_link, web_track_mock)]
+    provider.lookup_many([Uri("spotify:track:abc")])
+    backend_mock._track_cache.clear()
+
+    config["spotify"]["bitrate"] = 320
+    results = provider.lookup_many([Uri("spotify:track:abc")])
+
+    assert web_client_mock.get_batch.call_count == 2
+    assert results[Uri("spotify:track:abc")][0].bitrate == 320
+
+
+def test_lookup_of_relinked_track_uses_cache(
+    web_client_mock: mock.MagicMock,
+    web_track_mock: dict[str, Any],
+    web_track_mock_link: web.WebLink,
+    backend_mock: mock.Mock,
+    provider: SpotifyLibraryProvider,
+):
+    backend_mock._track_cache.aliases = {"xyz": "abc"}
+    web_client_mock.get_batch.return_value = [(web_track_mock_link, web_track_mock)]
+
+    results1 = provider.lookup_many([Uri("spotify:track:abc")])
+    results2 = provider.lookup_many([Uri("spotify:track:xyz")])
+
+    web_client_mock.get_batch.assert_called_once()
+    assert results2 == {Uri("spotify:track:xyz"): results1[Uri("spotify:track:abc")]}
+
+
+def test_lookup_of_equivalent_uris(
+    web_client_mock: mock.MagicMock,
+    web_track_mock: dict[str, Any],
+    web_track_mock_link: web.WebLink,
+    provider: SpotifyLibraryProvider,
+):
+    web_client_mock.get_batch.return_value = [(web_track_mock_link, web_track_mock)]
+    uris = [
+        Uri("https://open.spotify.com/track/abc?si=foo"),
+        Uri("spotify:track:abc"),
+    ]
+
+    results = provider.lookup_many(uris)
+
+    web_client_mock.get_batch.assert_called_once()
+    assert len(web_client_mock.get_batch.call_args.args[1]) == 1
+    assert list(results) == uris
+    assert results[uris[0]] == results[uris[1]]
+
+
+def test_lookup_of_known_track_skips_batch(
+    web_client_mock: mock.MagicMock,
+    web_track_mock: dict[str, Any],
+    provider: SpotifyLibraryProvider,
+):
+    web_client_mock.entities.add(web_track_mock)
+
+    results = provider.lookup_many([Uri("spotify:track:abc")])
+
+    web_client_mock.get_batch.assert_not_called()
+    track = results[Uri("spotify:track:abc")][0]
+    assert track.name == "ABC 123"
+    assert track.album.name == "DEF 456"
+    assert track.bitrate == 160
+
+
+def test_lookup_of_known_incomplete_album_uses_batch(
+    web_client_mock: mock.MagicMock,
+    web_album_mock: dict[str, Any],
+    web_album_mock_link: web.WebLink,
+    provider: SpotifyLibraryProvider,
+):
+    web_client_mock.entities.add(
+        {**web_album_mock, "tracks": {"items": [], "total": 10}}
+    )
+    web_client_mock.get_batch.return_value = [(web_album_mock_link, web_album_mock)]
+
+    results = provider.lookup_many([Uri("spotify:album:def")])
+
+    web_client_mock.get_batch.assert_called_once()
+    assert len(results[Uri("spotify:album:def")]) == 10
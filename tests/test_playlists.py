@@ -1,4 +1,5 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 from unittest import mock
 
@@ -94,6 +95,34 @@ def test_as_list_when_playlist_wont_translate(
     )
 
 
+def test_as_list_is_memoized(
+    web_client_mock: mock.MagicMock, provider: playlists.SpotifyPlaylistsProvider
+):
+    result1 = provider.as_list()
+    result2 = provider.as_list()
+
+    assert result1 == result2
+    assert result1[0] is result2[0]
+    assert web_client_mock.get_user_playlists.call_count == 2
+    assert provider._refs_stats.hits == 1
+    assert provider._refs_stats.misses == 1
+
+
+def test_as_list_memo_invalidated_by_snapshot_change(
+    web_client_mock: mock.MagicMock, provider: playlists.SpotifyPlaylistsProvider
+):
+    web_playlists = web_client_mock.get_user_playlists.return_value
+    result1 = provider.as_list()
+
+    web_playlists[0] = {**web_playlists[0], "snapshot_id": "new", "name": "Bar"}
+    result2 = provider.as_list()
+
+    assert result1[0].name == "Foo"
+    assert result2[0].name == "Bar"
+    assert provider._refs_stats.hits == 0
+    assert provider._refs_stats.misses == 2
+
+
 def test_get_items_when_playlist_exists(provider: playlists.SpotifyPlaylistsProvider):
     result = provider.get_items(Uri("spotify:user:alice:playlist:foo"))
 
@@ -158,8 +187,8 @@ def test_refresh_loads_all_playlists(
     web_client_mock.get_user_playlists.assert_called_once()
     assert web_client_mock.get_playlist.call_count == 2
     expected_calls = [
-        mock.call("spotify:user:alice:playlist:foo"),
-        mock.call("spotify:user:bob:playlist:baz"),
+        mock.call("spotify:user:alice:playlist:foo", as_items=False),
+        mock.call("spotify:user:bob:playlist:baz", as_items=False),
     ]
     web_client_mock.get_playlist.assert_has_calls(expected_calls)
 
@@ -272,12 +301,44 @@ def test_refresh_tracks(
     assert provider._refresh_tracks(uris) == uris
 
     expected_calls = [
-        mock.call("spotify:user:alice:playlist:foo"),
-        mock.call("spotify:user:bob:playlist:baz"),
+        mock.call("spotify:user:alice:playlist:foo", as_items=False),
+        mock.call("spotify:user:bob:playlist:baz", as_items=False),
     ]
     web_client_mock.get_playlist.assert_has_calls(expected_calls)
 
 
+def test_refresh_tracks_prefetches_images(
+    backend_mock: mock.Mock,
+    config: dict[str, Any],
+    provider: playlists.SpotifyPlaylistsProvider,
+):
+    config["spotify"]["prefetch_images"] = True
+    backend_mock._image_files = mock.Mock()
+    uris = ["spotify:user:alice:playlist:foo", "spotify:user:bob:playlist:baz"]
+
+    assert provider._refresh_mutex.acquire(blocking=False)
+    assert provider._refresh_tracks(uris) == uris
+
+    backend_mock.library.get_images.assert_called_once_with(
+        [
+            "spotify:user:alice:playlist:foo",
+            "spotify:album:def",
+            "spotify:user:bob:playlist:baz",
+        ]
+    )
+
+
+def test_refresh_tracks_doesnt_prefetch_images_by_default(
+    backend_mock: mock.Mock, provider: playlists.SpotifyPlaylistsProvider
+):
+    backend_mock._image_files = mock.Mock()
+
+    assert provider._refresh_mutex.acquire(blocking=False)
+    provider._refresh_tracks(["spotify:user:alice:playlist:foo"])
+
+    backend_mock.library.get_images.assert_not_called()
+
+
 def test_lookup(provider: playlists.SpotifyPlaylistsProvider):
     playlist = provider.lookup(Uri("spotify:user:alice:playlist:foo"))
 
@@ -286,6 +347,147 @@ def test_lookup(provider: playlists.SpotifyPlaylistsProvider):
     assert playlist.tracks[0].bitrate == 160
 
 
+def test_lookup_records_relinked_tracks(
+    web_client_mock: mock.MagicMock,
+    web_playlist_mock: dict[str, Any],
+    web_track_mock: dict[str, Any],
+    provider: playlists.SpotifyPlaylistsProvider,
+):
+    web_client_mock.get_playlist.side_effect = None
+    web_client_mock.get_playlist.return_value = web_playlist_mock
+
+    provider.lookup(Uri("spotify:user:alice:playlist:foo"))
+
+    (web_tracks,) = web_client_mock.add_track_aliases.call_args.args
+    assert web_track_mock in list(web_tracks)
+
+
+def test_lookup_reuses_playlist_with_same_snapshot(
+    web_client_mock: mock.MagicMock,
+    web_playlist_mock: dict[str, Any],
+    provider: playlists.SpotifyPlaylistsProvider,
+):
+    web_client_mock.get_playlist.side_effect = None
+    web_client_mock.get_playlist.return_value = web_playlist_mock
+
+    playlist1 = provider.lookup(Uri("spotify:user:alice:playlist:foo"))
+    playlist2 = provider.lookup(Uri("spotify:user:alice:playlist:foo"))
+
+    assert web_client_mock.get_playlist.call_count == 2
+    assert playlist1 is playlist2
+
+
+def test_lookup_cache_is_bounded(
+    web_client_mock: mock.MagicMock,
+    web_playlist_mock: dict[str, Any],
+    backend_mock: mock.Mock,
+    provider: playlists.SpotifyPlaylistsProvider,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr(playlists, "CACHE_MAX_ENTRIES", 1)
+    backend_mock._playlist_cache = playlists.new_cache()
+    web_client_mock.get_playlist.side_effect = None
+    web_client_mock.get_playlist.return_value = web_playlist_mock
+
+    provider.lookup(Uri("spotify:user:alice:playlist:foo"))
+    provider.lookup(Uri("spotify:user:alice:playlist:bar"))
+
+    assert len(backend_mock._playlist_cache) == 1
+    assert Uri("spotify:user:alice:playlist:bar") in backend_mock._playlist_cache
+
+
+def test_lookup_reuses_unchanged_tracks(
+    web_client_mock: mock.MagicMock,
+    web_playlist_mock: dict[str, Any],
+    web_track_mock: dict[str, Any],
+    provider: playlists.SpotifyPlaylistsProvider,
+):
+    web_client_mock.get_playlist.side_effect = None
+    web_client_mock.get_playlist.return_value = web_playlist_mock
+    playlist1 = provider.lookup(Uri("spotify:user:alice:playlist:foo"))
+
+    web_new_track = {**web_track_mock, "uri": "spotify:track:new", "name": "New"}
+    web_playlist_mock["snapshot_id"] = "changed"
+    web_playlist_mock["tracks"]["items"].insert(0, {"track": web_new_track})
+    with mock.patch.object(
+        playlists.translator,
+        "web_to_track",
+        wraps=playlists.translator.web_to_track,
+    ) as web_to_track:
+        playlist2 = provider.lookup(Uri("spotify:user:alice:playlist:foo"))
+
+    web_to_track.assert_called_once_with(web_new_track, bitrate=160)
+    assert [t.uri for t in playlist2.tracks] == [
+        "spotify:track:new",
+        "spotify:track:abc",
+    ]
+    assert playlist2.tracks[1] is playlist1.tracks[0]
+
+
+def test_lookup_large_playlist_uses_executor(
+    backend_mock: mock.Mock,
+    web_client_mock: mock.MagicMock,
+    web_playlist_mock: dict[str, Any],
+    provider: playlists.SpotifyPlaylistsProvider,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr(playlists, "OFFLOAD_MIN_ITEMS", 1)
+    web_client_mock.get_playlist.side_effect = None
+    web_client_mock.get_playlist.return_value = web_playlist_mock
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        executor = mock.Mock(wraps=pool)
+        backend_mock._process_pool = executor
+
+        playlist = provider.lookup(Uri("spotify:user:alice:playlist:foo"))
+
+    executor.submit.assert_called_once_with(
+        playlists.translator.to_playlist,
+        mock.ANY,
+        username="alice",
+        bitrate=160,
+    )
+    data = executor.submit.call_args.args[1]
+    assert type(data["tracks"]["items"]) is list
+    assert playlist.name == "Foo"
+    assert playlist.tracks[0].uri == "spotify:track:abc"
+
+
+def test_lookup_small_playlist_doesnt_use_executor(
+    backend_mock: mock.Mock,
+    web_client_mock: mock.MagicMock,
+    web_playlist_mock: dict[str, Any],
+    provider: playlists.SpotifyPlaylistsProvider,
+):
+    web_client_mock.get_playlist.side_effect = None
+    web_client_mock.get_playlist.return_value = web_playlist_mock
+    backend_mock._process_pool = mock.Mock()
+
+    playlist = provider.lookup(Uri("spotify:user:alice:playlist:foo"))
+
+    backend_mock._process_pool.submit.assert_not_called()
+    assert playlist.tracks[0].uri == "spotify:track:abc"
+
+
+def test_lookup_falls_back_if_executor_fails(
+    backend_mock: mock.Mock,
+    web_client_mock: mock.MagicMock,
+    web_playlist_mock: dict[str, Any],
+    provider: playlists.SpotifyPlaylistsProvider,
+    monkeypatch: pytest.MonkeyPatch,
+    caplog: pytest.LogCaptureFixture,
+):
+    monkeypatch.setattr(playlists, "OFFLOAD_MIN_ITEMS", 1)
+    web_client_mock.get_playlist.side_effect = None
+    web_client_mock.get_playlist.return_value = web_playlist_mock
+    backend_mock._process_pool = mock.Mock()
+    backend_mock._process_pool.submit.side_effect = RuntimeError("shut down")
+
+    playlist = provider.lookup(Uri("spotify:user:alice:playlist:foo"))
+
+    assert "Translating Spotify playlist in worker process failed" in caplog.text
+    assert playlist.tracks[0].uri == "spotify:track:abc"
+
+
 def test_lookup_when_not_logged_in(
     web_client_mock: mock.MagicMock, provider: playlists.SpotifyPlaylistsProvider
 ):
@@ -327,3 +529,78 @@ def test_playlist_lookup_when_link_invalid(
 
     assert playlist is None
     assert "Failed to lookup Spotify playlist URI 'spotify:in:valid'" in caplog.text
+
+
+def test_refresh_tracks_indexes_library(
+    web_client_mock: mock.MagicMock,
+    web_track_mock: dict[str, Any],
+    backend_mock: mock.Mock,
+    provider: playlists.SpotifyPlaylistsProvider,
+):
+    backend_mock._your_music.items[("alice", "tracks")] = [{"track": web_track_mock}]
+    backend_mock._search_index = mock.Mock()
+
+    assert provider._refresh_mutex.acquire(blocking=False)
+    provider._refresh_tracks(["spotify:user:alice:playlist:foo"])
+
+    # The saved music isn't synced just for the index.
+    web_client_mock.get_all.assert_not_called()
+    backend_mock.library.lookup_many.assert_not_called()
+    (sources,) = backend_mock._search_index.update.call_args.args
+    assert list(sources) == ["spotify:user:alice:playlist:foo", "spotify:your:tracks"]
+    assert [t.uri for t in sources["spotify:your:tracks"]] == [web_track_mock["uri"]]
+    assert backend_mock._search_index.update.call_args.kwargs == {
+        "keep": ["spotify:your:albums"]
+    }
+
+
+def test_refresh_tracks_handles_index_error(
+    backend_mock: mock.Mock,
+    provider: playlists.SpotifyPlaylistsProvider,
+    caplog: pytest.LogCaptureFixture,
+):
+    backend_mock._search_index = mock.Mock()
+    backend_mock._search_index.update.side_effect = Exception
+
+    assert provider._refresh_mutex.acquire(blocking=False)
+    provider._refresh_tracks(["spotify:user:alice:playlist:foo"])
+
+    assert "Error occurred while indexing Spotify library" in caplog.text
+
+
+def test_refresh_tracks_loads_distinct_values(
+    provider: playlists.SpotifyPlaylistsProvider,
+):
+    assert provider.get_distinct("artist") is None
+
+    assert provider._refresh_mutex.acquire(blocking=False)
+    provider._refresh_tracks(["spotify:user:alice:playlist:foo"])
+
+    assert provider.get_distinct("artist") == {"ABBA"}
+
+
+def test_lookup_updates_distinct_values(
+    web_client_mock: mock.MagicMock,
+    web_track_mock: dict[str, Any],
+    provider: playlists.SpotifyPlaylistsProvider,
+):
+    uri = Uri("spotify:user:alice:playlist:foo")
+    assert provider._refresh_mutex.acquire(blocking=False)
+    provider._refresh_tracks([uri])
+
+    web_track_mock["uri"] = "spotify:track:xyz"
+    web_track_mock["artists"] = [
+        {"name": "Queen", "uri": "spotify:artist:queen", "type": "artist"}
+    ]
+    web_client_mock.get_playlist.side_effect = None
+    web_client_mock.get_playlist.return_value = {
+        "owner": {"id": "alice"},
+        "name": "Foo",
+        "snapshot_id": "changed",
+        "tracks": {"items": [{"track": web_track_mock}]},
+        "uri": uri,
+        "type": "playlist",
+    }
+    provider.lookup(uri)
+
+    assert provider.get_distinct("artist") == {"Queen"}
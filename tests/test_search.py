@@ -1,11 +1,27 @@
+from pathlib import Path
 from typing import Any
 from unittest import mock
 
 import pytest
-from mopidy.models import SearchResult
+from mopidy.models import Album, Artist, Playlist, SearchResult, Track
+from mopidy.types import Uri
 
-from mopidy_spotify import lookup, search, translator
+from mopidy_spotify import lookup, search, search_index, translator
 from mopidy_spotify.library import SpotifyLibraryProvider
+from mopidy_spotify.web import WebLink
+
+
+def search_call(search_type: str, limit: int, *, offset: int = 0) -> Any:
+    return mock.call(
+        "search",
+        params={
+            "q": "ABBA",
+            "limit": limit,
+            "offset": offset,
+            "market": "from_token",
+            "type": search_type,
+        },
+    )
 
 
 def test_search_with_no_query_returns_nothing(
@@ -89,15 +105,15 @@ def test_search_returns_albums_and_artists_and_tracks(
     web_client_mock.get.return_value = web_search_mock
     result = provider.search({"any": ["ABBA"]})
 
-    web_client_mock.get.assert_called_once_with(
-        "search",
-        params={
-            "q": "ABBA",
-            "limit": 50,
-            "market": "from_token",
-            "type": "album,artist,track",
-        },
+    web_client_mock.get.assert_has_calls(
+        [
+            search_call("album", 20),
+            search_call("artist", 10),
+            search_call("track", 50),
+        ],
+        any_order=True,
     )
+    assert web_client_mock.get.call_count == 3
 
     assert "Searching Spotify for: ABBA" in caplog.text
 
@@ -133,85 +149,82 @@ def test_search_limits_number_of_results(
     assert len(result.tracks) == 6
 
 
-def test_sets_api_limit_to_album_count_when_max(
+def test_sets_api_limit_per_type(
     web_client_mock: mock.MagicMock,
     web_search_mock_large: dict[str, Any],
     provider: SpotifyLibraryProvider,
     config: dict[str, Any],
 ):
     config["spotify"]["search_album_count"] = 6
-    config["spotify"]["search_artist_count"] = 2
+    config["spotify"]["search_artist_count"] = 0
     config["spotify"]["search_track_count"] = 2
 
     web_client_mock.get.return_value = web_search_mock_large
 
     result = provider.search({"any": ["ABBA"]})
 
-    web_client_mock.get.assert_called_once_with(
-        "search",
-        params={
-            "q": "ABBA",
-            "limit": 6,
-            "market": "from_token",
-            "type": "album,artist,track",
-        },
+    web_client_mock.get.assert_has_calls(
+        [
+            search_call("album", 6),
+            search_call("track", 2),
+        ],
+        any_order=True,
     )
-
+    assert web_client_mock.get.call_count == 2
     assert len(result.albums) == 6
+    assert len(result.artists) == 0
+    assert len(result.tracks) == 2
 
 
-def test_sets_api_limit_to_artist_count_when_max(
+def test_fetches_more_pages_up_to_count(
     web_client_mock: mock.MagicMock,
-    web_search_mock_large: dict[str, Any],
+    web_track_mock: dict[str, Any],
     provider: SpotifyLibraryProvider,
     config: dict[str, Any],
 ):
-    config["spotify"]["search_album_count"] = 2
-    config["spotify"]["search_artist_count"] = 6
-    config["spotify"]["search_track_count"] = 2
+    config["spotify"]["search_album_count"] = 0
+    config["spotify"]["search_artist_count"] = 0
+    config["spotify"]["search_track_count"] = 120
 
-    web_client_mock.get.return_value = web_search_mock_large
+    def get(_path: str, params: dict[str, Any]) -> dict[str, Any]:
+        items = [web_track_mock] * params["limit"]
+        return {"tracks": {"items": items, "total": 1000}}
+
+    web_client_mock.get.side_effect = get
 
     result = provider.search({"any": ["ABBA"]})
 
-    web_client_mock.get.assert_called_once_with(
-        "search",
-        params={
-            "q": "ABBA",
-            "limit": 6,
-            "market": "from_token",
-            "type": "album,artist,track",
-        },
+    web_client_mock.get.assert_has_calls(
+        [
+            search_call("track", 50),
+            search_call("track", 50, offset=50),
+            search_call("track", 20, offset=100),
+        ],
+        any_order=True,
     )
-
-    assert len(result.artists) == 6
+    assert web_client_mock.get.call_count == 3
+    assert len(result.tracks) == 120
 
 
-def test_sets_api_limit_to_track_count_when_max(
+def test_only_fetches_pages_with_results(
     web_client_mock: mock.MagicMock,
-    web_search_mock_large: dict[str, Any],
+    web_track_mock: dict[str, Any],
     provider: SpotifyLibraryProvider,
     config: dict[str, Any],
 ):
-    config["spotify"]["search_album_count"] = 2
-    config["spotify"]["search_artist_count"] = 2
-    config["spotify"]["search_track_count"] = 6
-
-    web_client_mock.get.return_value = web_search_mock_large
+    config["spotify"]["search_track_count"] = 200
+    web_client_mock.get.return_value = {
+        "tracks": {"items": [web_track_mock] * 50, "total": 60}
+    }
 
     result = provider.search({"any": ["ABBA"]})
 
-    web_client_mock.get.assert_called_once_with(
-        "search",
-        params={
-            "q": "ABBA",
-            "limit": 6,
-            "market": "from_token",
-            "type": "album,artist,track",
-        },
+    assert search_call("track", 150, offset=50) not in (
+        web_client_mock.get.call_args_list
     )
-
-    assert len(result.tracks) == 6
+    assert search_call("track", 50, offset=50) in web_client_mock.get.call_args_list
+    assert web_client_mock.get.call_count == 4
+    assert len(result.tracks) == 100
 
 
 def test_sets_types_parameter(
@@ -229,35 +242,14 @@ def test_sets_types_parameter(
         types=["album", "artist"],
     )
 
-    web_client_mock.get.assert_called_once_with(
-        "search",
-        params={
-            "q": "ABBA",
-            "limit": 50,
-            "market": "from_token",
-            "type": "album,artist",
-        },
-    )
-
-
-def test_sets_market_parameter(
-    web_client_mock: mock.MagicMock,
-    web_search_mock_large: dict[str, Any],
-    provider: SpotifyLibraryProvider,
-):
-    web_client_mock.get.return_value = web_search_mock_large
-
-    provider.search({"any": ["ABBA"]})
-
-    web_client_mock.get.assert_called_once_with(
-        "search",
-        params={
-            "q": "ABBA",
-            "limit": 50,
-            "market": "from_token",
-            "type": "album,artist,track",
-        },
+    web_client_mock.get.assert_has_calls(
+        [
+            search_call("album", 20),
+            search_call("artist", 10),
+        ],
+        any_order=True,
     )
+    assert web_client_mock.get.call_count == 2
 
 
 def test_handles_empty_response(
@@ -305,3 +297,344 @@ def test_search_filters_bad_results(
     assert len(result.artists) == 0
     assert len(result.tracks) == 1
     assert result.tracks[0].uri == "spotify:track:good"
+
+
+def test_search_results_are_cached(
+    web_client_mock: mock.MagicMock,
+    web_search_mock: dict[str, Any],
+    provider: SpotifyLibraryProvider,
+):
+    web_client_mock.get.return_value = web_search_mock
+
+    result1 = provider.search({"any": ["ABBA"]})
+    result2 = provider.search({"any": ["abba "]})
+
+    assert web_client_mock.get.call_count == 3
+    assert result2.uri == "spotify:search:abba%20"
+    assert result2.tracks == result1.tracks
+
+
+@pytest.mark.parametrize(
+    ("config_key", "types", "call_count"),
+    [
+        ("search_track_count", None, 6),
+        (None, ["album"], 4),
+    ],
+)
+def test_search_cache_depends_on_limits_and_types(
+    web_client_mock: mock.MagicMock,
+    web_search_mock: dict[str, Any],
+    config: dict[str, Any],
+    config_key: str | None,
+    types: list[str] | None,
+    call_count: int,
+):
+    web_client_mock.get.return_value = web_search_mock
+    cache = search.new_cache()
+    search.search(
+        config["spotify"], web_client_mock, query={"any": ["ABBA"]}, cache=cache
+    )
+
+    if config_key:
+        config["spotify"][config_key] = 1
+    search.search(
+        config["spotify"],
+        web_client_mock,
+        query={"any": ["ABBA"]},
+        types=types or ["album", "artist", "track"],
+        cache=cache,
+    )
+
+    assert web_client_mock.get.call_count == call_count
+
+
+def test_failed_search_is_not_cached(
+    web_client_mock: mock.MagicMock,
+    web_search_mock: dict[str, Any],
+    provider: SpotifyLibraryProvider,
+):
+    web_client_mock.get.return_value = {}
+    provider.search({"any": ["ABBA"]})
+
+    web_client_mock.get.return_value = web_search_mock
+    result = provider.search({"any": ["ABBA"]})
+
+    assert web_client_mock.get.call_count == 6
+    assert len(result.tracks) == 2
+
+
+def test_cached_search_results_when_offline(
+    web_client_mock: mock.MagicMock,
+    web_search_mock: dict[str, Any],
+    provider: SpotifyLibraryProvider,
+):
+    web_client_mock.get.return_value = web_search_mock
+    provider.search({"any": ["ABBA"]})
+
+    web_client_mock.logged_in = False
+    result = provider.search({"any": ["ABBA"]})
+
+    assert len(result.tracks) == 2
+
+
+def test_search_without_cache_is_not_remembered(
+    web_client_mock: mock.MagicMock,
+    web_search_mock: dict[str, Any],
+    config: dict[str, Any],
+):
+    web_client_mock.get.return_value = web_search_mock
+
+    search.search(config["spotify"], web_client_mock, query={"any": ["ABBA"]})
+    search.search(config["spotify"], web_client_mock, query={"any": ["ABBA"]})
+
+    assert web_client_mock.get.call_count == 6
+
+
+@pytest.fixture
+def library_track() -> Track:
+    return Track(
+        uri=Uri("spotify:track:gold"),
+        name="Gimme! Gimme! Gimme!",
+        artists=frozenset([Artist(name="ABBA")]),
+    )
+
+
+@pytest.fixture
+def library_index(
+    tmp_path: Path, backend_mock: mock.Mock, library_track: Track
+) -> search_index.SearchIndex:
+    index = search_index.SearchIndex(tmp_path / "library.sqlite3")
+    index.update({Uri("spotify:your:tracks"): [library_track]})
+    backend_mock._search_index = index
+    return index
+
+
+@pytest.mark.usefixtures("library_index")
+def test_search_within_library_uses_index(
+    web_client_mock: mock.MagicMock,
+    provider: SpotifyLibraryProvider,
+    library_track: Track,
+):
+    result = provider.search({"any": ["ABBA"]}, uris=[Uri("spotify:your")])
+
+    assert result.uri == "spotify:search:ABBA"
+    assert result.tracks == (library_track,)
+    web_client_mock.get.assert_not_called()
+
+
+@pytest.mark.usefixtures("library_index")
+def test_search_adds_library_tracks(
+    web_client_mock: mock.MagicMock,
+    web_search_mock: dict[str, Any],
+    provider: SpotifyLibraryProvider,
+    library_track: Track,
+):
+    web_client_mock.get.return_value = web_search_mock
+
+    result = provider.search({"any": ["ABBA"]})
+
+    assert [track.uri for track in result.tracks] == [
+        "spotify:track:abc",
+        "spotify:track:abc",
+        library_track.uri,
+    ]
+    assert len(result.albums) == 1
+
+
+@pytest.mark.usefixtures("library_index")
+def test_search_library_when_offline(
+    web_client_mock: mock.MagicMock,
+    provider: SpotifyLibraryProvider,
+    library_track: Track,
+):
+    web_client_mock.logged_in = False
+
+    result = provider.search({"artist": ["abba"]})
+
+    assert result.tracks == (library_track,)
+
+
+def test_search_library_only_for_tracks(
+    web_client_mock: mock.MagicMock,
+    config: dict[str, Any],
+    library_index: search_index.SearchIndex,
+):
+    web_client_mock.logged_in = False
+
+    result = search.search(
+        config["spotify"],
+        web_client_mock,
+        query={"any": ["ABBA"]},
+        types=["album"],
+        index=library_index,
+    )
+
+    assert result.tracks == ()
+
+
+@pytest.fixture
+def scope_tracks(mopidy_album_mock: Album, mopidy_artist_mock: Artist) -> list[Track]:
+    return [
+        Track(
+            uri=Uri(f"spotify:track:{name.lower()}"),
+            name=name,
+            artists=frozenset([mopidy_artist_mock]),
+            album=mopidy_album_mock,
+            track_no=track_no,
+        )
+        for track_no, name in enumerate(["Waterloo", "Fernando", "Chiquitita"], 1)
+    ]
+
+
+def test_search_within_cached_playlist(
+    web_client_mock: mock.MagicMock,
+    backend_mock: mock.Mock,
+    provider: SpotifyLibraryProvider,
+    scope_tracks: list[Track],
+):
+    uri = Uri("spotify:playlist:abba")
+    backend_mock._playlist_cache.set(
+        uri, (160, "s1", Playlist(uri=uri, tracks=scope_tracks))
+    )
+
+    result = provider.search({"track_name": ["ando"]}, uris=[uri])
+
+    assert result.uri == "spotify:search:track%3Aando"
+    assert result.tracks == (scope_tracks[1],)
+    web_client_mock.get.assert_not_called()
+    web_client_mock.get_playlist.assert_not_called()
+
+
+def test_search_within_cached_album(
+    web_client_mock: mock.MagicMock,
+    backend_mock: mock.Mock,
+    provider: SpotifyLibraryProvider,
+    scope_tracks: list[Track],
+):
+    link = WebLink.from_uri(Uri("spotify:album:def"))
+    backend_mock._track_cache.set(
+        backend_mock._track_cache.make_key(link), scope_tracks
+    )
+
+    result = provider.search({"album": ["def"]}, uris=[link.uri])
+
+    assert result.tracks == tuple(scope_tracks)
+    web_client_mock.get.assert_not_called()
+
+
+def test_search_within_saved_tracks(
+    web_client_mock: mock.MagicMock,
+    web_track_mock: dict[str, Any],
+    backend_mock: mock.Mock,
+    provider: SpotifyLibraryProvider,
+):
+    backend_mock._your_music.items[("alice", "tracks")] = [{"track": web_track_mock}]
+
+    result = provider.search({"any": ["abc"]}, uris=[Uri("spotify:your:tracks")])
+
+    assert [track.uri for track in result.tracks] == ["spotify:track:abc"]
+    web_client_mock.get.assert_not_called()
+    web_client_mock.get_all.assert_not_called()
+
+
+def test_search_within_your_music_without_index(
+    web_client_mock: mock.MagicMock,
+    web_track_mock: dict[str, Any],
+    backend_mock: mock.Mock,
+    provider: SpotifyLibraryProvider,
+):
+    backend_mock._your_music.items[("alice", "tracks")] = [{"track": web_track_mock}]
+    backend_mock._your_music.items[("alice", "albums")] = []
+
+    result = provider.search({"any": ["abc"]}, uris=[Uri("spotify:your")])
+
+    assert [track.uri for track in result.tracks] == ["spotify:track:abc"]
+    web_client_mock.get.assert_not_called()
+    web_client_mock.get_all.assert_not_called()
+
+
+def test_search_within_looks_up_unknown_uris(
+    web_client_mock: mock.MagicMock,
+    backend_mock: mock.Mock,
+    provider: SpotifyLibraryProvider,
+    scope_tracks: list[Track],
+):
+    uri = Uri("spotify:album:def")
+    with mock.patch.object(lookup, "lookup", return_value={uri: scope_tracks}) as m:
+        result = provider.search({"track_no": ["3"]}, uris=[uri])
+
+    m.assert_called_once_with(
+        mock.ANY,
+        web_client_mock,
+        [uri],
+        cache=backend_mock._track_cache,
+        playlist_cache=backend_mock._playlist_cache,
+        your_music=backend_mock._your_music,
+    )
+    assert result.tracks == (scope_tracks[2],)
+    web_client_mock.get.assert_not_called()
+
+
+def test_search_within_respects_track_count(
+    backend_mock: mock.Mock,
+    provider: SpotifyLibraryProvider,
+    config: dict[str, Any],
+    scope_tracks: list[Track],
+):
+    config["spotify"]["search_track_count"] = 2
+    uri = Uri("spotify:playlist:abba")
+    backend_mock._playlist_cache.set(
+        uri, (160, "s1", Playlist(uri=uri, tracks=scope_tracks))
+    )
+
+    result = provider.search({"artist": ["abba"]}, uris=[uri])
+
+    assert result.tracks == tuple(scope_tracks[:2])
+
+
+@pytest.mark.parametrize(
+    "uri",
+    [
+        "spotify:",
+        "spotify:directory",
+        "spotify:playlists",
+        "spotify:playlists:featured",
+        "spotify:top:tracks",
+        "spotify:invalid",
+    ],
+)
+def test_search_within_root_uses_spotify(
+    web_client_mock: mock.MagicMock,
+    web_search_mock: dict[str, Any],
+    provider: SpotifyLibraryProvider,
+    uri: str,
+):
+    web_client_mock.get.return_value = web_search_mock
+
+    result = provider.search({"any": ["ABBA"]}, uris=[Uri(uri)])
+
+    assert web_client_mock.get.call_count == 3
+    assert len(result.tracks) == 2
+
+
+@pytest.mark.parametrize(
+    ("query", "exact", "expected"),
+    [
+        ({"any": ["water"]}, False, True),
+        ({"any": ["water"]}, True, False),
+        ({"any": ["Waterloo"]}, True, True),
+        ({"artist": ["abba"], "date": ["2001"]}, True, True),
+        ({"albumartist": ["ab"], "track_name": ["loo"]}, False, True),
+        ({"track_no": ["1"]}, True, True),
+        ({"track_no": ["2"]}, True, False),
+        ({"genre": ["pop"]}, False, False),
+        ({"musicbrainz_trackid": ["x"]}, False, False),
+    ],
+)
+def test_search_within_matches_fields(
+    scope_tracks: list[Track],
+    query: dict[str, list[str]],
+    exact: bool,
+    expected: bool,
+):
+    assert search._matches(scope_tracks[0], query, exact=exact) is expected  # pyright: ignore[reportArgumentType]
@@ -0,0 +1,154 @@
+from pathlib import Path
+
+import pytest
+from mopidy.models import Album, Artist, Track
+from mopidy.types import Uri
+
+from mopidy_spotify import search_index
+
+
+def make_track(uri: str, name: str, artist: str, album: str, date: str) -> Track:
+    artists = frozenset([Artist(name=artist)])
+    return Track(
+        uri=Uri(uri),
+        name=name,
+        artists=artists,
+        album=Album(name=album, artists=artists, date=date),
+    )
+
+
+@pytest.fixture
+def dancing_queen() -> Track:
+    return make_track(
+        "spotify:track:dq", "Dancing Queen", "ABBA", "Arrival", "1976-10-11"
+    )
+
+
+@pytest.fixture
+def bohemian_rhapsody() -> Track:
+    return make_track(
+        "spotify:track:br",
+        "Bohemian Rhapsody",
+        "Queen",
+        "A Night at the Opera",
+        "1975",
+    )
+
+
+@pytest.fixture
+def index(
+    tmp_path: Path, dancing_queen: Track, bohemian_rhapsody: Track
+) -> search_index.SearchIndex:
+    index = search_index.SearchIndex(tmp_path / "library.sqlite3")
+    index.update(
+        {
+            Uri("spotify:playlist:abba"): [dancing_queen],
+            Uri("spotify:your:tracks"): [dancing_queen, bohemian_rhapsody],
+        }
+    )
+    return index
+
+
+def test_search_any(
+    index: search_index.SearchIndex, dancing_queen: Track, bohemian_rhapsody: Track
+):
+    result = index.search({"any": ["queen"]}, limit=10)
+
+    assert result == [bohemian_rhapsody, dancing_queen]
+
+
+@pytest.mark.parametrize(
+    ("query", "expected"),
+    [
+        ({"track_name": ["queen"]}, ["spotify:track:dq"]),
+        ({"artist": ["queen"]}, ["spotify:track:br"]),
+        ({"albumartist": ["ab"]}, ["spotify:track:dq"]),
+        ({"album": ["night opera"]}, ["spotify:track:br"]),
+        ({"date": ["1976"]}, ["spotify:track:dq"]),
+        ({"any": ["queen"], "date": ["1975"]}, ["spotify:track:br"]),
+        ({"any": ["bjork"]}, []),
+        ({"genre": ["pop"]}, []),
+        ({"any": ["!"]}, []),
+    ],
+)
+def test_search_fields(
+    index: search_index.SearchIndex, query: dict[str, list[str]], expected: list[str]
+):
+    result = index.search(query, limit=10)  # pyright: ignore[reportArgumentType]
+
+    assert [track.uri for track in result] == expected
+
+
+def test_search_ignores_case_and_diacritics(
+    index: search_index.SearchIndex, dancing_queen: Track
+):
+    assert index.search({"track_name": ["DÄNC"]}, limit=10) == [dancing_queen]
+
+
+@pytest.mark.parametrize(
+    ("query", "expected"),
+    [
+        ({"artist": ["queen"]}, ["spotify:track:br"]),
+        ({"track_name": ["queen"]}, []),
+        ({"any": ["arrival"]}, ["spotify:track:dq"]),
+        ({"any": ["arriv"]}, []),
+        ({"date": ["1976"]}, []),
+    ],
+)
+def test_search_exact(
+    index: search_index.SearchIndex, query: dict[str, list[str]], expected: list[str]
+):
+    result = index.search(query, exact=True, limit=10)  # pyright: ignore[reportArgumentType]
+
+    assert [track.uri for track in result] == expected
+
+
+def test_search_sources(index: search_index.SearchIndex, dancing_queen: Track):
+    result = index.search(
+        {"any": ["queen"]}, sources=["spotify:playlist:abba"], limit=10
+    )
+
+    assert result == [dancing_queen]
+
+
+def test_search_limit(index: search_index.SearchIndex):
+    assert len(index.search({"any": ["queen"]}, limit=1)) == 1
+    assert index.search({"any": ["queen"]}, limit=0) == []
+
+
+def test_get_sources(index: search_index.SearchIndex):
+    assert index.get_sources([Uri("spotify:your")]) == {"spotify:your:tracks"}
+    assert index.get_sources([Uri("spotify:playlist:abba")]) == {
+        "spotify:playlist:abba"
+    }
+    assert index.get_sources([Uri("spotify:playlist:abba"), Uri("spotify:x")]) is None
+
+
+def test_update_replaces_sources(
+    index: search_index.SearchIndex, bohemian_rhapsody: Track
+):
+    index.update({Uri("spotify:playlist:queen"): [bohemian_rhapsody]})
+
+    assert index.search({"any": ["queen"]}, limit=10) == [bohemian_rhapsody]
+    assert index.get_sources([Uri("spotify:your")]) is None
+
+
+def test_update_keeps_sources(index: search_index.SearchIndex):
+    index.update({}, keep=[Uri("spotify:your:tracks")])
+
+    assert len(index.search({"any": ["queen"]}, limit=10)) == 2
+    assert index.get_sources([Uri("spotify:playlist:abba")]) is None
+
+
+def test_persisted(tmp_path: Path, index: search_index.SearchIndex):
+    other_index = search_index.SearchIndex(tmp_path / "library.sqlite3")
+
+    assert len(other_index.search({"any": ["queen"]}, limit=10)) == 2
+    assert other_index.get_sources([Uri("spotify:your")]) is not None
+
+
+def test_errors_are_logged(tmp_path: Path, caplog: pytest.LogCaptureFixture):
+    index = search_index.SearchIndex(tmp_path / "missing" / "library.sqlite3")
+
+    assert index.search({"any": ["queen"]}, limit=10) == []
+    assert "Spotify search index" in caplog.text
@@ -0,0 +1,112 @@
+import sqlite3
+from pathlib import Path
+from unittest import mock
+
+import pytest
+from mopidy.models import Album, Artist, Image, Track
+from mopidy.types import Uri
+
+from mopidy_spotify import store
+
+
+@pytest.fixture
+def track_store(tmp_path: Path) -> store.TrackStore:
+    return store.TrackStore(tmp_path / "tracks.sqlite3", max_age=100)
+
+
+@pytest.fixture
+def track(mopidy_album_mock: Album, mopidy_artist_mock: Artist) -> Track:
+    return Track(
+        uri=Uri("spotify:track:abc"),
+        name="ABC 123",
+        artists=frozenset([mopidy_artist_mock]),
+        album=mopidy_album_mock,
+        length=174300,
+        bitrate=160,
+    )
+
+
+def test_get_many_empty(track_store: store.TrackStore):
+    assert track_store.get_many(["abc"]) == {}
+
+
+def test_put_and_get_many(track_store: store.TrackStore, track: Track):
+    track_store.put_many([("abc", track)])
+
+    result = track_store.get_many(["abc", "def"])
+
+    assert result == {"abc": track}
+
+
+def test_persisted(tmp_path: Path, track_store: store.TrackStore, track: Track):
+    track_store.put_many([("abc", track)])
+
+    other_store = store.TrackStore(tmp_path / "tracks.sqlite3", max_age=100)
+
+    assert other_store.get_many(["abc"]) == {"abc": track}
+
+
+def test_get_many_batches_queries(track_store: store.TrackStore, track: Track):
+    track_store.put_many([(str(i), track) for i in range(1200)])
+
+    result = track_store.get_many(str(i) for i in range(0, 1200, 2))
+
+    assert len(result) == 600
+
+
+def test_expired_tracks_ignored(track_store: store.TrackStore, track: Track):
+    with mock.patch.object(store.time, "time", return_value=1000):
+        track_store.put_many([("abc", track)])
+
+    with mock.patch.object(store.time, "time", return_value=1101):
+        assert track_store.get_many(["abc"]) == {}
+
+
+def test_invalid_tracks_ignored(
+    track_store: store.TrackStore, caplog: pytest.LogCaptureFixture
+):
+    with sqlite3.connect(track_store.path) as connection:
+        connection.execute(
+            "INSERT INTO tracks VALUES (?, ?, ?)", ("abc", "{bogus", 1e12)
+        )
+
+    assert track_store.get_many(["abc"]) == {}
+    assert "Ignoring invalid stored track 'abc'" in caplog.text
+
+
+def test_errors_are_logged(tmp_path: Path, caplog: pytest.LogCaptureFixture):
+    track_store = store.TrackStore(tmp_path / "missing" / "tracks.sqlite3", max_age=1)
+
+    assert track_store.get_many(["abc"]) == {}
+    assert "Spotify track store" in caplog.text
+
+
+def test_errors_name_the_store(tmp_path: Path, caplog: pytest.LogCaptureFixture):
+    image_store = store.ImageStore(tmp_path / "missing" / "images.sqlite3", max_age=1)
+
+    assert image_store.get_many(["album:abc"]) == {}
+    assert "Spotify image store" in caplog.text
+
+
+def test_put_and_get_images(tmp_path: Path):
+    image_store = store.ImageStore(tmp_path / "images.sqlite3", max_age=100)
+    images = [Image(uri="img://a", width=640, height=640), Image(uri="img://b")]
+
+    image_store.put_many([("album:abc", images), ("album:def", [])])
+
+    assert image_store.get_many(["album:abc", "album:def"]) == {
+        "album:abc": images,
+        "album:def": [],
+    }
+
+
+def test_only_newest_images_kept(tmp_path: Path):
+    path = tmp_path / "images.sqlite3"
+    image_store = store.ImageStore(path, max_age=100)
+    for i in range(3):
+        with mock.patch.object(store.time, "time", return_value=1000 + i):
+            image_store.put_many([(str(i), [])])
+
+    with mock.patch.object(store.time, "time", return_value=1050):
+        image_store = store.ImageStore(path, max_age=100, max_entries=2)
+        assert image_store.get_many(["0", "1", "2"]) == {"1": [], "2": []}
@@ -6,7 +6,7 @@ import pytest
 from mopidy.models import Album, Artist, Image, Ref
 from mopidy.types import Uri
 
-from mopidy_spotify import translator
+from mopidy_spotify import translator, web
 
 
 class TestWebToArtistRef:
@@ -296,6 +296,58 @@ class TestToPlaylist:
 
         assert len(items) == 0
 
+    def test_paged_tracks(
+        self, web_track_mock: dict[str, Any], web_playlist_mock: dict[str, Any]
+    ):
+        web_tracks = web_playlist_mock["tracks"]["items"]
+        view = web.ResponseView(web_playlist_mock, [web_tracks * 2, web_tracks])
+
+        playlist = translator.to_playlist(view)
+        items = translator.to_playlist(view, as_items=True)
+
+        assert playlist.length == 4
+        assert len(items) == 4
+
+    def test_reuses_known_tracks(
+        self, web_track_mock: dict[str, Any], web_playlist_mock: dict[str, Any]
+    ):
+        known_track = translator.web_to_track(web_track_mock, bitrate=160)
+
+        with patch.object(translator, "web_to_track") as web_to_track_mock:
+            playlist = translator.to_playlist(
+                web_playlist_mock,
+                bitrate=160,
+                known_tracks={known_track.uri: known_track},
+            )
+
+        web_to_track_mock.assert_not_called()
+        assert playlist.tracks[0] is known_track
+
+    def test_known_tracks_with_other_bitrate_not_reused(
+        self, web_track_mock: dict[str, Any], web_playlist_mock: dict[str, Any]
+    ):
+        known_track = translator.web_to_track(web_track_mock, bitrate=96)
+
+        playlist = translator.to_playlist(
+            web_playlist_mock,
+            bitrate=160,
+            known_tracks={known_track.uri: known_track},
+        )
+
+        assert playlist.tracks[0].bitrate == 160
+
+    def test_known_tracks_not_reused_if_unplayable(
+        self, web_track_mock: dict[str, Any], web_playlist_mock: dict[str, Any]
+    ):
+        known_track = translator.web_to_track(web_track_mock)
+        web_track_mock["is_playable"] = False
+
+        playlist = translator.to_playlist(
+            web_playlist_mock, known_tracks={known_track.uri: known_track}
+        )
+
+        assert playlist.length == 0
+
     def test_filters_out_none_tracks(
         self, web_track_mock: dict[str, Any], web_playlist_mock: dict[str, Any]
     ):
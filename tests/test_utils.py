@@ -51,3 +51,15 @@ def test_group_by_type_sorts():
         [mocks[4]],
         [mocks[0], mocks[3]],
     ]
+
+
+def test_cache_stats():
+    stats = utils.CacheStats()
+
+    stats.record(hit=True)
+    stats.record(hit=False)
+    stats.record(hit=True)
+
+    assert stats.hits == 2
+    assert stats.misses == 1
+    assert str(stats) == "hits=2 misses=1"
@@ -1,3 +1,5 @@
+import dataclasses
+import itertools
 import urllib
 from datetime import UTC, datetime
 from typing import Any
@@ -898,7 +900,7 @@ def artist_albums_mock(
     web_album_mock_base: dict[str, Any], web_album_mock_base2: dict[str, Any]
 ) -> dict[str, Any]:
     params = urllib.parse.urlencode(
-        {"market": "from_token", "include_groups": "single,album"}
+        {"market": "from_token", "include_groups": "single,album", "limit": 50}
     )
     return {
         "href": url(f"artists/abba/albums?{params}"),
@@ -930,6 +932,26 @@ class TestSpotifyOAuthClient:
     )
     def test_playlist_required_fields(self, field: str):
         assert field in web.SpotifyOAuthClient.PLAYLIST_FIELDS
+        assert field in web.SpotifyOAuthClient.PLAYLIST_REF_FIELDS
+
+    @pytest.mark.parametrize(
+        "field",
+        [
+            ("next"),
+            ("items(track"),
+            ("type"),
+            ("uri"),
+            ("name"),
+            ("is_playable"),
+            ("linked_from"),
+        ],
+    )
+    def test_track_ref_required_fields(self, field: str):
+        assert field in web.SpotifyOAuthClient.TRACK_REF_FIELDS
+
+    def test_track_ref_fields_exclude_album_and_artists(self):
+        assert "album" not in web.SpotifyOAuthClient.TRACK_REF_FIELDS
+        assert "artists" not in web.SpotifyOAuthClient.TRACK_REF_FIELDS
 
     def test_configures_auth(self):
         client = web.SpotifyOAuthClient(
@@ -1202,6 +1224,29 @@ class TestSpotifyOAuthClient:
         assert len(responses.calls) == 0
         assert result1 == result2
 
+    @responses.activate
+    def test_with_all_tracks_shares_cached_pages(
+        self,
+        spotify_client: web.SpotifyOAuthClient,
+        foo_album_response: web.WebResponse,
+        foo_album_next_tracks: dict[str, Any],
+    ):
+        responses.add(
+            responses.GET,
+            foo_album_next_tracks["href"],
+            json=foo_album_next_tracks,
+        )
+
+        result = spotify_client._with_all_tracks(foo_album_response)
+
+        assert isinstance(result, web.ResponseView)
+        assert result["id"] == "foo"
+        assert foo_album_response["tracks"]["items"] == [3, 4, 5]
+        [cached_page] = spotify_client._cache.values()
+        assert result["tracks"]["items"]._pages[1] is cached_page["items"]
+        with pytest.raises(TypeError):
+            result["tracks"]["items"] = []  # pyright: ignore[reportIndexIssue]
+
     @responses.activate
     @pytest.mark.parametrize(
         ("uri", "success"),
@@ -1243,6 +1288,37 @@ class TestSpotifyOAuthClient:
         assert len(responses.calls) == 1
         assert responses.calls[0].request.url.endswith(playlist_parms)
 
+    @responses.activate
+    def test_get_playlist_as_items_uses_ref_fields(
+        self, spotify_client: web.SpotifyOAuthClient
+    ):
+        responses.add(responses.GET, url("playlists/bar"), json={})
+
+        spotify_client.get_playlist(Uri("spotify:playlist:bar"), as_items=True)
+
+        assert len(responses.calls) == 1
+        encoded_params = urllib.parse.urlencode(
+            {
+                "fields": web.SpotifyOAuthClient.PLAYLIST_REF_FIELDS,
+                "market": "from_token",
+            }
+        )
+        assert responses.calls[0].request.url.endswith(encoded_params)
+
+    @responses.activate
+    def test_get_playlist_as_items_cached_separately(
+        self, spotify_client: web.SpotifyOAuthClient, bar_playlist: dict[str, Any]
+    ):
+        responses.add(responses.GET, url("playlists/bar"), json=bar_playlist)
+
+        spotify_client.get_playlist(Uri("spotify:playlist:bar"), as_items=True)
+        spotify_client.get_playlist(Uri("spotify:playlist:bar"))
+        spotify_client.get_playlist(Uri("spotify:playlist:bar"), as_items=True)
+        spotify_client.get_playlist(Uri("spotify:playlist:bar"))
+
+        assert len(responses.calls) == 2
+        assert len(spotify_client._cache) == 2
+
     @responses.activate
     def test_get_playlist_error(
         self,
@@ -1367,14 +1443,36 @@ class TestSpotifyOAuthClient:
         assert len(results) == 1
         assert results[0]["tracks"]["items"] == [3, 4, 5, 6, 7, 8]
 
+    @responses.activate
+    def test_get_albums_many(self, spotify_client: web.SpotifyOAuthClient):
+        ids = [f"a{i}" for i in range(45)]
+        for batch in itertools.batched(ids, 20, strict=False):
+            responses.add(
+                responses.GET,
+                url("albums"),
+                match=[
+                    matchers.query_string_matcher(
+                        f"ids={'%2C'.join(batch)}&market=from_token"
+                    )
+                ],
+                json={"albums": [{"id": i, "tracks": {"items": []}} for i in batch]},
+            )
+
+        links = [web.WebLink.from_uri(Uri(f"spotify:album:{i}")) for i in ids]
+        results = list(spotify_client.get_albums(links))
+
+        assert len(responses.calls) == 3
+        assert [r["id"] for r in results] == ids
+
     @responses.activate
     def test_get_album_wrong_linktype(
         self,
         spotify_client: web.SpotifyOAuthClient,
         caplog: pytest.LogCaptureFixture,
     ):
-        link = web.WebLink.from_uri(Uri("spotify:album:abba"))
-        link.type = "your"
+        link = dataclasses.replace(
+            web.WebLink.from_uri(Uri("spotify:album:abba")), type="your"
+        )
         results = list(spotify_client.get_albums([link]))
 
         assert len(responses.calls) == 0
@@ -1397,7 +1495,7 @@ class TestSpotifyOAuthClient:
             json=artist_albums_mock,
             match=[
                 matchers.query_string_matcher(
-                    "market=from_token&include_groups=single%2Calbum"
+                    "market=from_token&include_groups=single%2Calbum&limit=50"
                 )
             ],
         )
@@ -1421,6 +1519,31 @@ class TestSpotifyOAuthClient:
             assert "tracks" not in results[0]
             assert "tracks" not in results[1]
 
+    @responses.activate
+    def test_get_artist_albums_filtered_before_fetching(
+        self,
+        artist_albums_mock: dict[str, Any],
+        web_album_mock: dict[str, Any],
+        spotify_client: web.SpotifyOAuthClient,
+    ):
+        responses.add(
+            responses.GET,
+            url("artists/abba/albums"),
+            json=artist_albums_mock,
+        )
+        spotify_client.get_albums = mock.Mock(return_value=[web_album_mock])
+
+        link = web.WebLink.from_uri(Uri("spotify:artist:abba"))
+        results = list(
+            spotify_client.get_artist_albums(
+                link, album_filter=lambda album: album["name"] == "DEF 456"
+            )
+        )
+
+        album_link = web.WebLink.from_uri(Uri(web_album_mock["uri"]))
+        assert spotify_client.get_albums.call_args == mock.call([album_link])
+        assert len(results) == 1
+
     @responses.activate
     def test_get_artist_albums_error(
         self,
@@ -1446,8 +1569,9 @@ class TestSpotifyOAuthClient:
         spotify_client: web.SpotifyOAuthClient,
         caplog: pytest.LogCaptureFixture,
     ):
-        link = web.WebLink.from_uri(Uri("spotify:artist:abba"))
-        link.type = "your"
+        link = dataclasses.replace(
+            web.WebLink.from_uri(Uri("spotify:artist:abba")), type="your"
+        )
         results = list(spotify_client.get_artist_albums(link))
 
         assert len(responses.calls) == 0
@@ -1553,8 +1677,9 @@ class TestSpotifyOAuthClient:
             url("artists/baz/top-tracks"),
             json={"tracks": [web_track_mock, web_track_mock]},
         )
-        link = web.WebLink.from_uri(Uri("spotify:artist:baz"))
-        link.type = "your"
+        link = dataclasses.replace(
+            web.WebLink.from_uri(Uri("spotify:artist:baz")), type="your"
+        )
         results = spotify_client.get_artist_top_tracks(link)
 
         assert len(responses.calls) == 0
@@ -1687,6 +1812,133 @@ class TestSpotifyOAuthClient:
         assert results[link]["name"] == "DEF 456"
         assert "Invalid batch item" in caplog.text
 
+    def test_get_batch_equivalent_uris(
+        self,
+        spotify_client: web.SpotifyOAuthClient,
+        web_track_mock: dict[str, Any],
+    ):
+        spotify_client.get_one = mock.Mock(
+            return_value=web.WebResponse("tracks", {"tracks": [web_track_mock]})
+        )
+        links = [
+            web.WebLink.from_uri(Uri("spotify:track:abc")),
+            web.WebLink.from_uri(Uri("https://open.spotify.com/track/abc?si=1")),
+        ]
+
+        results = list(spotify_client.get_batch(web.LinkType.TRACK, links))
+
+        spotify_client.get_one.assert_called_once()
+        assert spotify_client.get_one.call_args.kwargs["params"]["ids"] == "abc"
+        assert [link.uri for link, _ in results] == [link.uri for link in links]
+
+    def test_get_batch_records_relinked_tracks(
+        self,
+        spotify_client: web.SpotifyOAuthClient,
+        web_track_mock: dict[str, Any],
+    ):
+        relinked_track = {
+            **web_track_mock,
+            "id": "xyz",
+            "uri": "spotify:track:xyz",
+            "linked_from": {"id": "abc", "uri": "spotify:track:abc"},
+        }
+        spotify_client.get_one = mock.Mock(
+            return_value=web.WebResponse("tracks", {"tracks": [relinked_track]})
+        )
+        link = web.WebLink.from_uri(Uri("spotify:track:abc"))
+
+        results = dict(spotify_client.get_batch(web.LinkType.TRACK, [link]))
+
+        assert results[link]["id"] == "xyz"
+        assert spotify_client.track_aliases == {"xyz": "abc"}
+
+    def test_get_batch_requests_relinked_tracks_by_original_id(
+        self,
+        spotify_client: web.SpotifyOAuthClient,
+        web_track_mock: dict[str, Any],
+    ):
+        relinked_track = {
+            **web_track_mock,
+            "id": "xyz",
+            "uri": "spotify:track:xyz",
+            "linked_from": {"id": "abc", "uri": "spotify:track:abc"},
+        }
+        spotify_client.get_one = mock.Mock(
+            return_value=web.WebResponse("tracks", {"tracks": [relinked_track]})
+        )
+        spotify_client.track_aliases["xyz"] = "abc"
+        links = [
+            web.WebLink.from_uri(Uri("spotify:track:abc")),
+            web.WebLink.from_uri(Uri("spotify:track:xyz")),
+        ]
+
+        results = dict(spotify_client.get_batch(web.LinkType.TRACK, links))
+
+        assert spotify_client.get_one.call_args.kwargs["params"]["ids"] == "abc"
+        assert list(results) == links
+
+    def test_get_batch_records_entities(
+        self,
+        spotify_client: web.SpotifyOAuthClient,
+        web_track_mock: dict[str, Any],
+        web_track_mock_link: web.WebLink,
+        web_album_mock_link: web.WebLink,
+    ):
+        spotify_client.get_one = mock.Mock(
+            return_value=web.WebResponse("tracks", {"tracks": [web_track_mock]})
+        )
+
+        list(spotify_client.get_batch(web.LinkType.TRACK, [web_track_mock_link]))
+
+        assert spotify_client.entities.get(web_track_mock_link) == web_track_mock
+        assert spotify_client.entities.get(web_album_mock_link) is not None
+
+    def test_add_track_aliases(self, spotify_client: web.SpotifyOAuthClient):
+        spotify_client.add_track_aliases(
+            [
+                None,
+                {"uri": "spotify:track:abc"},
+                {
+                    "uri": "spotify:track:def",
+                    "linked_from": {"uri": "spotify:track:def"},
+                },
+                {
+                    "uri": "spotify:track:xyz",
+                    "linked_from": {"uri": "spotify:track:abc"},
+                },
+            ]
+        )
+
+        assert spotify_client.track_aliases == {"xyz": "abc"}
+
+
+def test_paged_items():
+    items = web.PagedItems([[1, 2], [], [3], [4, 5]])
+
+    assert len(items) == 5
+    assert list(items) == [1, 2, 3, 4, 5]
+    assert items == [1, 2, 3, 4, 5]
+    assert items != [1, 2, 3]
+    assert items[0] == 1
+    assert items[2] == 3
+    assert items[-1] == 5
+    assert items[1:4] == [2, 3, 4]
+    with pytest.raises(IndexError):
+        items[5]
+
+
+def test_response_view():
+    obj = web.WebResponse("foo", {"id": "foo", "tracks": {"items": [1], "total": 3}})
+
+    view = web.ResponseView(obj, [[2, 3]])
+
+    assert dict(view) == {
+        "id": "foo",
+        "tracks": {"items": [1, 2, 3], "total": 3},
+    }
+    assert len(view) == 2
+    assert obj["tracks"]["items"] == [1]
+
 
 @pytest.mark.parametrize(
     ("uri", "type_", "id_"),
@@ -1727,6 +1979,53 @@ def test_weblink_from_uri_playlist(uri: Uri, id_: str | None, owner: str | None)
     assert result.owner == owner
 
 
+@pytest.mark.parametrize(
+    ("uri", "canonical_uri"),
+    [
+        ("spotify:track:foo", "spotify:track:foo"),
+        ("spotify:track:foo?si=abc", "spotify:track:foo"),
+        ("https://open.spotify.com/track/foo", "spotify:track:foo"),
+        ("https://open.spotify.com/track/foo?si=abc", "spotify:track:foo"),
+        ("https://open.spotify.com/intl-de/album/bar", "spotify:album:bar"),
+        ("http://play.spotify.com/artist/baz", "spotify:artist:baz"),
+        ("https://open.spotify.com/playlist/foo", "spotify:playlist:foo"),
+        ("spotify:user:alice:playlist:foo", "spotify:user:alice:playlist:foo"),
+        ("spotify:user:alice:starred", "spotify:user:alice:starred"),
+        ("spotify:your:tracks", "spotify:your:tracks"),
+    ],
+)
+def test_weblink_canonical_uri(uri: Uri, canonical_uri: str):
+    result = web.WebLink.from_uri(uri)
+
+    assert result.uri == uri
+    assert result.canonical_uri == canonical_uri
+
+
+def test_weblink_from_uri_is_memoized():
+    link1 = web.WebLink.from_uri(Uri("spotify:track:memo"))
+    link2 = web.WebLink.from_uri(Uri("spotify:track:memo"))
+
+    assert link1 is link2
+
+
+def test_weblink_is_immutable():
+    link = web.WebLink.from_uri(Uri("spotify:track:foo"))
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        link.id = "bar"  # pyright: ignore[reportAttributeAccessIssue]
+
+
+def test_weblink_equivalent_uris_are_equal():
+    link1 = web.WebLink.from_uri(Uri("spotify:track:foo"))
+    link2 = web.WebLink.from_uri(Uri("https://open.spotify.com/track/foo?si=abc"))
+    link3 = web.WebLink.from_uri(Uri("spotify:track:bar"))
+
+    assert link1 == link2
+    assert hash(link1) == hash(link2)
+    assert link1 != link3
+    assert link1.canonical_uri is link2.canonical_uri
+
+
 @pytest.mark.parametrize(
     "uri",
     [